@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Benchmark: compile() in a loop vs compile_many() over the same items.
+
+    python benchmarks/compile_many.py --ops 50000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from audit_plans import setup_registry  # noqa: E402
+
+from workman import Workman  # noqa: E402
+
+CTX = {"correlation_id": "corr_BENCH", "producer": "bench"}
+
+
+def _items(n: int) -> list[tuple[str, dict, dict]]:
+    return [("pm.work_item.create", {"title": f"Task {i}", "project_id": "proj_FK"}, CTX) for i in range(n)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=50000)
+    args = parser.parse_args()
+
+    wm = Workman(registry_root=setup_registry(Path(tempfile.mkdtemp())))
+    wm.compile_many(_items(10))  # warm schema and validator caches
+
+    items = _items(args.ops)
+    start = time.perf_counter()
+    for op, payload, ctx in items:
+        wm.compile(op, payload, ctx)
+    loop = time.perf_counter() - start
+
+    items = _items(args.ops)
+    start = time.perf_counter()
+    wm.compile_many(items)
+    batch = time.perf_counter() - start
+
+    print(f"compile() loop  {args.ops / loop:10.0f} ops/s")
+    print(f"compile_many()  {args.ops / batch:10.0f} ops/s  ({loop / batch:4.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Benchmark: compile() throughput from a thread pool.
+
+Compiles the same mix of ops with 1..N threads and checks that every plan
+numbers its own ops from a1/w1. Run it on both a regular and a free-threaded
+CPython build (python3.13t) to compare scaling:
+
+    python benchmarks/concurrent_compile.py --ops 20000 --threads 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from audit_plans import setup_registry  # noqa: E402
+
+from workman import Workman  # noqa: E402
+
+CTX = {"correlation_id": "corr_BENCH", "producer": "bench"}
+
+OPS = [
+    ("pm.project.create", {"name": "Bench Project"}),
+    ("pm.work_item.create", {"title": "Task", "project_id": "proj_FK"}),
+    ("pm.work_item.move", {"work_item_id": "wi_EXIST", "project_id": "proj_FK", "opsstream_id": "ops_FK"}),
+    ("link.create", {"source_id": "proj_A", "source_type": "project", "target_id": "wi_B", "target_type": "work_item"}),
+]
+
+
+def _check(plan: dict) -> None:
+    a = [op["id"] for op in plan["ops"] if op["method"].startswith("assert.")]
+    w = [op["id"] for op in plan["ops"] if op["method"] == "wal.append"]
+    assert a == [f"a{i}" for i in range(1, len(a) + 1)], a
+    assert w == ["w1"], w
+
+
+def run(wm: Workman, n_ops: int, threads: int) -> float:
+    def _one(i: int) -> None:
+        op, payload = OPS[i % len(OPS)]
+        _check(wm.compile(op, dict(payload), CTX))
+
+    start = time.perf_counter()
+    if threads == 1:
+        for i in range(n_ops):
+            _one(i)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for _ in pool.map(_one, range(n_ops), chunksize=256):
+                pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=20000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"python {sys.version.split()[0]}  gil={'on' if gil else 'off'}  cpus={os.cpu_count()}")
+
+    wm = Workman(registry_root=setup_registry(Path(tempfile.mkdtemp())))
+    run(wm, len(OPS), 1)  # warm schema and validator caches
+
+    baseline = None
+    for threads in args.threads:
+        elapsed = run(wm, args.ops, threads)
+        rate = args.ops / elapsed
+        baseline = baseline or rate
+        print(f"threads={threads:<3d} {rate:10.0f} ops/s  speedup={rate / baseline:4.2f}x")
+
+
+if __name__ == "__main__":
+    main()
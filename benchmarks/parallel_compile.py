@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Benchmark: ParallelCompiler scaling across worker processes.
+
+    python benchmarks/parallel_compile.py --ops 200000 --workers 1 2 4 8 16 32
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from audit_plans import setup_registry  # noqa: E402
+
+from workman import Workman  # noqa: E402
+from workman.parallel import ParallelCompiler  # noqa: E402
+
+CTX = {"correlation_id": "corr_BENCH", "producer": "bench"}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=100000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--chunksize", type=int, default=512)
+    parser.add_argument("--unordered", action="store_true")
+    args = parser.parse_args()
+
+    wm = Workman(registry_root=setup_registry(Path(tempfile.mkdtemp())))
+    items = [("pm.work_item.create", {"title": f"Task {i}", "project_id": "proj_FK"}, CTX) for i in range(args.ops)]
+    print(f"cpus={os.cpu_count()} ops={args.ops} chunksize={args.chunksize} ordered={not args.unordered}")
+
+    baseline = None
+    for workers in args.workers:
+        with ParallelCompiler(wm, max_workers=workers, chunksize=args.chunksize) as pool:
+            list(pool.compile(items[: workers * 4]))  # start and warm every worker
+            start = time.perf_counter()
+            for _ in pool.compile(items, ordered=not args.unordered):
+                pass
+            elapsed = time.perf_counter() - start
+        rate = args.ops / elapsed
+        baseline = baseline or rate
+        print(f"workers={workers:<3d} {rate:10.0f} ops/s  speedup={rate / baseline:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
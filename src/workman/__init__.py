@@ -1,7 +1,20 @@
 """Workman: domain operation -> Storacle plan compiler."""
 
-from workman.compile import compile
+from workman.columnar import compile_columns
+from workman.compile import compile, compile_many
+from workman.compiler import Workman, default_workman
 from workman.execute import execute
-from workman.intent import compile_intent
+from workman.intent import compile_intent, compile_intent_stream
+from workman.recompile import recompile_intent
 
-__all__ = ["compile", "execute", "compile_intent"]
+__all__ = [
+    "compile",
+    "compile_many",
+    "compile_columns",
+    "execute",
+    "compile_intent",
+    "compile_intent_stream",
+    "recompile_intent",
+    "Workman",
+    "default_workman",
+]
@@ -0,0 +1,115 @@
+"""asyncio-native compile / execute / compile_intent.
+
+Schema files are read (and validators compiled) in a worker thread the first
+time an op is seen, so the event loop never blocks on registry I/O. The
+compile itself is pure CPU work: by default it runs inline once its schemas
+are warm; pass an executor to offload it, with max_concurrency bounding how
+many offloaded calls run at once.
+
+Cancellation is safe: an inline compile has no await points, and a cancelled
+offloaded call only discards its result (each compile has its own op ID
+scope, and registry cache writes are idempotent).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Any, Callable, Iterable, Sequence
+
+from workman.compiler import Workman, default_workman
+
+
+def _intent_op_names(kwargs: dict) -> list[str]:
+    if kwargs.get("ops") is not None:
+        return [entry["op"] for entry in kwargs["ops"] if isinstance(entry, dict) and "op" in entry]
+    return [kwargs["op_name"]] if kwargs.get("op_name") else []
+
+
+def _execute_op_names(params: dict) -> list[str]:
+    if isinstance(params.get("items"), list):
+        return [item["op"] for item in params["items"] if isinstance(item, dict) and isinstance(item.get("op"), str)]
+    if params.get("op") == "pm.compile_intent":
+        return _intent_op_names(params)
+    return [params["op"]] if "op" in params else []
+
+
+class AsyncWorkman:
+    """Async facade over a Workman.
+
+    Args:
+        workman: The compiler to use. Defaults to the default instance.
+        executor: Optional executor for the CPU-bound compile step.
+        max_concurrency: Maximum concurrently offloaded calls (executor only).
+    """
+
+    def __init__(
+        self,
+        workman: Workman | None = None,
+        *,
+        executor: Executor | None = None,
+        max_concurrency: int | None = None,
+    ):
+        self.workman = workman
+        self.executor = executor
+        self._limit = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    @property
+    def _wm(self) -> Workman:
+        return self.workman or default_workman()
+
+    async def warm(self, op_names: Iterable[str]) -> None:
+        """Load schemas and validators for op_names off the event loop."""
+        wm = self._wm
+        refs = []
+        for op in op_names:
+            op_spec = wm.get_op_spec(op)
+            if op_spec is not None and not wm.registry.is_cached(op_spec.request_schema):
+                refs.append(op_spec.request_schema)
+        if refs:
+            await asyncio.to_thread(wm.registry.warm, refs)
+
+    async def _run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        if self.executor is None:
+            return fn(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+        if self._limit is None:
+            return await loop.run_in_executor(self.executor, call)
+        async with self._limit:
+            return await loop.run_in_executor(self.executor, call)
+
+    async def compile(self, op: str, payload: dict, ctx: dict, pins: dict | None = None) -> dict:
+        await self.warm([op])
+        return await self._run(self._wm.compile, op, payload, ctx, pins)
+
+    async def compile_many(self, items: Sequence[Sequence], *, return_errors: bool = False) -> list:
+        await self.warm({item[0] for item in items})
+        return await self._run(self._wm.compile_many, items, return_errors=return_errors)
+
+    async def execute(self, params: dict) -> dict:
+        await self.warm(_execute_op_names(params))
+        return await self._run(self._wm.execute, params)
+
+    async def compile_intent(self, **kwargs: Any) -> dict:
+        await self.warm(_intent_op_names(kwargs))
+        return await self._run(self._wm.compile_intent, **kwargs)
+
+
+_default_async = AsyncWorkman()
+
+
+async def acompile(op: str, payload: dict, ctx: dict, pins: dict | None = None) -> dict:
+    """Async compile() against the default instance."""
+    return await _default_async.compile(op, payload, ctx, pins)
+
+
+async def aexecute(params: dict) -> dict:
+    """Async execute() against the default instance."""
+    return await _default_async.execute(params)
+
+
+async def acompile_intent(**kwargs: Any) -> dict:
+    """Async compile_intent() against the default instance."""
+    return await _default_async.compile_intent(**kwargs)
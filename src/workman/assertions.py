@@ -1,17 +1,14 @@
 """Assertion op constructors for Storacle plans."""
 
-from typing import Iterator
-
-_assertion_counter: Iterator[int] = iter(range(1, 10000))
+from workman.ids import current_op_ids
 
 
 def _next_assertion_id() -> str:
-    return f"a{next(_assertion_counter)}"
+    return current_op_ids().next_assertion_id()
 
 
 def reset_assertion_counter() -> None:
-    global _assertion_counter
-    _assertion_counter = iter(range(1, 10000))
+    current_op_ids().reset_assertions()
 
 
 def assert_exists(aggregate_type: str, aggregate_id: str) -> dict:
@@ -2,21 +2,20 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Iterator
+from typing import TYPE_CHECKING
+
+from workman.ids import current_op_ids
 
 if TYPE_CHECKING:
     from workman.catalog import OpSpec
 
-_write_counter: Iterator[int] = iter(range(1, 10000))
-
 
 def _next_write_id() -> str:
-    return f"w{next(_write_counter)}"
+    return current_op_ids().next_write_id()
 
 
 def reset_write_counter() -> None:
-    global _write_counter
-    _write_counter = iter(range(1, 10000))
+    current_op_ids().reset_writes()
 
 
 def build_wal_append(
@@ -0,0 +1,145 @@
+"""Canonical JSON encoding (RFC 8785, JSON Canonicalization Scheme, style).
+
+The stdlib encoder with sort_keys=True is not a canonical form: float
+formatting follows Python's repr, key order is by code point, and
+default=str turns arbitrary objects into whatever their __str__ says. The
+canonical form here is fully defined:
+
+    objects   keys sorted by UTF-16 code units, no whitespace
+    strings   UTF-8, escaping only '"', '\\' and control characters
+    numbers   ECMAScript Number-to-String for floats (1e+21, 1.5e-7, 3 for 3.0);
+              ints are written exactly (JCS would round those beyond 2**53)
+    other     PayloadView as an object, tuples as arrays, date/datetime as
+              isoformat() strings; anything else is a TypeError
+
+Encoded fragments are cached: short strings (keys, op methods, event and
+aggregate types, IDs that repeat across a plan) and key orders per encoder,
+and the encoding of each frozen PayloadView on the view itself, so with
+Workman(mutate_payloads=False) a payload that has been hashed is not
+re-encoded when the plan is written out with --canonical.
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import date, datetime
+from json.encoder import encode_basestring
+from typing import Any, Mapping
+
+from workman.views import LayeredPayload, PayloadView
+
+_MAX_CACHED_STRING = 64
+
+
+def format_number(value: int | float) -> str:
+    """ECMAScript Number::toString for floats; exact decimal for ints."""
+    if isinstance(value, int):
+        return int.__repr__(value)
+    if not math.isfinite(value):
+        raise ValueError(f"{value!r} is not allowed in canonical JSON")
+    if value == 0:
+        return "0"
+    sign = "-" if value < 0 else ""
+    mantissa, _, exponent = float.__repr__(abs(value)).partition("e")
+    int_part, _, frac_part = mantissa.partition(".")
+    digits = int_part + frac_part
+    stripped = digits.lstrip("0")
+    # value == 0.<stripped> * 10**n
+    n = len(int_part) + int(exponent or 0) - (len(digits) - len(stripped))
+    digits = stripped.rstrip("0")
+    k = len(digits)
+
+    if k <= n <= 21:
+        text = digits + "0" * (n - k)
+    elif 0 < n <= 21:
+        text = f"{digits[:n]}.{digits[n:]}"
+    elif -6 < n <= 0:
+        text = "0." + "0" * -n + digits
+    else:
+        e = n - 1
+        text = (digits if k == 1 else f"{digits[0]}.{digits[1:]}") + ("e+" if e > 0 else "e-") + str(abs(e))
+    return sign + text
+
+
+def _key_order(keys: tuple[str, ...]) -> list[str]:
+    for key in keys:
+        if type(key) is not str:
+            raise TypeError(f"Canonical JSON object keys must be str, got {type(key).__name__}")
+    ordered = sorted(keys)
+    if not all(map(str.isascii, ordered)):
+        ordered.sort(key=lambda key: key.encode("utf-16-be"))
+    return ordered
+
+
+class CanonicalEncoder:
+    """Canonical JSON encoder with a bounded cache of encoded short strings."""
+
+    __slots__ = ("_strings", "_orders", "_cache_size")
+
+    def __init__(self, *, cache_size: int = 4096):
+        self._strings: dict[str, str] = {}
+        self._orders: dict[tuple, list[str]] = {}  # key tuple -> canonical key order
+        self._cache_size = cache_size
+
+    def encode(self, obj: Any) -> str:
+        kind = type(obj)
+        if kind is str:
+            return self._string(obj)
+        if kind is dict:
+            return self._object(obj)
+        if kind is list or kind is tuple:
+            return "[" + ",".join([self.encode(item) for item in obj]) + "]"
+        if obj is None:
+            return "null"
+        if kind is bool:
+            return "true" if obj else "false"
+        if kind is int or kind is float:
+            return format_number(obj)
+        return self._other(obj)
+
+    def _string(self, value: str) -> str:
+        encoded = self._strings.get(value)
+        if encoded is None:
+            encoded = encode_basestring(value)
+            if len(value) <= _MAX_CACHED_STRING and len(self._strings) < self._cache_size:
+                self._strings[value] = encoded
+        return encoded
+
+    def _object(self, obj: Mapping) -> str:
+        # Plans repeat a handful of key sets (op envelopes, params, payload
+        # shapes), so key orders are cached like short strings
+        keys = tuple(obj)
+        ordered = self._orders.get(keys)
+        if ordered is None:
+            ordered = _key_order(keys)
+            if len(self._orders) < self._cache_size:
+                self._orders[keys] = ordered
+        string, encode = self._string, self.encode
+        return "{" + ",".join([f"{string(key)}:{encode(obj[key])}" for key in ordered]) + "}"
+
+    def _other(self, obj: Any) -> str:
+        if isinstance(obj, PayloadView) and not isinstance(obj, LayeredPayload):
+            if obj._canonical is None:
+                obj._canonical = self._object(obj.materialize())
+            return obj._canonical
+        if isinstance(obj, Mapping):
+            return self._object(obj)
+        if isinstance(obj, str):
+            return self._string(str(obj))
+        if isinstance(obj, (int, float)) and not isinstance(obj, bool):
+            return format_number(obj)
+        if isinstance(obj, bool):
+            return "true" if obj else "false"
+        if isinstance(obj, (list, tuple)):
+            return "[" + ",".join([self.encode(item) for item in obj]) + "]"
+        if isinstance(obj, (datetime, date)):
+            return self._string(obj.isoformat())
+        raise TypeError(f"Object of type {type(obj).__name__} is not canonical-JSON serializable")
+
+
+_default_encoder = CanonicalEncoder()
+
+
+def canonical_dumps(obj: Any) -> str:
+    """Encode obj as canonical JSON using a shared, process-wide fragment cache."""
+    return _default_encoder.encode(obj)
@@ -0,0 +1,163 @@
+"""workman command line: compile JSONL requests as a Unix filter.
+
+    workman [--mode plan|execute|intent] [--errors PATH] [--workers N] [INPUT]
+    workman --out-dir DIR [--shards N] [--workers N] INPUT
+    workman --out-dir DIR --partitions N INPUT
+    workman --csv [--fields pm.fields.yaml] [--op OP] [--mode plan|intent] INPUT.csv
+    workman --checkpoint PATH [--checkpoint-every N] -o OUTPUT INPUT
+
+Reads one request per line from INPUT (default: stdin) and writes one JSON
+result per line to stdout. Failed lines go to the error stream (default:
+stderr) as {"line": N, "error": ..., "message": ...}. Exits 1 if any line
+failed.
+
+With --out-dir, INPUT is memory-mapped and split into newline-aligned byte
+ranges compiled in parallel into per-range shards (see workman.ingest).
+With --partitions, requests are instead hashed by aggregate onto N
+partitions so each aggregate's ops stay in input order within one shard
+(see workman.partition).
+
+With --csv, INPUT is a CSV export mapped onto op payloads through
+pm.fields.yaml and compiled into one plan per row, or one intent per
+--batch-size rows (see workman.csvimport). Errors carry the CSV row numbers.
+
+With --dedup-ttl, an intent line identical to one compiled within the last
+SECONDS (same ops, payloads, source, actor and ctx) is answered with the
+earlier result, same intent_id and plan, rather than compiled into a second
+plan. The cache is per process, so with --workers only repeats that land in
+the same worker are caught.
+
+With --checkpoint, the run is compiled deterministically and checkpointed so
+that rerunning the same command after a crash resumes where it stopped and
+produces the same output (see workman.checkpoint).
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import sys
+
+from workman.compiler import Workman
+from workman.stream import MODES, compile_stream
+
+
+def _seconds(value: str) -> float:
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = 0.0
+    if not seconds > 0:
+        raise argparse.ArgumentTypeError(f"must be a positive number of seconds, got {value!r}")
+    return seconds
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="workman", description="Compile JSONL workman requests.")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL request file (default: stdin)")
+    parser.add_argument("--mode", choices=MODES, default="plan",
+                        help="plan: compile(); execute: execute(); intent: compile_intent() (default: plan)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--errors", default=None, help="error stream file (default: stderr)")
+    parser.add_argument("--registry", default=None, help="schema registry root (default: SCHEMA_REGISTRY_ROOT)")
+    parser.add_argument("--canonical", action="store_true",
+                        help="write canonical JSON (sorted keys, the encoding plan_hash is computed over)")
+    parser.add_argument("--workers", type=int, default=0, help="compile in N worker processes (default: in-process)")
+    parser.add_argument("--chunksize", type=int, default=256, help="lines per worker task (default: 256)")
+    parser.add_argument("--out-dir", default=None,
+                        help="memory-map INPUT and write byte-range shards plus an index to this directory")
+    parser.add_argument("--shards", type=int, default=None, help="number of byte-range shards (default: --workers)")
+    parser.add_argument("--partitions", type=int, default=None,
+                        help="with --out-dir: hash requests by aggregate onto N order-preserving shards")
+    parser.add_argument("--csv", action="store_true", help="INPUT is a CSV file to import (plan or intent mode)")
+    parser.add_argument("--fields", default="pm.fields.yaml", help="with --csv: field definitions (default: pm.fields.yaml)")
+    parser.add_argument("--op", default=None, help="with --csv: op for rows without an 'op' column")
+    parser.add_argument("--batch-size", type=int, default=100, help="with --csv: rows per intent (default: 100)")
+    parser.add_argument("--checkpoint", default=None,
+                        help="checkpoint file; rerun the same command to resume an interrupted run")
+    parser.add_argument("--checkpoint-every", type=int, default=1000,
+                        help="lines between checkpoints (default: 1000)")
+    parser.add_argument("--dedup-ttl", type=_seconds, default=None, metavar="SECONDS",
+                        help="intent mode: an identical intent within SECONDS returns the first result (per process)")
+    return parser
+
+
+def _open(path: str, mode: str, default):
+    if path == "-":
+        return contextlib.nullcontext(default)
+    return open(path, mode, encoding="utf-8")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    wm = Workman(registry_root=args.registry, dedup_ttl=args.dedup_ttl)
+
+    if args.out_dir is not None:
+        if args.input == "-":
+            parser.error("--out-dir needs an INPUT file (stdin cannot be memory-mapped)")
+        if args.partitions is not None:
+            from workman.partition import partition_file
+
+            results = partition_file(args.input, args.out_dir, mode=args.mode, partitions=args.partitions,
+                                     chunksize=args.chunksize, workman=wm)
+            return 1 if any(r.errors for r in results) else 0
+
+        from workman.ingest import ingest_file
+
+        results = ingest_file(args.input, args.out_dir, mode=args.mode, workers=args.workers or None,
+                              shards=args.shards, workman=wm)
+        return 1 if any(r.errors for r in results) else 0
+
+    if args.csv:
+        if args.mode == "execute":
+            parser.error("--csv supports --mode plan or intent")
+        return _import_csv(args, wm)
+
+    if args.checkpoint is not None:
+        if args.input == "-" or args.output == "-":
+            parser.error("--checkpoint needs an INPUT file and an -o OUTPUT file")
+        from workman.checkpoint import compile_file_resumable
+
+        stats = compile_file_resumable(args.input, args.output, mode=args.mode, errors_path=args.errors,
+                                       checkpoint_path=args.checkpoint, every=args.checkpoint_every, workman=wm)
+        return 1 if stats.errors else 0
+
+    with contextlib.ExitStack() as stack:
+        source = stack.enter_context(_open(args.input, "r", sys.stdin))
+        out = stack.enter_context(_open(args.output, "w", sys.stdout))
+        err = stack.enter_context(_open(args.errors or "-", "w", sys.stderr))
+
+        pool = None
+        if args.workers > 0:
+            from workman.parallel import ParallelCompiler
+
+            pool = stack.enter_context(ParallelCompiler(wm, max_workers=args.workers, chunksize=args.chunksize))
+
+        stats = compile_stream(wm, args.mode, source, out, err, pool=pool, canonical=args.canonical)
+
+    return 1 if stats.errors else 0
+
+
+def _import_csv(args: argparse.Namespace, wm: Workman) -> int:
+    from workman.csvimport import import_csv
+    from workman.stream import dumps
+
+    failed = False
+    with contextlib.ExitStack() as stack:
+        out = stack.enter_context(_open(args.output, "w", sys.stdout))
+        err = stack.enter_context(_open(args.errors or "-", "w", sys.stderr))
+        results = import_csv(sys.stdin if args.input == "-" else args.input, args.fields, workman=wm, op=args.op,
+                             mode=args.mode, batch_size=args.batch_size)
+        for result in results:
+            if result.error is None:
+                out.write(dumps(result.result) + "\n")
+            else:
+                failed = True
+                err.write(dumps({"rows": result.rows, "error": type(result.error).__name__,
+                                 "message": str(result.error)}) + "\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""Columnar batch compilation for homogeneous bulk loads.
+
+compile_columns() takes one op and a batch given as column arrays,
+
+    {"title": ["A", "B", ...], "project_id": ["proj_1", "proj_1", ...]}
+
+and produces the same plans (or event items) as compiling each row on its
+own, without running the per-row generic path. For schemas made only of
+typed top-level properties, each column is type-checked in a single pass
+instead of validating every row, generated IDs are drawn in one bulk call,
+FK asserts are read column by column, and plans are built directly.
+
+Other schemas (formats, enums, patterns, nested constraints, ...) fall back
+to per-row validation; everything after validation stays columnar.
+
+A None cell means the field is absent from that row.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING
+
+from workman.errors import ValidationError
+from workman.ir import check_artifact_containers
+
+if TYPE_CHECKING:
+    from workman.catalog import OpSpec
+    from workman.compiler import Workman
+
+OUTPUTS = ("plans", "events")
+
+_JSON_TYPES: dict[str, type | tuple[type, ...]] = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "array": list,
+    "object": Mapping,
+}
+# Schema keywords that column type checks fully cover
+_SCHEMA_KEYWORDS = {"$schema", "$id", "title", "description", "type", "properties", "required",
+                    "additionalProperties"}
+_PROPERTY_KEYWORDS = {"type", "title", "description"}
+
+
+def compile_columns(op: str, columns: Mapping[str, Sequence], ctx: dict, *, output: str = "plans") -> list[dict]:
+    """Compile a single-op batch given as a dict of equal-length column arrays.
+
+    Returns one plan per row, or one lorchestra event item per row with
+    output="events".
+    """
+
+    from workman.compiler import default_workman
+
+    return default_workman().compile_columns(op, columns, ctx, output=output)
+
+
+def column_types(schema: dict) -> dict[str, list[str]] | None:
+    """Return {property: [json types]} if column type checks fully validate schema, else None."""
+    if schema.get("type", "object") != "object" or not set(schema) <= _SCHEMA_KEYWORDS:
+        return None
+    if not isinstance(schema.get("additionalProperties", True), bool):
+        return None
+    types: dict[str, list[str]] = {}
+    for name, prop in schema.get("properties", {}).items():
+        if not isinstance(prop, dict) or not set(prop) <= _PROPERTY_KEYWORDS:
+            return None
+        declared = prop.get("type", [])
+        declared = [declared] if isinstance(declared, str) else declared
+        if any(t not in _JSON_TYPES and t != "null" for t in declared):
+            return None
+        types[name] = declared
+    return types
+
+
+def _is_type(value: object, json_type: str) -> bool:
+    if json_type == "null":
+        return value is None
+    if isinstance(value, bool):
+        return json_type == "boolean"
+    if json_type == "integer" and isinstance(value, float):
+        return value.is_integer()
+    return isinstance(value, _JSON_TYPES[json_type])
+
+
+def _check_columns(schema: dict, types: dict[str, list[str]], columns: Mapping[str, Sequence]) -> None:
+    if schema.get("additionalProperties", True) is False:
+        extra = sorted(set(columns) - set(types))
+        if extra:
+            raise ValidationError(f"Payload validation failed: additional properties not allowed: {extra}")
+    for name in schema.get("required", ()):
+        column = columns.get(name)
+        if column is None or any(value is None for value in column):
+            row = 0 if column is None else next(i for i, value in enumerate(column) if value is None)
+            raise ValidationError(f"Payload validation failed: row {row}: '{name}' is a required property")
+    for name, column in columns.items():
+        declared = types.get(name)
+        if not declared:
+            continue
+        if len(declared) == 1 and declared[0] in ("string", "array"):
+            # Fast path for the common case: one isinstance per cell
+            expected = _JSON_TYPES[declared[0]]
+            if all(value is None or isinstance(value, expected) for value in column):
+                continue
+        for row, value in enumerate(column):
+            if value is not None and not any(_is_type(value, t) for t in declared):
+                expected = declared[0] if len(declared) == 1 else declared
+                raise ValidationError(f"Payload validation failed: row {row}: {value!r} is not of type {expected!r}")
+
+
+def _rows(columns: Mapping[str, Sequence], n: int) -> list[dict]:
+    rows: list[dict] = [{} for _ in range(n)]
+    for name, column in columns.items():
+        for row, value in zip(rows, column):
+            if value is not None:
+                row[name] = value
+    return rows
+
+
+def _render_plans(wm: Workman, op_spec: OpSpec, ids: list, supplied: list[bool], rows: list[dict],
+                  keys: list[str], fk_columns: list, ctx: dict) -> list[dict]:
+    aggregate_type = op_spec.aggregate_type
+    correlation_id = ctx.get("correlation_id")
+    wal_ctx = {field: ctx.get(field) for field in ("occurred_at", "actor", "correlation_id", "producer")}
+    plans = []
+    for row, (plan_ulid, aggregate_id, caller_supplied, payload, key) in enumerate(
+            zip(wm.new_ulids(len(rows)), ids, supplied, rows, keys)):
+        ops: list[dict] = []
+        if not op_spec.is_create:
+            ops.append(_assert("assert.exists", aggregate_type, aggregate_id))
+        elif caller_supplied:
+            ops.append(_assert("assert.not_exists", aggregate_type, aggregate_id))
+        for fk_type_column, fk_id_column in fk_columns:
+            fk_id = fk_id_column[row]
+            fk_type = fk_type_column[row] if isinstance(fk_type_column, list) else fk_type_column
+            if fk_id and fk_type:
+                ops.append(_assert("assert.exists", fk_type, fk_id))
+        for index, assertion in enumerate(ops, 1):
+            assertion["id"] = f"a{index}"
+        ops.append({
+            "jsonrpc": "2.0",
+            "id": "w1",
+            "method": "wal.append",
+            "params": {
+                "idempotency_key": key,
+                "event_type": op_spec.event_type,
+                "aggregate_type": aggregate_type,
+                "aggregate_id": aggregate_id,
+                **wal_ctx,
+                "payload": payload,
+            },
+        })
+        plans.append({
+            "plan_version": "storacle.plan/1.0.0",
+            "plan_id": f"ulid:{plan_ulid}",
+            "jsonrpc": "2.0",
+            "meta": {"source": "workman", "op": op_spec.op, "correlation_id": correlation_id},
+            "ops": ops,
+        })
+    return plans
+
+
+def _assert(method: str, aggregate_type: str, aggregate_id: str) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": None,
+        "method": method,
+        "params": {"aggregate_type": aggregate_type, "aggregate_id": aggregate_id},
+    }
+
+
+def _render_events(op_spec: OpSpec, ids: list, supplied: list[bool], rows: list[dict],
+                   keys: list[str], fk_columns: list) -> list[dict]:
+    static_fk_columns = fk_columns[:len(op_spec.fk_asserts)]
+    return [
+        {
+            "event_type": op_spec.event_type,
+            "aggregate_type": op_spec.aggregate_type,
+            "aggregate_id": aggregate_id,
+            "payload": payload,
+            "idempotency_key": key,
+            "is_create": op_spec.is_create,
+            "caller_supplied_id": caller_supplied,
+            "fk_refs": [
+                {"aggregate_type": fk_type, "aggregate_id": fk_id_column[row]}
+                for fk_type, fk_id_column in static_fk_columns
+                if fk_id_column[row]
+            ],
+        }
+        for row, (aggregate_id, caller_supplied, payload, key) in enumerate(zip(ids, supplied, rows, keys))
+    ]
+
+
+def _compile_columns(wm: Workman, op: str, columns: Mapping[str, Sequence], ctx: dict, output: str) -> list[dict]:
+    if output not in OUTPUTS:
+        raise ValueError(f"output must be one of {OUTPUTS}, got {output!r}")
+    op_spec = wm.require_op_spec(op)
+    columns = {name: list(column) for name, column in columns.items()}
+    lengths = {len(column) for column in columns.values()}
+    if len(lengths) > 1:
+        raise ValidationError(f"Columns must have equal lengths, got {sorted(lengths)}")
+    n = lengths.pop() if lengths else 0
+
+    schema = wm.registry.resolve(op_spec.request_schema)
+    types = column_types(schema)
+    rows = _rows(columns, n)
+    if types is not None:
+        wm.registry.validator(op_spec.request_schema)  # same schema check as the per-row path
+        _check_columns(schema, types, columns)
+    for payload in rows:
+        if types is None:
+            wm.validate(payload, op_spec)
+        check_artifact_containers(op, payload)
+
+    # Aggregate IDs: caller-supplied where present, one bulk draw for the rest
+    ids = columns.get(op_spec.id_field, [None] * n)
+    supplied = [bool(aggregate_id) for aggregate_id in ids]
+    generated = iter(wm.new_ids(op_spec.id_prefix, supplied.count(False)))
+    ids = [aggregate_id if has_id else next(generated) for aggregate_id, has_id in zip(ids, supplied)]
+    for payload, aggregate_id, has_id in zip(rows, ids, supplied):
+        if not has_id:
+            payload[op_spec.id_field] = aggregate_id
+
+    key_prefix = f"{ctx.get('producer', 'unknown')}:{op}:{op_spec.aggregate_type}:"
+    key_suffix = f":{ctx.get('correlation_id', 'unknown')}"
+    keys = [f"{key_prefix}{aggregate_id}{key_suffix}" for aggregate_id in ids]
+
+    # (aggregate type or type column, id column) per FK, static FKs first
+    fk_columns = [(fk_type, columns.get(fk_field, [None] * n)) for fk_field, fk_type in op_spec.fk_asserts]
+    fk_columns += [(columns.get(type_field, [None] * n), columns.get(id_field, [None] * n))
+                   for id_field, type_field in op_spec.dynamic_fk_asserts]
+
+    if output == "events":
+        return _render_events(op_spec, ids, supplied, rows, keys, fk_columns)
+    return _render_plans(wm, op_spec, ids, supplied, rows, keys, fk_columns, ctx)
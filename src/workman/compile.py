@@ -1,82 +1,83 @@
 """Plan compilation: the main workman entrypoint."""
 
-from ulid import ULID
+from __future__ import annotations
 
-from workman.assertions import assert_exists, assert_not_exists, reset_assertion_counter
-from workman.builders import build_wal_append, reset_write_counter
-from workman.catalog import get_op_spec
-from workman.errors import CompileError
-from workman.ids import generate_id, make_idempotency_key
-from workman.schema import resolve_schema, validate_payload
+from itertools import repeat
+from typing import TYPE_CHECKING, Iterable, Iterator, Sequence
+
+from workman.errors import WorkmanError
+from workman.ids import op_id_scope
+from workman.ir import AggregateIdPool, analyze, render_op_plan, render_plan, render_plan_ops
+
+if TYPE_CHECKING:
+    from workman.compiler import Workman
 
 
 def compile(op: str, payload: dict, ctx: dict, pins: dict | None = None) -> dict:
     """Compile a domain operation into a Storacle execution plan.
 
     Note: compile() may mutate the input payload dict by injecting id_field.
+    Use Workman(mutate_payloads=False) to get a read-only PayloadView instead.
     """
 
-    reset_assertion_counter()
-    reset_write_counter()
-
-    op_spec = get_op_spec(op)
-    if op_spec is None:
-        raise CompileError(f"Unknown operation: {op}", op=op)
-
-    schema = resolve_schema(op_spec.request_schema)
-    validate_payload(payload, schema)
-
-    # Artifact container FK validation: at least one container required
-    if op == "pm.artifact.create":
-        _CONTAINER_FKS = ("work_item_id", "deliverable_id", "project_id", "opsstream_id")
-        if not any(payload.get(fk) for fk in _CONTAINER_FKS):
-            from workman.errors import ValidationError
-            raise ValidationError(
-                "pm.artifact.create requires at least one container FK "
-                "(work_item_id, deliverable_id, project_id, or opsstream_id)"
-            )
-
-    caller_supplied_id = op_spec.id_field in payload and payload[op_spec.id_field]
-    if caller_supplied_id:
-        aggregate_id = payload[op_spec.id_field]
-    else:
-        aggregate_id = pins.get("id") if pins and "id" in pins else generate_id(op_spec.id_prefix)
-        payload[op_spec.id_field] = aggregate_id
-
-    assertions: list[dict] = []
-    if op_spec.is_create:
-        if caller_supplied_id:
-            assertions.append(assert_not_exists(op_spec.aggregate_type, aggregate_id))
-    else:
-        assertions.append(assert_exists(op_spec.aggregate_type, aggregate_id))
-
-    for fk_field, fk_aggregate_type in op_spec.fk_asserts:
-        if fk_field in payload and payload[fk_field]:
-            assertions.append(assert_exists(fk_aggregate_type, payload[fk_field]))
-
-    for id_field, type_field in op_spec.dynamic_fk_asserts:
-        fk_id = payload.get(id_field)
-        fk_type = payload.get(type_field)
-        if fk_id and fk_type:
-            assertions.append(assert_exists(fk_type, fk_id))
-
-    idempotency_key = make_idempotency_key(ctx, op, op_spec.aggregate_type, aggregate_id)
-    wal_op = build_wal_append(
-        idempotency_key=idempotency_key,
-        event_type=op_spec.event_type,
-        aggregate_type=op_spec.aggregate_type,
-        aggregate_id=aggregate_id,
-        payload=payload,
-        ctx=ctx,
-    )
-
-    return {
-        "plan_version": "storacle.plan/1.0.0",
-        "plan_id": f"ulid:{ULID()}",
-        "jsonrpc": "2.0",
-        "meta": {"source": "workman", "op": op, "correlation_id": ctx.get("correlation_id")},
-        "ops": assertions + [wal_op],
-    }
+    from workman.compiler import default_workman
+
+    return default_workman().compile(op, payload, ctx, pins)
 
 
+def compile_many(items: Iterable[Sequence], *, return_errors: bool = False) -> list:
+    """Compile a batch of (op, payload, ctx[, pins]) items in one call.
+
+    Each distinct schema is resolved once, generated aggregate IDs are
+    allocated in bulk, and a single op ID allocator is reused across plans.
+
+    Returns:
+        One plan per item, in order. With return_errors=True a failing item
+        yields its WorkmanError in place of a plan instead of aborting the batch.
+    """
 
+    from workman.compiler import default_workman
+
+    return default_workman().compile_many(items, return_errors=return_errors)
+
+
+def _unpack(item: Sequence) -> tuple[str, dict, dict, dict | None]:
+    op, payload, ctx, *rest = item
+    return op, payload, ctx, rest[0] if rest else None
+
+
+def _compile_many(wm: Workman, items: Iterable[Sequence], return_errors: bool) -> list:
+    items = [_unpack(item) for item in items]
+
+    # Aggregate IDs and plan IDs are drawn in bulk up front
+    id_pool = AggregateIdPool(wm, ((op, payload, pins) for op, payload, _, pins in items))
+    plan_ids: Iterator[str | None] = repeat(None)
+    if not wm.deterministic:
+        plan_ids = iter([f"ulid:{ulid}" for ulid in wm.new_ulids(len(items))])
+
+    results: list = []
+    with op_id_scope() as allocator:
+        for op, payload, ctx, pins in items:
+            try:
+                item_wm = wm.seeded("compile", op, payload, ctx, pins) if wm.deterministic else wm
+                pins = id_pool.pins(wm.require_op_spec(op), payload, pins)
+                cop = analyze(item_wm, op, payload, ctx, pins)
+                allocator.reset()
+                plan = render_plan(
+                    item_wm,
+                    render_plan_ops(cop),
+                    op=op,
+                    correlation_id=ctx.get("correlation_id"),
+                    plan_id=next(plan_ids),
+                )
+            except WorkmanError as e:
+                if not return_errors:
+                    raise
+                results.append(e)
+            else:
+                results.append(plan)
+    return results
+
+
+def _compile(wm: Workman, op: str, payload: dict, ctx: dict, pins: dict | None) -> dict:
+    return render_op_plan(wm, analyze(wm, op, payload, ctx, pins))
@@ -0,0 +1,195 @@
+"""Workman compiler instances.
+
+A Workman owns everything compilation depends on: the schema registry (with
+its schema and validator caches), the op catalog, the ID source and the clock.
+Differently configured compilers can run side by side; the module-level
+compile(), execute() and compile_intent() functions delegate to a lazily
+created default instance, which reads SCHEMA_REGISTRY_ROOT when it is created
+(set_default_workman(None) makes the next call pick up a changed value).
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Mapping, Sequence
+
+from workman.catalog import OP_CATALOG, OpSpec
+from workman.columnar import _compile_columns
+from workman.compile import _compile, _compile_many
+from workman.dedup import TTLCache
+from workman.errors import CompileError
+from workman.execute import _execute
+from workman.hashing import LeafCache, _hash_default
+from workman.ids import SeededUlids, monotonic_ulids, new_ulid, utc_now
+from workman.intent import _compile_intent, _compile_intent_stream
+from workman.ir import CompiledOp, analyze
+from workman.recompile import _recompile_intent
+from workman.schema import SchemaRegistry
+
+
+class Workman:
+    """A configured domain operation -> Storacle plan compiler.
+
+    Args:
+        registry_root: Schema registry root. When omitted, SCHEMA_REGISTRY_ROOT
+            (or ~/.local/schema-transform-registry) is read once, here.
+        catalog: Op catalog mapping op name -> OpSpec. Defaults to OP_CATALOG.
+        ulid_factory: Zero-argument callable returning a ULID string. Used for
+            aggregate IDs, plan IDs and intent IDs.
+        clock: Zero-argument callable returning a timezone-aware datetime.
+        mutate_payloads: When False, caller payloads are never written to;
+            plans and event items carry a read-only workman.views.PayloadView
+            instead (serialize with json_default or PayloadView.materialize()).
+        deterministic: When True, every call seeds a fresh SeededUlids source
+            from its own inputs, so the same input always yields byte-identical
+            output (plan_id, intent_id and generated aggregate IDs included).
+            Requires an injected clock, which supplies issued_at, and excludes
+            ulid_factory.
+        max_intent_ops: Largest ops list compile_intent() accepts (None for no
+            limit). Inheritance is linear in the op count, so large imports
+            can raise this; a per-call max_ops overrides it.
+        dedup_ttl: Seconds to remember compile_intent() results (default:
+            off). An identical intent submitted again within the TTL returns
+            the first result instead of a second plan; see workman.dedup.
+    """
+
+    def __init__(
+        self,
+        *,
+        registry_root: str | Path | None = None,
+        catalog: Mapping[str, OpSpec] | None = None,
+        ulid_factory: Callable[[], str] | None = None,
+        clock: Callable[[], datetime] | None = None,
+        mutate_payloads: bool = True,
+        deterministic: bool = False,
+        max_intent_ops: int | None = 100,
+        dedup_ttl: float | None = None,
+    ):
+        if deterministic and clock is None:
+            raise ValueError("deterministic=True requires an injected clock")
+        if deterministic and ulid_factory is not None:
+            raise ValueError("deterministic=True derives IDs from each call's inputs; do not pass ulid_factory")
+        self.registry = SchemaRegistry(registry_root)
+        self.catalog = OP_CATALOG if catalog is None else catalog
+        self.ulid_factory = ulid_factory or new_ulid
+        self.clock = clock or utc_now
+        self.mutate_payloads = mutate_payloads
+        self.deterministic = deterministic
+        self.max_intent_ops = max_intent_ops
+        self.dedup = TTLCache(dedup_ttl) if dedup_ttl else None
+        self.leaf_cache = LeafCache()
+
+    def get_op_spec(self, op: str) -> OpSpec | None:
+        return self.catalog.get(op)
+
+    def require_op_spec(self, op: str) -> OpSpec:
+        op_spec = self.catalog.get(op)
+        if op_spec is None:
+            raise CompileError(f"Unknown operation: {op}", op=op)
+        return op_spec
+
+    def new_id(self, prefix: str) -> str:
+        """Generate '{prefix}_{ulid}' from this instance's ID source."""
+        return f"{prefix}_{self.ulid_factory()}"
+
+    def new_ulids(self, n: int) -> list[str]:
+        """Draw n ULIDs; the default source allocates them in one monotonic batch."""
+        if self.ulid_factory is new_ulid:
+            return monotonic_ulids(n)
+        return [self.ulid_factory() for _ in range(n)]
+
+    def new_ids(self, prefix: str, n: int) -> list[str]:
+        """Generate n '{prefix}_{ulid}' IDs."""
+        return [f"{prefix}_{ulid}" for ulid in self.new_ulids(n)]
+
+    def validate(self, payload: Mapping, op_spec: OpSpec) -> None:
+        self.registry.validate(payload, op_spec.request_schema)
+
+    def warm(self) -> None:
+        """Load every catalog schema and compile its validator ahead of time."""
+        self.registry.warm(op_spec.request_schema for op_spec in self.catalog.values())
+
+    def seeded(self, *inputs: object) -> Workman:
+        """Return a copy sharing this instance's caches, with IDs seeded from inputs."""
+        clone = copy.copy(self)
+        clone.ulid_factory = SeededUlids(_input_digest(inputs))
+        clone.deterministic = False
+        return clone
+
+    def analyze(self, op: str, payload: dict, ctx: dict, pins: dict | None = None) -> CompiledOp:
+        """Validate an op once; render with workman.ir.render_op_plan / render_event_item."""
+        wm = self.seeded("analyze", op, payload, ctx, pins) if self.deterministic else self
+        return analyze(wm, op, payload, ctx, pins)
+
+    def compile(self, op: str, payload: dict, ctx: dict, pins: dict | None = None) -> dict:
+        """Compile a domain operation into a Storacle execution plan."""
+        wm = self.seeded("compile", op, payload, ctx, pins) if self.deterministic else self
+        return _compile(wm, op, payload, ctx, pins)
+
+    def compile_many(self, items: Iterable[Sequence], *, return_errors: bool = False) -> list:
+        """Compile (op, payload, ctx[, pins]) items; see workman.compile.compile_many."""
+        return _compile_many(self, items, return_errors)
+
+    def compile_columns(self, op: str, columns: Mapping[str, Sequence], ctx: dict, *, output: str = "plans") -> list[dict]:
+        """Compile a single-op batch of column arrays; see workman.columnar.compile_columns."""
+        wm = self.seeded("compile_columns", op, columns, ctx, output) if self.deterministic else self
+        return _compile_columns(wm, op, columns, ctx, output)
+
+    def execute(self, params: dict) -> dict:
+        """Process a domain operation and return domain event items."""
+        wm = self.seeded("execute", params) if self.deterministic else self
+        return _execute(wm, params)
+
+    def compile_intent(self, **kwargs) -> dict:
+        """Compile PM operations into a PMIntent, merged plan, diff and hash."""
+        # Neither changes the plan, so neither is part of the deterministic seed
+        executor = kwargs.pop("executor", None)
+        include_diff = kwargs.pop("include_diff", True)
+        # A preview draws no IDs, so it skips seeding too
+        deterministic = self.deterministic and not kwargs.get("preview")
+        wm = self.seeded("compile_intent", kwargs, self.clock().isoformat()) if deterministic else self
+        return _compile_intent(wm, executor=executor, include_diff=include_diff, **kwargs)
+
+    def recompile_intent(
+        self, previous: dict, edit: dict, *, ctx: dict | None = None, max_ops: int | None = None,
+    ) -> dict:
+        """Apply one edit to a compiled intent; see workman.recompile.recompile_intent."""
+        wm = self.seeded("recompile_intent", previous["items"][0].get("plan_hash"), edit) if self.deterministic else self
+        return _recompile_intent(wm, previous, edit, ctx, max_ops)
+
+    def compile_intent_stream(self, **kwargs) -> Iterator[dict]:
+        """Compile an op iterator into chained, bounded plans; see workman.intent.compile_intent_stream."""
+        return _compile_intent_stream(self, **kwargs)
+
+
+def _input_digest(inputs: tuple) -> str:
+    serialized = json.dumps(inputs, sort_keys=True, separators=(",", ":"), default=_hash_default)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+_default_workman: Workman | None = None
+_default_lock = threading.Lock()
+
+
+def default_workman() -> Workman:
+    """Return the process-wide default instance, creating it on first use."""
+    global _default_workman
+    wm = _default_workman
+    if wm is None:
+        with _default_lock:
+            if _default_workman is None:
+                _default_workman = Workman()
+            wm = _default_workman
+    return wm
+
+
+def set_default_workman(workman: Workman | None) -> None:
+    """Replace the default instance (None recreates it lazily on next use)."""
+    global _default_workman
+    with _default_lock:
+        _default_workman = workman
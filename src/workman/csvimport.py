@@ -0,0 +1,293 @@
+"""Streaming CSV import mapped through pm.fields.yaml.
+
+Spreadsheet exports become plans (one per row) or PMIntents (one per batch of
+rows). Columns are matched to fields by name ("Due At" -> due_at, or through
+an explicit column map) and coerced using the field definitions in
+pm.fields.yaml for the op's entity:
+
+    enum           case-insensitive match against the enum's values
+    array[...]     split on "," or ";"
+    number         int or float
+    object         parsed as JSON
+
+Other columns (FKs such as project_id, parent_id) pass through as stripped
+strings, and empty cells are omitted. Two columns are reserved: ``op`` picks
+the operation per row (default: the importer's op), and ``ref`` gives a row a
+label that later rows link to with ``@ref:<label>``, e.g. a work item row
+whose project_id cell is ``@ref:website``.
+
+Memory use is bounded by the batch size plus one ID per labelled row.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Mapping
+
+from workman.compiler import default_workman
+from workman.errors import CompileError, ValidationError, WorkmanError
+
+if TYPE_CHECKING:
+    from workman.compiler import Workman
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - exercised only without the csv extra
+    yaml = None
+
+MODES = ("plan", "intent")
+OP_COLUMN = "op"
+REF_COLUMN = "ref"
+_REF_PREFIX = "@ref:"
+_ARRAY_SEPARATOR = re.compile(r"\s*[,;]\s*")
+
+
+@dataclass(frozen=True)
+class FieldDef:
+    name: str
+    type: str
+    enum_values: tuple[str, ...] = ()
+
+
+@dataclass
+class FieldMap:
+    """Field definitions from pm.fields.yaml, keyed by entity and field name."""
+
+    entities: dict[str, dict[str, FieldDef]] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, spec: Mapping) -> FieldMap:
+        enums = {name: tuple(enum.get("values", ())) for name, enum in (spec.get("enums") or {}).items()}
+        entities: dict[str, dict[str, FieldDef]] = {}
+        for entry in spec.get("fields") or ():
+            enum_values = enums.get(entry.get("enum_ref"), ()) if entry.get("type") == "enum" else ()
+            entities.setdefault(entry["entity"], {})[entry["name"]] = FieldDef(
+                name=entry["name"], type=entry.get("type", "string"), enum_values=enum_values)
+        return cls(entities)
+
+    @classmethod
+    def load(cls, path: str | Path) -> FieldMap:
+        if yaml is None:
+            raise ImportError("CSV import needs PyYAML to read pm.fields.yaml: pip install 'workman[csv]'")
+        with open(path) as f:
+            return cls.from_dict(yaml.safe_load(f))
+
+    def fields(self, entity: str) -> dict[str, FieldDef]:
+        return self.entities.get(entity, {})
+
+
+def normalize_header(header: str) -> str:
+    return re.sub(r"[\s\-]+", "_", header.strip()).lower()
+
+
+def coerce(value: str, field_def: FieldDef | None) -> Any:
+    """Convert a non-empty CSV cell to the field's JSON type."""
+    if field_def is None:
+        return value
+    kind = field_def.type
+    if kind == "enum":
+        wanted = value.upper().replace(" ", "_")
+        for allowed in field_def.enum_values:
+            if allowed.upper() == wanted:
+                return allowed
+        raise ValidationError(f"{field_def.name}: {value!r} is not one of {list(field_def.enum_values)}")
+    if kind.startswith("array"):
+        return [item for item in _ARRAY_SEPARATOR.split(value) if item]
+    if kind == "number":
+        try:
+            return int(value)
+        except ValueError:
+            try:
+                return float(value)
+            except ValueError:
+                raise ValidationError(f"{field_def.name}: {value!r} is not a number") from None
+    if kind == "object":
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError as e:
+            raise ValidationError(f"{field_def.name}: invalid JSON ({e})") from None
+    return value
+
+
+@dataclass
+class ImportResult:
+    """One compiled unit: a plan per row, or an intent result per batch.
+
+    rows are 1-based CSV data row numbers; exactly one of result/error is set.
+    """
+
+    rows: list[int]
+    result: dict | None = None
+    error: WorkmanError | None = None
+
+
+@dataclass
+class _Row:
+    number: int
+    op: str
+    payload: dict
+    ref: str | None
+    links: dict[str, str]  # field -> referenced label
+
+
+class CsvImporter:
+    """Map CSV rows onto ops and compile them in batches.
+
+    Args:
+        fields: FieldMap (see FieldMap.load) used for column coercion.
+        workman: Compiler to use (default: the default instance).
+        op: Operation for rows without an ``op`` column value.
+        mode: "plan" (one compile() plan per row) or "intent" (one
+            compile_intent() per batch of rows).
+        batch_size: Rows per batch; intents are capped at 100 ops.
+        columns: Optional {CSV header: field name} overrides.
+        source, actor, ctx: Intent envelope (intent mode) or plan ctx (plan mode).
+    """
+
+    def __init__(
+        self,
+        fields: FieldMap,
+        *,
+        workman: Workman | None = None,
+        op: str | None = None,
+        mode: str = "plan",
+        batch_size: int = 100,
+        columns: Mapping[str, str] | None = None,
+        source: str = "csv-import",
+        actor: dict | None = None,
+        ctx: dict | None = None,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        self.fields = fields
+        self.workman = workman or default_workman()
+        self.op = op
+        self.mode = mode
+        self.batch_size = max(1, min(batch_size, 100) if mode == "intent" else batch_size)
+        self.columns = {normalize_header(k): v for k, v in (columns or {}).items()}
+        self.source = source
+        self.actor = actor or {"actor_type": "system", "actor_id": source}
+        self.ctx = ctx or {}
+        self._labels: dict[str, str] = {}  # ref label -> aggregate_id
+
+    def import_rows(self, lines: Iterable[str]) -> Iterator[ImportResult]:
+        """Compile CSV text lines (header first), yielding results in row order."""
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if header is None:
+            return
+        names = [self.columns.get(normalize_header(h), normalize_header(h)) for h in header]
+
+        batch: list[_Row] = []
+        for number, cells in enumerate(reader, 1):
+            if not any(cell.strip() for cell in cells):
+                continue
+            try:
+                batch.append(self._map_row(number, names, cells))
+            except WorkmanError as e:
+                yield from self._flush(batch)
+                batch = []
+                yield ImportResult(rows=[number], error=e)
+                continue
+            if len(batch) >= self.batch_size:
+                yield from self._flush(batch)
+                batch = []
+        yield from self._flush(batch)
+
+    def import_file(self, path: str | Path) -> Iterator[ImportResult]:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            yield from self.import_rows(f)
+
+    def _map_row(self, number: int, names: list[str], cells: list[str]) -> _Row:
+        values = {name: cell.strip() for name, cell in zip(names, cells) if cell.strip()}
+        op = values.pop(OP_COLUMN, None) or self.op
+        if not op:
+            raise CompileError("row has no op and the importer has no default op")
+        op_spec = self.workman.require_op_spec(op)
+        ref = values.pop(REF_COLUMN, None)
+        defs = self.fields.fields(op_spec.aggregate_type)
+        payload: dict = {}
+        links: dict[str, str] = {}
+        for name, value in values.items():
+            if value.startswith(_REF_PREFIX):
+                links[name] = value[len(_REF_PREFIX):]
+            else:
+                payload[name] = coerce(value, defs.get(name))
+        return _Row(number, op, payload, ref, links)
+
+    def _flush(self, batch: list[_Row]) -> Iterator[ImportResult]:
+        if not batch:
+            return
+        if self.mode == "plan":
+            yield from self._compile_plans(batch)
+        else:
+            yield self._compile_intent(batch)
+
+    def _resolve_label(self, row: _Row, label: str) -> str:
+        try:
+            return self._labels[label]
+        except KeyError:
+            raise CompileError(f"Unknown {_REF_PREFIX}{label}: no earlier row has ref {label!r}", op=row.op) from None
+
+    def _compile_plans(self, batch: list[_Row]) -> Iterator[ImportResult]:
+        wm = self.workman
+        for row in batch:
+            try:
+                for name, label in row.links.items():
+                    row.payload[name] = self._resolve_label(row, label)
+                # A labelled row's generated ID is drawn up front so that later
+                # rows can link to it; pins keep it a generated (not caller) ID.
+                pins = None
+                op_spec = wm.require_op_spec(row.op)
+                if row.ref is not None and not row.payload.get(op_spec.id_field):
+                    pins = {"id": wm.new_id(op_spec.id_prefix)}
+                plan = wm.compile(row.op, row.payload, self.ctx, pins)
+            except WorkmanError as e:
+                yield ImportResult(rows=[row.number], error=e)
+                continue
+            if row.ref is not None:
+                self._labels[row.ref] = plan["ops"][-1]["params"]["aggregate_id"]
+            yield ImportResult(rows=[row.number], result=plan)
+
+    def _compile_intent(self, batch: list[_Row]) -> ImportResult:
+        numbers = [row.number for row in batch]
+        batch_labels: dict[str, int] = {}
+        ops = []
+        try:
+            for index, row in enumerate(batch):
+                for name, label in row.links.items():
+                    # Same-intent links become @ref:N so inheritance sees them;
+                    # links to earlier intents use the ID those intents produced.
+                    if label in batch_labels:
+                        row.payload[name] = f"{_REF_PREFIX}{batch_labels[label]}"
+                    else:
+                        row.payload[name] = self._resolve_label(row, label)
+                if row.ref is not None:
+                    batch_labels[row.ref] = index
+                ops.append({"op": row.op, "payload": row.payload})
+            result = self.workman.compile_intent(ops=ops, source=self.source, actor=self.actor, ctx=self.ctx or None)
+        except WorkmanError as e:
+            return ImportResult(rows=numbers, error=e)
+
+        aggregate_ids = [op["params"]["aggregate_id"] for op in result["items"][0]["plan"]["ops"]
+                         if op["method"] == "wal.append"]
+        for label, index in batch_labels.items():
+            self._labels[label] = aggregate_ids[index]
+        return ImportResult(rows=numbers, result=result)
+
+
+def import_csv(source: str | Path | Iterable[str], fields: FieldMap | str | Path, **options) -> Iterator[ImportResult]:
+    """Import a CSV file path or an iterable of CSV lines.
+
+    fields is a FieldMap or a path to pm.fields.yaml; options go to CsvImporter.
+    """
+    if not isinstance(fields, FieldMap):
+        fields = FieldMap.load(fields)
+    importer = CsvImporter(fields, **options)
+    if isinstance(source, (str, Path)):
+        return importer.import_file(source)
+    return importer.import_rows(source)
@@ -0,0 +1,72 @@
+"""Short-lived result cache for deduplicating repeated submissions.
+
+Workman(dedup_ttl=SECONDS) keeps each compile_intent() result under a key
+derived from the intent's content hash (see workman.intent.intent_content_hash)
+and the options that shape the result. An identical intent submitted again
+within the TTL gets a copy of the first result back, with the same
+intent_id, plan and plan_hash, instead of a second plan that would write
+everything twice. Results are copied in and out of the cache, so callers
+may modify what they are given.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+
+class TTLCache:
+    """A bounded mapping whose entries expire ttl seconds after they were stored.
+
+    Args:
+        ttl: Seconds an entry stays valid.
+        maxsize: Entries kept at most; the oldest is evicted first.
+        timer: Monotonic clock (injectable for tests).
+    """
+
+    def __init__(self, ttl: float, *, maxsize: int = 1024, timer: Callable[[], float] = time.monotonic):
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._timer = timer
+        self._entries: OrderedDict[Hashable, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> object | None:
+        """Return the live entry for key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= self._timer():
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def put(self, key: Hashable, value: object) -> None:
+        now = self._timer()
+        with self._lock:
+            # Entries are in insertion order, so expired ones are at the front
+            while self._entries and next(iter(self._entries.values()))[0] <= now:
+                self._entries.popitem(last=False)
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __getstate__(self) -> dict:
+        # Entries stay behind when a compiler is shipped to a worker process
+        return {"ttl": self.ttl, "maxsize": self.maxsize, "timer": self._timer}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["ttl"], maxsize=state["maxsize"], timer=state["timer"])
@@ -12,6 +12,9 @@ class CompileError(WorkmanError):
         self.op = op
         super().__init__(message)
 
+    def __reduce__(self):
+        return type(self), (str(self), self.op)
+
 
 class ValidationError(WorkmanError):
     """Payload or schema validation error."""
@@ -19,3 +22,7 @@ class ValidationError(WorkmanError):
     def __init__(self, message: str, errors: list[object] | None = None):
         self.errors = errors or []
         super().__init__(message)
+
+    def __reduce__(self):
+        # jsonschema errors reference their validator and schema; only their text crosses processes
+        return type(self), (str(self), [str(error) for error in self.errors])
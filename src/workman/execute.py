@@ -5,10 +5,15 @@ workman is the keeper of work primitives - it knows domain event shapes
 but does NOT know storage semantics.
 """
 
-from workman.catalog import get_op_spec
-from workman.errors import CompileError
-from workman.ids import generate_id, make_idempotency_key
-from workman.schema import resolve_schema, validate_payload
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from workman.errors import CompileError, WorkmanError
+from workman.ir import AggregateIdPool, analyze, render_event_item
+
+if TYPE_CHECKING:
+    from workman.compiler import Workman
 
 
 def execute(params: dict) -> dict:
@@ -39,80 +44,96 @@ def execute(params: dict) -> dict:
             "stats": {"input": 1, "output": 1, "skipped": 0, "errors": 0}
         }
 
+    Batch form: params may instead carry "items", a list of {"op", "payload",
+    "ctx"?} dicts (a top-level "ctx" is the default for items without one).
+    Every item is processed; failures do not stop the batch. The result lists
+    one event item per success, and an "errors" list of {"index", "op",
+    "error", "message"} entries. stats.skipped counts items whose
+    idempotency_key repeats an earlier item in the same batch (they would be
+    no-ops downstream), and stats.errors counts failures. Schema and
+    validator lookups are shared across items, and generated aggregate IDs
+    are drawn in bulk.
+
     Raises:
         CompileError: Unknown operation
         ValidationError: Schema/payload validation failure
     """
+    from workman.compiler import default_workman
+
+    return default_workman().execute(params)
+
+
+def _execute(wm: Workman, params: dict) -> dict:
+    if "items" in params:
+        return _execute_batch(wm, params["items"], params.get("ctx", {}))
+
     op = params["op"]
 
     # Route meta-ops that aren't individual PM catalog entries
     if op == "pm.compile_intent":
-        from workman.intent import compile_intent
         kwargs = {
             "source": params["source"],
             "actor": params["actor"],
             "ctx": params.get("ctx"),
+            "max_ops": params.get("max_ops"),
         }
         if "ops" in params:
             kwargs["ops"] = params["ops"]
         else:
             kwargs["op_name"] = params["op_name"]
             kwargs["payload"] = params["payload"]
-        return compile_intent(**kwargs)
+        return wm.compile_intent(**kwargs)
 
     payload = params["payload"]
     ctx = params.get("ctx", {})
 
-    op_spec = get_op_spec(op)
-    if op_spec is None:
-        raise CompileError(f"Unknown operation: {op}", op=op)
-
-    schema = resolve_schema(op_spec.request_schema)
-    validate_payload(payload, schema)
-
-    # Artifact container FK validation: at least one container required
-    if op == "pm.artifact.create":
-        _CONTAINER_FKS = ("work_item_id", "deliverable_id", "project_id", "opsstream_id")
-        if not any(payload.get(fk) for fk in _CONTAINER_FKS):
-            from workman.errors import ValidationError
-            raise ValidationError(
-                "pm.artifact.create requires at least one container FK "
-                "(work_item_id, deliverable_id, project_id, or opsstream_id)"
-            )
-
-    # Generate aggregate ID if not provided
-    caller_supplied_id = bool(op_spec.id_field in payload and payload[op_spec.id_field])
-    if caller_supplied_id:
-        aggregate_id = payload[op_spec.id_field]
-    else:
-        aggregate_id = generate_id(op_spec.id_prefix)
-        payload[op_spec.id_field] = aggregate_id
-
-    idempotency_key = make_idempotency_key(ctx, op, op_spec.aggregate_type, aggregate_id)
-
-    # Build FK refs for lorchestra to use for assertions
-    fk_refs = []
-    for fk_field, fk_aggregate_type in op_spec.fk_asserts:
-        if fk_field in payload and payload[fk_field]:
-            fk_refs.append({
-                "aggregate_type": fk_aggregate_type,
-                "aggregate_id": payload[fk_field],
-            })
-
-    # Build domain event item (NOT a StoraclePlan op)
-    event_item = {
-        "event_type": op_spec.event_type,
-        "aggregate_type": op_spec.aggregate_type,
-        "aggregate_id": aggregate_id,
-        "payload": payload,
-        "idempotency_key": idempotency_key,
-        "is_create": op_spec.is_create,
-        "caller_supplied_id": caller_supplied_id,
-        "fk_refs": fk_refs,
-    }
+    cop = analyze(wm, op, payload, ctx)
 
     return {
         "schema_version": "1.0",
-        "items": [event_item],
+        "items": [render_event_item(cop)],
         "stats": {"input": 1, "output": 1, "skipped": 0, "errors": 0},
     }
+
+
+def _execute_batch(wm: Workman, entries: list[dict], default_ctx: dict) -> dict:
+    id_pool = AggregateIdPool(wm, (
+        (entry.get("op"), entry.get("payload") or {}, None) for entry in entries if isinstance(entry, dict)
+    ))
+
+    items: list[dict] = []
+    errors: list[dict] = []
+    seen_keys: set[str] = set()
+    skipped = 0
+
+    for index, entry in enumerate(entries):
+        op = entry.get("op") if isinstance(entry, dict) else None
+        try:
+            if (
+                not isinstance(entry, dict)
+                or not isinstance(op, str)
+                or not isinstance(entry.get("payload"), dict)
+                or not isinstance(entry.get("ctx", default_ctx), dict)
+            ):
+                raise CompileError("batch items must be {op: str, payload: dict, ctx?: dict}", op=op)
+            if op == "pm.compile_intent":
+                raise CompileError("pm.compile_intent is not supported in batch items", op=op)
+            payload = entry["payload"]
+            pins = id_pool.pins(wm.require_op_spec(op), payload, None)
+            cop = analyze(wm, op, payload, entry.get("ctx", default_ctx), pins)
+        except WorkmanError as e:
+            errors.append({"index": index, "op": op, "error": type(e).__name__, "message": str(e)})
+            continue
+
+        if cop.idempotency_key in seen_keys:
+            skipped += 1
+            continue
+        seen_keys.add(cop.idempotency_key)
+        items.append(render_event_item(cop))
+
+    return {
+        "schema_version": "1.0",
+        "items": items,
+        "errors": errors,
+        "stats": {"input": len(entries), "output": len(items), "skipped": skipped, "errors": len(errors)},
+    }
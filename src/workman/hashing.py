@@ -0,0 +1,250 @@
+"""Plan hashing.
+
+plan_hash is the root of a Merkle tree over the plan (PLAN_HASH_VERSION):
+
+    leaf      sha256(0x00 || canonical JSON of one plan op)
+    node      sha256(0x01 || left || right)
+    ops root  the RFC 6962 tree over the leaves: levels are paired left to
+              right and an odd node at the end of a level is promoted as is;
+              sha256(b"") for a plan with no ops
+    envelope  sha256(canonical JSON of the plan without "ops")
+    root      sha256(0x02 || envelope || ops root), as 64 hex chars
+
+Every op gets its own digest, so a verifier holding plan_hash can check any
+subset of ops against it with merkle_proof() / verify_op(), and changing one
+op re-hashes one leaf plus the path above it. Canonical JSON is defined in
+workman.canonical. Each Workman keeps the leaves of its recent intent plans in
+a LeafCache, so recompile_intent() re-hashes only what an edit changed.
+
+flat_plan_hash is the previous scheme, SHA256 over the canonical JSON of the
+whole plan, and _compute_plan_hash the one before it, SHA256 over
+json.dumps([plan], sort_keys=True, default=str). Both are kept for comparing
+against hashes recorded earlier.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Iterable, Mapping
+
+from workman.canonical import _default_encoder
+from workman.views import PayloadView
+
+PLAN_HASH_VERSION = "merkle-sha256/1"
+
+_OPS = "ops"
+_LEAF = b"\x00"
+_NODE = b"\x01"
+_ROOT = b"\x02"
+_EMPTY = hashlib.sha256(b"").digest()
+
+
+def _hash_default(obj: object) -> object:
+    if isinstance(obj, PayloadView):
+        return obj.materialize()
+    return str(obj)
+
+
+def _compute_plan_hash(plans: list[dict]) -> str:
+    """Compute SHA256 hash of serialized plans for integrity verification (pre-canonical scheme)."""
+    serialized = json.dumps(plans, sort_keys=True, default=_hash_default)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+def flat_plan_hash(plan: Mapping) -> str:
+    """SHA256 of the canonical JSON encoding of one whole plan (pre-Merkle scheme)."""
+    return hashlib.sha256(_default_encoder.encode(plan).encode()).hexdigest()
+
+
+def compute_plan_hash(plan: Mapping) -> str:
+    """Merkle plan_hash of one plan (see the module docstring)."""
+    hasher = PlanHasher(plan)
+    for op in plan[_OPS]:
+        hasher.update(op)
+    return hasher.hexdigest()
+
+
+def op_digest(op: Mapping) -> bytes:
+    """Leaf digest of one plan op."""
+    return hashlib.sha256(_LEAF + _default_encoder.encode(op).encode()).digest()
+
+
+def envelope_digest(plan: Mapping) -> bytes:
+    """Digest of every plan field except "ops"."""
+    envelope = {key: value for key, value in plan.items() if key != _OPS}
+    return hashlib.sha256(_default_encoder.encode(envelope).encode()).digest()
+
+
+def _node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(_NODE + left + right).digest()
+
+
+def _root(envelope: bytes, ops_root: bytes) -> str:
+    return hashlib.sha256(_ROOT + envelope + ops_root).hexdigest()
+
+
+class MerkleTree:
+    """Merkle tree over leaf digests that keeps every level.
+
+    Leaves are appended without hashing; the levels above are built on the
+    next root() or path(). Once built, set() re-hashes only the path from the
+    changed leaf to the root. insert() and delete() shift later leaves, so
+    the levels are rebuilt.
+    """
+
+    __slots__ = ("_levels", "_stale")
+
+    def __init__(self, leaves: Iterable[bytes] = ()):
+        self._levels: list[list[bytes]] = [list(leaves)]
+        self._stale = True
+
+    def __len__(self) -> int:
+        return len(self._levels[0])
+
+    @property
+    def leaves(self) -> list[bytes]:
+        return list(self._levels[0])
+
+    def root(self) -> bytes:
+        if not self._levels[0]:
+            return _EMPTY
+        self._build()
+        return self._levels[-1][0]
+
+    def _build(self) -> None:
+        if not self._stale:
+            return
+        del self._levels[1:]
+        level = self._levels[0]
+        while len(level) > 1:
+            level = [
+                _node(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+                for i in range(0, len(level), 2)
+            ]
+            self._levels.append(level)
+        self._stale = False
+
+    def append(self, leaf: bytes) -> None:
+        self._levels[0].append(leaf)
+        self._stale = True
+
+    def set(self, index: int, leaf: bytes) -> None:
+        self._levels[0][index] = leaf
+        if self._stale:
+            return
+        for depth, level in enumerate(self._levels[:-1]):
+            pair = index & ~1
+            index //= 2
+            self._levels[depth + 1][index] = (
+                _node(level[pair], level[pair + 1]) if pair + 1 < len(level) else level[pair]
+            )
+
+    def insert(self, index: int, leaf: bytes) -> None:
+        self._levels[0].insert(index, leaf)
+        self._stale = True
+
+    def delete(self, index: int) -> None:
+        del self._levels[0][index]
+        self._stale = True
+
+    def path(self, index: int) -> list[tuple[str, bytes]]:
+        """Audit path for a leaf: (side, sibling digest) pairs from the leaf upwards."""
+        if not 0 <= index < len(self):
+            raise IndexError(f"leaf index {index} out of range for {len(self)} leaves")
+        self._build()
+        path = []
+        for level in self._levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                path.append(("L" if sibling < index else "R", level[sibling]))
+            index //= 2
+        return path
+
+
+class PlanHasher:
+    """Running compute_plan_hash(plan) for a plan whose ops are appended one at a time.
+
+    Create it from the plan envelope (and the leaf digests of any ops already
+    in the plan) and call update() with each op in order; envelope fields may
+    still change until hexdigest() is called.
+    """
+
+    __slots__ = ("_plan", "tree")
+
+    def __init__(self, plan: Mapping, leaves: Iterable[bytes] = ()):
+        self._plan = plan
+        self.tree = MerkleTree(leaves)
+
+    def update(self, op: Mapping) -> None:
+        self.tree.append(op_digest(op))
+
+    def op_hashes(self) -> list[str]:
+        """Hex leaf digest of each op so far, in plan order."""
+        return [leaf.hex() for leaf in self.tree.leaves]
+
+    def hexdigest(self) -> str:
+        return _root(envelope_digest(self._plan), self.tree.root())
+
+
+class LeafCache:
+    """plan_hash -> leaf digests of a compiler's recently compiled intents, for recompile_intent().
+
+    Keeping a plan's leaves lets an edit of it skip re-hashing unchanged ops.
+    Bounded to maxsize plans, oldest first out; safe to share between threads.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, list[bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def remember(self, plan_hash: str, tree: MerkleTree) -> None:
+        leaves = tree.leaves
+        with self._lock:
+            self._entries[plan_hash] = leaves
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get(self, plan_hash: str) -> list[bytes] | None:
+        with self._lock:
+            return self._entries.get(plan_hash)
+
+    def __getstate__(self) -> dict:
+        # Entries stay behind when a compiler is shipped to a worker process
+        return {"maxsize": self.maxsize}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["maxsize"])
+
+
+def merkle_proof(plan: Mapping, index: int) -> dict:
+    """Proof that plan["ops"][index] is part of compute_plan_hash(plan).
+
+    The proof carries the envelope digest, the op count and the audit path,
+    so verify_op() needs only the op itself and the plan_hash.
+    """
+    tree = MerkleTree(op_digest(op) for op in plan[_OPS])
+    return {
+        "version": PLAN_HASH_VERSION,
+        "index": index,
+        "size": len(tree),
+        "envelope": envelope_digest(plan).hex(),
+        "path": [[side, digest.hex()] for side, digest in tree.path(index)],
+    }
+
+
+def verify_op(plan_hash: str, op: Mapping, proof: Mapping) -> bool:
+    """Check one plan op against a plan_hash using a merkle_proof()."""
+    if proof.get("version") != PLAN_HASH_VERSION:
+        return False
+    digest = op_digest(op)
+    for side, sibling in proof["path"]:
+        sibling = bytes.fromhex(sibling)
+        digest = _node(sibling, digest) if side == "L" else _node(digest, sibling)
+    return _root(bytes.fromhex(proof["envelope"]), digest) == plan_hash
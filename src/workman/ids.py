@@ -1,8 +1,84 @@
 """ID generation and idempotency key construction."""
 
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Iterator
+
 from ulid import ULID
 
 
+def new_ulid() -> str:
+    """Return a fresh ULID string (the default ID source)."""
+
+    return str(ULID())
+
+
+def monotonic_ulids(n: int) -> list[str]:
+    """Return n ULID strings sharing one timestamp, with consecutive random parts.
+
+    One clock read and one urandom call for the whole batch; the result sorts
+    in allocation order, like a monotonic ULID generator. The shared timestamp
+    is encoded once and the 80-bit random parts (exactly 16 base32 characters
+    each) are encoded together in a single base64.b32encode call.
+    """
+
+    if n <= 0:
+        return []
+    timestamp = (time.time_ns() // 1_000_000).to_bytes(6, "big")
+    randomness = int.from_bytes(os.urandom(10), "big") % ((1 << 80) - n)
+    prefix = str(ULID.from_bytes(timestamp + bytes(10)))[:10]
+    random_parts = b"".join([(randomness + i).to_bytes(10, "big") for i in range(n)])
+    encoded = base64.b32encode(random_parts).translate(_RFC4648_TO_CROCKFORD).decode()
+    return [prefix + encoded[i:i + 16] for i in range(0, 16 * n, 16)]
+
+
+_RFC4648_TO_CROCKFORD = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ234567", b"0123456789ABCDEFGHJKMNPQRSTVWXYZ")
+
+
+def utc_now() -> datetime:
+    """Return the current UTC time (the default clock)."""
+
+    return datetime.now(timezone.utc)
+
+
+class SeededUlids:
+    """Deterministic ULID source: the n-th ULID is derived from sha256(seed || n).
+
+    Two sources built from the same seed yield the same sequence, which is what
+    makes Workman(deterministic=True) reproducible.
+    """
+
+    __slots__ = ("_seed", "_n")
+
+    def __init__(self, seed: str | bytes):
+        self._seed = seed.encode() if isinstance(seed, str) else seed
+        self._n = 0
+
+    def __call__(self) -> str:
+        self._n += 1
+        digest = hashlib.sha256(self._seed + self._n.to_bytes(8, "big")).digest()
+        return str(ULID.from_bytes(digest[:16]))
+
+
+class FixedClock:
+    """Clock that always returns the same instant."""
+
+    __slots__ = ("at",)
+
+    def __init__(self, at: datetime):
+        self.at = at
+
+    def __call__(self) -> datetime:
+        return self.at
+
+
 def generate_id(prefix: str) -> str:
     """Generate a ULID-based ID with a stable prefix.
 
@@ -27,3 +103,61 @@ def make_idempotency_key(
     producer = ctx.get("producer", "unknown")
     correlation_id = ctx.get("correlation_id", "unknown")
     return f"{producer}:{op}:{aggregate_type}:{aggregate_id}:{correlation_id}"
+
+
+class OpIdAllocator:
+    """Allocates plan op IDs: a1, a2, ... for assertions and w1, w2, ... for writes.
+
+    Counters are unbounded. Each compile() runs under its own allocator (see
+    op_id_scope), so concurrent compiles never interleave IDs.
+    """
+
+    __slots__ = ("_assertions", "_writes")
+
+    def __init__(self) -> None:
+        self._assertions = 0
+        self._writes = 0
+
+    def next_assertion_id(self) -> str:
+        self._assertions += 1
+        return f"a{self._assertions}"
+
+    def next_write_id(self) -> str:
+        self._writes += 1
+        return f"w{self._writes}"
+
+    def reset(self) -> None:
+        self._assertions = 0
+        self._writes = 0
+
+    def reset_assertions(self) -> None:
+        self._assertions = 0
+
+    def reset_writes(self) -> None:
+        self._writes = 0
+
+
+_op_ids: ContextVar[OpIdAllocator] = ContextVar("workman_op_ids")
+
+
+def current_op_ids() -> OpIdAllocator:
+    """Return the allocator for the current context, creating one if needed."""
+
+    try:
+        return _op_ids.get()
+    except LookupError:
+        allocator = OpIdAllocator()
+        _op_ids.set(allocator)
+        return allocator
+
+
+@contextmanager
+def op_id_scope() -> Iterator[OpIdAllocator]:
+    """Run a block with a fresh allocator, restoring the previous one afterwards."""
+
+    allocator = OpIdAllocator()
+    token = _op_ids.set(allocator)
+    try:
+        yield allocator
+    finally:
+        _op_ids.reset(token)
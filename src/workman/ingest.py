@@ -0,0 +1,142 @@
+"""Memory-mapped, byte-range-sharded parallel JSONL ingestion.
+
+ingest_file() maps the input once, splits it into newline-aligned byte
+ranges and hands each range to a worker process. Workers map the same file
+themselves (nothing is copied through IPC, and no byte is read twice) and
+compile their range into their own shard:
+
+    out_dir/part-00000.jsonl        compiled results, one line per request
+    out_dir/part-00000.errors.jsonl failed lines ({"offset", "error", "message"})
+    out_dir/part-00000.index        one "<input_offset> <o|e> <shard_offset>" line per request
+    out_dir/index.json              manifest: input byte range and counts per shard
+
+The index maps every request's byte offset in the input to the byte offset
+of its result in the output ("o") or error ("e") shard.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from workman.compiler import default_workman
+from workman.stream import MODES, compile_line
+
+if TYPE_CHECKING:
+    from workman.compiler import Workman
+
+
+@dataclass
+class ShardResult:
+    shard: int
+    input_start: int
+    input_end: int
+    output: str
+    lines: int = 0
+    errors: int = 0
+
+
+def split_ranges(buf: bytes | mmap.mmap, n: int) -> list[tuple[int, int]]:
+    """Split buf into at most n contiguous [start, end) ranges that end on a newline."""
+    size = len(buf)
+    bounds = [0]
+    for k in range(1, n):
+        newline = buf.find(b"\n", max(bounds[-1], k * size // n))
+        if newline == -1:
+            break
+        if newline + 1 > bounds[-1]:
+            bounds.append(newline + 1)
+    if bounds[-1] < size:
+        bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def shard_paths(out_dir: Path, shard: int) -> tuple[Path, Path, Path]:
+    stem = out_dir / f"part-{shard:05d}"
+    return stem.with_suffix(".jsonl"), Path(f"{stem}.errors.jsonl"), stem.with_suffix(".index")
+
+
+def ingest_range(wm: Workman, path: str, mode: str, shard: int, start: int, end: int, out_dir: str) -> ShardResult:
+    """Compile the requests in bytes [start, end) of path into shard files."""
+    out_path, err_path, index_path = shard_paths(Path(out_dir), shard)
+    result = ShardResult(shard=shard, input_start=start, input_end=end, output=out_path.name)
+
+    with open(path, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            open(out_path, "wb") as out, open(err_path, "wb") as err, open(index_path, "wb") as index:
+        pos = start
+        while pos < end:
+            newline = mm.find(b"\n", pos, end)
+            line_end = end if newline == -1 else newline
+            line = mm[pos:line_end]
+            if line.strip():
+                ok, text = compile_line(wm, mode, line)
+                if ok:
+                    index.write(b"%d o %d\n" % (pos, out.tell()))
+                    out.write(text.encode())
+                    out.write(b"\n")
+                    result.lines += 1
+                else:
+                    index.write(b"%d e %d\n" % (pos, err.tell()))
+                    err.write(b'{"offset":%d,%s\n' % (pos, text[1:].encode()))
+                    result.errors += 1
+            pos = line_end + 1
+    return result
+
+
+def _ingest_range_in_worker(path: str, mode: str, shard: int, start: int, end: int, out_dir: str) -> ShardResult:
+    from workman import parallel
+
+    return ingest_range(parallel._worker_wm, path, mode, shard, start, end, out_dir)
+
+
+def ingest_file(
+    path: str | os.PathLike,
+    out_dir: str | os.PathLike,
+    *,
+    mode: str = "plan",
+    workers: int | None = None,
+    shards: int | None = None,
+    workman: Workman | None = None,
+) -> list[ShardResult]:
+    """Compile a JSONL file into per-range output shards using worker processes.
+
+    Args:
+        path: Input JSONL file (must be a regular, mappable file).
+        out_dir: Directory for shard, error, index and manifest files.
+        mode: "plan", "execute" or "intent" (see workman.stream).
+        workers: Worker processes (default os.cpu_count()); 1 runs in-process.
+        shards: Number of byte ranges (default: workers).
+        workman: Compiler configuration (default: the default instance).
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+    wm = workman or default_workman()
+    workers = workers or os.cpu_count() or 1
+    path = os.fspath(path)
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    if os.path.getsize(path) == 0:
+        ranges = []
+    else:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            ranges = split_ranges(mm, shards or workers)
+
+    jobs = [(path, mode, shard, start, end, str(out)) for shard, (start, end) in enumerate(ranges)]
+    if workers == 1 or len(jobs) <= 1:
+        results = [ingest_range(wm, *job) for job in jobs]
+    else:
+        from workman.parallel import _init_worker
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_init_worker, initargs=(wm,)) as pool:
+            results = list(pool.map(_ingest_range_in_worker, *zip(*jobs)))
+
+    manifest = {"input": path, "mode": mode, "shards": [asdict(r) for r in results]}
+    (out / "index.json").write_text(json.dumps(manifest, indent=2))
+    return results
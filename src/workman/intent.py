@@ -3,23 +3,35 @@
 compile_intent() accepts raw operation data and generates the PMIntent envelope
 internally (intent_id + issued_at), then compiles ops against the PM schema.
 Returns a CallableResult containing the generated intent, StoraclePlans,
-human-readable diff strings, and a SHA256 plan hash.
+human-readable diff strings, a Merkle plan hash (see workman.hashing) and a
+content hash of the intent itself (see intent_content_hash).
 
 Supports single-op (op_name + payload) and multi-op (ops list) modes.
+compile_intent_stream() compiles an op iterator into a chain of bounded plans.
 """
 
 from __future__ import annotations
 
+import copy
 import hashlib
-import json
+import os
 import re
-from datetime import datetime, timezone
-
-from ulid import ULID
-
-from workman.compile import compile
-from workman.errors import CompileError
-from workman.catalog import get_op_spec
+import reprlib
+from concurrent.futures import Executor
+from functools import partial
+from itertools import islice
+from typing import TYPE_CHECKING, Iterable, Iterator, Mapping, MutableMapping
+
+from workman.canonical import canonical_dumps
+from workman.catalog import OpSpec
+from workman.errors import CompileError, WorkmanError
+from workman.hashing import PLAN_HASH_VERSION, PlanHasher, compute_plan_hash
+from workman.ids import op_id_scope
+from workman.ir import CompiledOp, analyze, check_op, render_plan, render_plan_ops
+from workman.views import LayeredPayload, PayloadView
+
+if TYPE_CHECKING:
+    from workman.compiler import Workman
 
 _REF_PATTERN = re.compile(r"^@ref:(\d+)$")
 
@@ -34,6 +46,10 @@ def compile_intent(
     source: str,
     actor: dict,
     ctx: dict | None = None,
+    max_ops: int | None = None,
+    executor: Executor | None = None,
+    include_diff: bool = True,
+    preview: bool = False,
 ) -> dict:
     """Compile PM operations from raw data by constructing intent envelope and validating against schema.
 
@@ -47,29 +63,57 @@ def compile_intent(
         source: Source of the operation (e.g., 'life-cli', 'system').
         actor: Actor who initiated the operation {'actor_type': str, 'actor_id': str}.
         ctx: Optional execution context overrides.
+        max_ops: Op limit for this intent (default: the compiler's
+            max_intent_ops, 100 unless configured).
+        executor: Optional concurrent.futures executor to validate ops on.
+            Refs and inheritance are resolved up front, so ops are validated
+            independently, one chunk per CPU; the output is unchanged. Schema
+            validation is pure Python, so use a ProcessPoolExecutor (or
+            threads on a free-threaded build); process workers load
+            validators per chunk, which pays off only for large intents.
+        include_diff: False leaves "diff" out of the result; intent_diff()
+            renders it later if it turns out to be needed.
+        preview: Only show what the intent would do. Ops are validated and
+            their refs and inheritance resolved, but no ULIDs are drawn, no
+            plan is built and nothing is hashed. items[0] then holds intent
+            (with a placeholder intent_id), diff, ids (the aggregate ID of
+            each op) and preview=True. Generated IDs are provisional
+            '{prefix}_' + the op index as 26 digits; they are not the IDs a
+            real compile will assign.
 
     Returns:
-        CallableResult dict with items[0] containing intent, plan, diff, plan_hash.
+        CallableResult dict with items[0] containing intent, plan, diff,
+        plan_hash, plan_hash_version and content_hash. With a compiler
+        built with dedup_ttl, an identical intent (same content_hash, ctx
+        and include_diff) within the TTL returns a copy of the first result,
+        with the same intent_id, plan and plan_hash.
 
     Raises:
         CompileError: If parameters are invalid or compilation fails.
     """
-    # Validate source
-    if not source or not isinstance(source, str):
-        raise CompileError("source must be a non-empty string", op="pm.compile_intent")
+    from workman.compiler import default_workman
+
+    return default_workman().compile_intent(
+        op_name=op_name, payload=payload, ops=ops, source=source, actor=actor, ctx=ctx, max_ops=max_ops,
+        executor=executor, include_diff=include_diff, preview=preview,
+    )
 
-    # Validate actor
-    if not isinstance(actor, dict):
-        raise CompileError("actor must be a dict", op="pm.compile_intent")
-    if "actor_type" not in actor:
-        raise CompileError("actor must have actor_type field", op="pm.compile_intent")
-    if "actor_id" not in actor:
-        raise CompileError("actor must have actor_id field", op="pm.compile_intent")
-    if actor["actor_type"] not in _VALID_ACTOR_TYPES:
-        raise CompileError(
-            f"actor_type must be one of {_VALID_ACTOR_TYPES}, got '{actor['actor_type']}'",
-            op="pm.compile_intent",
-        )
+
+def _compile_intent(
+    wm: Workman,
+    *,
+    op_name: str | None = None,
+    payload: dict | None = None,
+    ops: list[dict] | None = None,
+    source: str,
+    actor: dict,
+    ctx: dict | None = None,
+    max_ops: int | None = None,
+    executor: Executor | None = None,
+    include_diff: bool = True,
+    preview: bool = False,
+) -> dict:
+    _validate_envelope(source, actor)
 
     # Resolve ops list — either from single-op params or multi-op list
     if ops is not None and op_name is not None:
@@ -78,6 +122,11 @@ def compile_intent(
     if ops is not None:
         if not isinstance(ops, list) or len(ops) == 0:
             raise CompileError("ops must be a non-empty list", op="pm.compile_intent")
+        for i, op_entry in enumerate(ops):
+            if not isinstance(op_entry, Mapping):
+                raise CompileError(f"ops[{i}] must be an object", op="pm.compile_intent")
+            if not isinstance(op_entry.get("payload", {}), Mapping):
+                raise CompileError(f"ops[{i}] payload must be an object", op="pm.compile_intent")
         intent_ops = ops
     elif op_name is not None:
         if not op_name or not isinstance(op_name, str):
@@ -88,12 +137,32 @@ def compile_intent(
     else:
         raise CompileError("Must provide either (op_name, payload) or ops", op="pm.compile_intent")
 
-    if len(intent_ops) > 100:
-        raise CompileError("PMIntent exceeds maximum of 100 ops", op="pm.compile_intent")
+    limit = wm.max_intent_ops if max_ops is None else max_ops
+    if limit is not None and len(intent_ops) > limit:
+        raise CompileError(f"PMIntent exceeds maximum of {limit} ops", op="pm.compile_intent")
+
+    if preview:
+        return _preview_intent(wm, intent_ops, source, actor, ctx, executor)
+
+    # An identical intent compiled within the dedup TTL gets the same result back
+    try:
+        content_hash = intent_content_hash(intent_ops, source, actor)
+    except (TypeError, ValueError):
+        content_hash = None  # not JSON; compiling it fails below with the usual error
+    dedup_key = None
+    if wm.dedup is not None and content_hash is not None:
+        try:
+            dedup_key = (content_hash, canonical_dumps(ctx or {}), include_diff)
+        except (TypeError, ValueError):
+            pass  # a ctx that cannot be keyed is just not cached
+    if dedup_key is not None:
+        cached = wm.dedup.get(dedup_key)
+        if cached is not None:
+            return copy.deepcopy(cached)  # callers may annotate results; the cached one stays as compiled
 
     # Generate intent envelope
-    intent_id = f"pmi_{ULID()}"
-    issued_at = datetime.now(timezone.utc).isoformat()
+    intent_id = f"pmi_{wm.ulid_factory()}"
+    issued_at = wm.clock().isoformat()
 
     intent = {
         "intent_id": intent_id,
@@ -105,82 +174,114 @@ def compile_intent(
 
     ops = intent["ops"]
 
-    # Build context from intent
-    intent_ctx = {
-        "correlation_id": intent["intent_id"],
-        "producer": intent["source"],
-        "actor": intent.get("actor"),
-        "occurred_at": intent.get("issued_at"),
+    op_compiler = _OpCompiler(wm, _intent_ctx(intent, ctx))
+    resolved = _resolve_and_check(wm, op_compiler, ops, executor)
+    compiled = [analyze(wm, op_name, op_payload, op_compiler.ctx, pins, checked=True)
+                for op_name, op_payload, pins in resolved]
+
+    # The plan hash is computed incrementally as the merged plan is built
+    merged_plan, hasher = _render_merged_plan(wm, compiled, intent["intent_id"])
+    plan_hash = hasher.hexdigest()
+    wm.leaf_cache.remember(plan_hash, hasher.tree)
+
+    item = {"intent": intent, "plan": merged_plan}
+    if include_diff:
+        item["diff"] = [_make_diff_line(cop.op, cop.op_spec, cop.aggregate_id, cop.payload) for cop in compiled]
+    item["plan_hash"] = plan_hash
+    item["plan_hash_version"] = PLAN_HASH_VERSION
+    item["content_hash"] = content_hash
+
+    result = {
+        "schema_version": "1.0",
+        "items": [item],
+        "stats": {
+            "input": len(ops),
+            "output": len(ops),
+            "skipped": 0,
+            "errors": 0,
+        },
     }
-    if ctx:
-        intent_ctx.update(ctx)
+    if dedup_key is not None:
+        wm.dedup.put(dedup_key, copy.deepcopy(result))
+    return result
+
+
+def intent_content_hash(ops: list[Mapping], source: str, actor: Mapping) -> str:
+    """SHA256 over what an intent asks for: its ops' names and payloads (@ref tokens as written), source and actor.
+
+    Unlike plan_hash it leaves out everything drawn at compile time (intent_id,
+    issued_at, plan_id, generated aggregate IDs), so the same submission
+    always hashes the same. Single-op intents hash like a one-element ops list.
+    """
+    normalized = {
+        "ops": [{"op": op_entry.get("op"), "payload": op_entry.get("payload", {})} for op_entry in ops],
+        "source": source,
+        "actor": actor,
+    }
+    return hashlib.sha256(canonical_dumps(normalized).encode()).hexdigest()
+
 
-    plans: list[dict] = []
-    diff: list[str] = []
-    generated_ids: list[str] = []  # aggregate_id per op index
-    prior_ops: list[tuple[str, dict, str]] = []  # (op_name, payload, aggregate_id)
+def _resolve_and_check(
+    wm: Workman, op_compiler: _OpCompiler, ops: list[dict], executor: Executor | None, provisional: bool = False,
+) -> list[tuple[str, Mapping, dict | None]]:
+    """Resolve and validate every op; returns (op, payload, pins) per op for analyze(checked=True).
 
+    Ops depend on each other only through @ref / inheritance resolution, which
+    needs nothing from validation; every op is resolved first (in order,
+    stopping at the first failure), then the resolved ops are validated
+    independently. With provisional=True generated IDs are preview
+    placeholders (see _provisional_id) instead of drawn ULIDs.
+    """
+    resolved: list[tuple[str, Mapping, dict | None]] = []
+    failure: WorkmanError | None = None
     for i, op_entry in enumerate(ops):
-        entry_op_name = op_entry["op"]
-        entry_payload = dict(op_entry.get("payload", {}))  # shallow copy to avoid mutation
+        pins = None
+        if provisional and (op_spec := wm.get_op_spec(op_entry["op"])) is not None:
+            pins = {"id": _provisional_id(op_spec.id_prefix, i)}
+        try:
+            resolved.append(op_compiler.resolve(i, op_entry, pins))
+        except WorkmanError as e:
+            failure = e
+            break
+
+    # The lowest-index failure wins, as if the ops had been compiled one by one
+    checked = _check_ops(wm, resolved, executor)
+    if checked is not None:
+        raise checked[1]
+    if failure is not None:
+        raise failure
+    return resolved
 
-        # Resolve @ref:N references
-        entry_payload = _resolve_refs(entry_payload, generated_ids, i)
 
-        # Resolve inheritance (auto-fill parent container fields)
-        _resolve_inheritance(entry_op_name, entry_payload, prior_ops)
-
-        # Compile the individual op
-        plan = compile(entry_op_name, entry_payload, intent_ctx)
-        plans.append(plan)
-
-        # Extract the aggregate_id from the plan's wal.append op
-        aggregate_id = _extract_aggregate_id(plan)
-        generated_ids.append(aggregate_id)
-        prior_ops.append((entry_op_name, entry_payload, aggregate_id))
-
-        # Generate diff line
-        diff_line = _make_diff_line(entry_op_name, aggregate_id, entry_payload)
-        diff.append(diff_line)
-
-    # Merge all individual plans into a single StoraclePlan
-    all_ops = []
-    for plan in plans:
-        all_ops.extend(plan["ops"])
-
-    # Renumber IDs for uniqueness across the merged plan
-    a_count = 0
-    w_count = 0
-    for op_entry_merged in all_ops:
-        if op_entry_merged["method"].startswith("assert"):
-            a_count += 1
-            op_entry_merged["id"] = f"a{a_count}"
-        else:
-            w_count += 1
-            op_entry_merged["id"] = f"w{w_count}"
-
-    merged_plan = {
-        "plan_version": "storacle.plan/1.0.0",
-        "plan_id": f"ulid:{ULID()}",
-        "jsonrpc": "2.0",
-        "meta": {
-            "source": "workman",
-            "op": "pm.compile_intent",
-            "correlation_id": intent["intent_id"],
-        },
-        "ops": all_ops,
-    }
+def _provisional_id(prefix: str, index: int) -> str:
+    # ULID-sized, so previews lay out like the real thing; the digits are the op index
+    return f"{prefix}_{index:026d}"
+
 
-    # Compute plan hash over the merged plan
-    plan_hash = _compute_plan_hash([merged_plan])
+def _preview_intent(
+    wm: Workman, ops: list[dict], source: str, actor: dict, ctx: dict | None, executor: Executor | None,
+) -> dict:
+    intent = {
+        "intent_id": _provisional_id("pmi", 0),
+        "ops": ops,
+        "source": source,
+        "actor": actor,
+        "issued_at": wm.clock().isoformat(),
+    }
+    op_compiler = _OpCompiler(wm, _intent_ctx(intent, ctx))
+    resolved = _resolve_and_check(wm, op_compiler, ops, executor, provisional=True)
+    diff = [
+        _make_diff_line(op_name, wm.get_op_spec(op_name), aggregate_id, op_payload)
+        for (op_name, op_payload, _), aggregate_id in zip(resolved, op_compiler.generated_ids)
+    ]
 
     return {
         "schema_version": "1.0",
         "items": [{
             "intent": intent,
-            "plan": merged_plan,
             "diff": diff,
-            "plan_hash": plan_hash,
+            "ids": op_compiler.generated_ids,
+            "preview": True,
         }],
         "stats": {
             "input": len(ops),
@@ -191,8 +292,261 @@ def compile_intent(
     }
 
 
-def _resolve_refs(payload: dict, generated_ids: list[str], current_index: int) -> dict:
-    """Replace @ref:N tokens with actual aggregate IDs from earlier ops."""
+def _check_chunk(wm: Workman, chunk: list[tuple[int, str, Mapping]]) -> tuple[int, WorkmanError] | None:
+    for i, op_name, op_payload in chunk:
+        try:
+            check_op(wm, op_name, op_payload)
+        except WorkmanError as e:
+            return i, e
+    return None
+
+
+def _check_ops(
+    wm: Workman, resolved: list[tuple[str, Mapping, dict | None]], executor: Executor | None,
+) -> tuple[int, WorkmanError] | None:
+    """Validate resolved ops, on executor if given; returns the lowest-index (index, error)."""
+    items = [(i, op_name, op_payload) for i, (op_name, op_payload, _) in enumerate(resolved)]
+    if executor is None or len(items) < 2:
+        return _check_chunk(wm, items)
+    size = -(-len(items) // (os.cpu_count() or 1))
+    chunks = [items[start:start + size] for start in range(0, len(items), size)]
+    for failure in executor.map(partial(_check_chunk, wm), chunks):
+        if failure is not None:
+            return failure
+    return None
+
+
+def compile_intent_stream(
+    *,
+    ops: Iterable[dict],
+    source: str,
+    actor: dict,
+    ctx: dict | None = None,
+    chunk_size: int = 500,
+) -> Iterator[dict]:
+    """Compile an arbitrarily long stream of PM ops into a chain of bounded merged plans.
+
+    Ops are consumed lazily, chunk_size at a time. Each chunk is compiled
+    into its own merged plan and yielded as soon as it is ready, so plans can
+    be shipped while later ops are still being compiled. @ref:N tokens
+    (N counts ops from the start of the stream) and container inheritance
+    carry across chunks; apart from the current chunk, only one aggregate ID
+    per op is retained. The op-count limit of compile_intent() does not apply.
+
+    Each yielded CallableResult has items[0] with:
+        intent     the shared envelope (intent_id, source, actor, issued_at)
+                   with this chunk's ops
+        chunk      {"index", "start", "end", "last", "prev_hash"}
+        plan, diff as in compile_intent(), for this chunk's ops
+        plan_hash  plan hash chained to the previous chunk: the first chunk's
+                   is the chunk's own Merkle plan hash, later ones are
+                   sha256(prev_hash + plan hash), see chain_plan_hash()
+    """
+    from workman.compiler import default_workman
+
+    return default_workman().compile_intent_stream(
+        ops=ops, source=source, actor=actor, ctx=ctx, chunk_size=chunk_size,
+    )
+
+
+def chain_plan_hash(prev_hash: str | None, plan: dict) -> str:
+    """plan_hash of a streamed chunk, given the previous chunk's plan_hash (None for the first)."""
+    return _chain_hash(prev_hash, compute_plan_hash(plan))
+
+
+def _chain_hash(prev_hash: str | None, plan_hash: str) -> str:
+    if prev_hash is None:
+        return plan_hash
+    return hashlib.sha256(f"{prev_hash}{plan_hash}".encode()).hexdigest()
+
+
+def _chunks(ops: Iterable[dict], size: int) -> Iterator[tuple[list[dict], bool]]:
+    """Yield (chunk, is_last), reading one chunk ahead."""
+    it = iter(ops)
+    chunk = list(islice(it, size))
+    while chunk:
+        following = list(islice(it, size))
+        yield chunk, not following
+        chunk = following
+
+
+def _compile_intent_stream(
+    wm: Workman,
+    *,
+    ops: Iterable[dict],
+    source: str,
+    actor: dict,
+    ctx: dict | None = None,
+    chunk_size: int = 500,
+) -> Iterator[dict]:
+    _validate_envelope(source, actor)
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    envelope: dict | None = None
+    op_compiler: _OpCompiler | None = None
+    prev_hash: str | None = None
+    start = 0
+    issued_at = wm.clock().isoformat()
+
+    for index, (chunk_ops, last) in enumerate(_chunks(ops, chunk_size)):
+        # Deterministic compilers seed each chunk from its own ops and the chain so far
+        chunk_wm = wm
+        if wm.deterministic:
+            chunk_wm = wm.seeded("compile_intent_stream", source, actor, ctx, issued_at, index, chunk_ops, prev_hash)
+
+        if envelope is None:
+            envelope = {
+                "intent_id": f"pmi_{chunk_wm.ulid_factory()}",
+                "source": source,
+                "actor": actor,
+                "issued_at": issued_at,
+            }
+            op_compiler = _OpCompiler(chunk_wm, _intent_ctx(envelope, ctx))
+        op_compiler.wm = chunk_wm
+
+        compiled: list[CompiledOp] = []
+        diff: list[str] = []
+        for i, op_entry in enumerate(chunk_ops, start):
+            cop = op_compiler.compile(i, op_entry)
+            compiled.append(cop)
+            diff.append(_make_diff_line(cop.op, cop.op_spec, cop.aggregate_id, cop.payload))
+
+        plan, hasher = _render_merged_plan(chunk_wm, compiled, envelope["intent_id"])
+        plan_hash = _chain_hash(prev_hash, hasher.hexdigest())
+        end = start + len(chunk_ops)
+
+        yield {
+            "schema_version": "1.0",
+            "items": [{
+                "intent": {**envelope, "ops": chunk_ops},
+                "chunk": {"index": index, "start": start, "end": end, "last": last, "prev_hash": prev_hash},
+                "plan": plan,
+                "diff": diff,
+                "plan_hash": plan_hash,
+                "plan_hash_version": PLAN_HASH_VERSION,
+            }],
+            "stats": {
+                "input": len(chunk_ops),
+                "output": len(chunk_ops),
+                "skipped": 0,
+                "errors": 0,
+            },
+        }
+        prev_hash, start = plan_hash, end
+
+    if envelope is None:
+        raise CompileError("ops must be a non-empty iterable", op="pm.compile_intent")
+
+
+def _validate_envelope(source: str, actor: dict) -> None:
+    # Validate source
+    if not source or not isinstance(source, str):
+        raise CompileError("source must be a non-empty string", op="pm.compile_intent")
+
+    # Validate actor
+    if not isinstance(actor, dict):
+        raise CompileError("actor must be a dict", op="pm.compile_intent")
+    if "actor_type" not in actor:
+        raise CompileError("actor must have actor_type field", op="pm.compile_intent")
+    if "actor_id" not in actor:
+        raise CompileError("actor must have actor_id field", op="pm.compile_intent")
+    if actor["actor_type"] not in _VALID_ACTOR_TYPES:
+        raise CompileError(
+            f"actor_type must be one of {_VALID_ACTOR_TYPES}, got '{actor['actor_type']}'",
+            op="pm.compile_intent",
+        )
+
+
+def _intent_ctx(intent: dict, ctx: dict | None) -> dict:
+    # Build context from intent
+    intent_ctx = {
+        "correlation_id": intent["intent_id"],
+        "producer": intent["source"],
+        "actor": intent.get("actor"),
+        "occurred_at": intent.get("issued_at"),
+    }
+    if ctx:
+        intent_ctx.update(ctx)
+    return intent_ctx
+
+
+class _OpCompiler:
+    """Compiles an intent's ops in order, carrying @ref targets and inheritance state between them."""
+
+    __slots__ = ("wm", "ctx", "generated_ids", "entities")
+
+    def __init__(self, wm: Workman, ctx: dict):
+        self.wm = wm
+        self.ctx = ctx
+        self.generated_ids: list[str] = []  # aggregate_id per op index
+        self.entities = _EntityIndex()
+
+    def compile(self, i: int, op_entry: Mapping, pins: dict | None = None) -> CompiledOp:
+        entry_op_name, entry_payload, pins = self.resolve(i, op_entry, pins)
+
+        # Analyze the individual op (validation, aggregate ID, FK refs)
+        return analyze(self.wm, entry_op_name, entry_payload, self.ctx, pins)
+
+    def resolve(self, i: int, op_entry: Mapping, pins: dict | None = None) -> tuple[str, Mapping, dict | None]:
+        """Resolve op i's refs and inheritance and fix its aggregate ID, without validating it.
+
+        Returns (op, payload, pins) for analyze(). Later ops depend on this
+        one only through the aggregate ID and container fields recorded here.
+        """
+        entry_op_name = op_entry["op"]
+        op_payload = op_entry.get("payload", {})
+        if not isinstance(op_payload, Mapping):
+            raise CompileError(f"Op {i} payload must be a dict", op="pm.compile_intent")
+
+        # Resolve @ref:N references
+        resolved = _resolve_refs(op_payload, self.generated_ids, i)
+        if self.wm.mutate_payloads:
+            entry_payload = dict(op_payload)  # one shallow copy; the caller's ops are never mutated
+            entry_payload.update(resolved)
+        else:
+            entry_payload = LayeredPayload(op_payload, resolved)
+
+        # Resolve inheritance (auto-fill parent container fields)
+        _resolve_inheritance(entry_op_name, entry_payload, self.entities)
+        if isinstance(entry_payload, LayeredPayload):
+            entry_payload = entry_payload.freeze()
+
+        # Fix the aggregate ID now (analyze() injects it) so later ops can resolve against it
+        op_spec = self.wm.require_op_spec(entry_op_name)
+        aggregate_id = entry_payload.get(op_spec.id_field)
+        if aggregate_id:
+            # Not validated yet: a malformed ID is left out of the index for validation to report
+            if isinstance(aggregate_id, str):
+                self.entities.add(aggregate_id, entry_payload)
+        else:
+            if not (pins and "id" in pins):
+                pins = {**(pins or {}), "id": self.wm.new_id(op_spec.id_prefix)}
+            aggregate_id = pins["id"]
+            self.entities.add(aggregate_id, PayloadView(entry_payload, {op_spec.id_field: aggregate_id}))
+        self.generated_ids.append(aggregate_id)
+        return entry_op_name, entry_payload, pins
+
+
+def _render_merged_plan(wm: Workman, compiled: list[CompiledOp], intent_id: str) -> tuple[dict, PlanHasher]:
+    """Render every op into a single StoraclePlan and return it with its plan hasher.
+
+    One allocator numbers IDs a1.. / w1.. across the whole merged plan, and
+    each op is fed to the plan hash as it is appended.
+    """
+    plan = render_plan(wm, [], op="pm.compile_intent", correlation_id=intent_id)
+    hasher = PlanHasher(plan)
+    plan_ops = plan["ops"]
+    with op_id_scope():
+        for cop in compiled:
+            for plan_op in render_plan_ops(cop):
+                plan_ops.append(plan_op)
+                hasher.update(plan_op)
+    return plan, hasher
+
+
+def _resolve_refs(payload: Mapping, generated_ids: list[str], current_index: int) -> dict:
+    """Return {key: aggregate_id} for every @ref:N token in payload, resolved against earlier ops."""
     resolved = {}
     for key, value in payload.items():
         if isinstance(value, str):
@@ -220,24 +574,36 @@ def _resolve_refs(payload: dict, generated_ids: list[str], current_index: int) -
                     )
 
                 resolved[key] = generated_ids[ref_index]
-            else:
-                resolved[key] = value
-        else:
-            resolved[key] = value
     return resolved
 
 
-def _extract_aggregate_id(plan: dict) -> str:
-    """Extract the aggregate_id from a compiled plan's wal.append op."""
-    for op in plan.get("ops", []):
-        if op.get("method") == "wal.append":
-            return op["params"]["aggregate_id"]
-    raise CompileError("Plan has no wal.append op", op="pm.compile_intent")
+_DIFF_FIELDS = 6  # cap on payload fields shown per line, for readability
+_DIFF_VALUE_BUDGET = 80  # most characters one rendered value may take
 
+# Bounded repr for non-string values: containers are cut off after a few
+# items and two levels of nesting, so rendering cost does not grow with the
+# size of a labels array or a meta dict.
+_diff_repr = reprlib.Repr()
+_diff_repr.maxlevel = 2
+_diff_repr.maxdict = _diff_repr.maxlist = _diff_repr.maxtuple = 4
+_diff_repr.maxset = _diff_repr.maxfrozenset = _diff_repr.maxdeque = 4
+_diff_repr.maxstring = 50
+_diff_repr.maxlong = _diff_repr.maxother = _DIFF_VALUE_BUDGET
 
-def _make_diff_line(op_name: str, aggregate_id: str, payload: dict) -> str:
+
+def _diff_value(value: object) -> str:
+    if isinstance(value, str):
+        if len(value) > 50:
+            value = value[:47] + "..."
+        return repr(value)
+    text = _diff_repr.repr(value)
+    if len(text) > _DIFF_VALUE_BUDGET:
+        text = text[:_DIFF_VALUE_BUDGET - 3] + "..."
+    return text
+
+
+def _make_diff_line(op_name: str, op_spec: OpSpec | None, aggregate_id: str, payload: Mapping) -> str:
     """Generate a human-readable diff line for an operation."""
-    op_spec = get_op_spec(op_name)
     if op_spec is None:
         return f"UNKNOWN {op_name} {aggregate_id}"
 
@@ -250,21 +616,75 @@ def _make_diff_line(op_name: str, aggregate_id: str, payload: dict) -> str:
     for key, value in payload.items():
         if key == op_spec.id_field:
             continue
-        if isinstance(value, str) and len(value) > 50:
-            value = value[:47] + "..."
-        parts.append(f"{key}={value!r}")
+        parts.append(f"{key}={_diff_value(value)}")
+        if len(parts) == _DIFF_FIELDS:
+            break
 
-    summary = ", ".join(parts[:6])  # cap at 6 fields for readability
+    summary = ", ".join(parts)
     return f"{verb} {op_spec.aggregate_type} {aggregate_id} ({summary})"
 
 
-def _compute_plan_hash(plans: list[dict]) -> str:
-    """Compute SHA256 hash of serialized plans for integrity verification."""
-    serialized = json.dumps(plans, sort_keys=True, default=str)
-    return hashlib.sha256(serialized.encode()).hexdigest()
+def intent_diff(item: Mapping, *, workman: Workman | None = None) -> list[str]:
+    """Render the diff lines of a compiled intent item (result["items"][0]).
 
+    Gives the "diff" compile_intent() would have included, for results
+    compiled with include_diff=False: lines are rendered only when asked for,
+    from the intent's op names and the plan's wal.append ops.
+    """
+    from workman.compiler import default_workman
+
+    wm = workman or default_workman()
+    writes = [plan_op["params"] for plan_op in item["plan"]["ops"] if plan_op["method"] == "wal.append"]
+    return [
+        _make_diff_line(op_entry["op"], wm.get_op_spec(op_entry["op"]), params["aggregate_id"], params["payload"])
+        for op_entry, params in zip(item["intent"]["ops"], writes)
+    ]
+
+
+_CONTAINER_FIELDS = ("deliverable_id", "project_id", "opsstream_id")
+
+
+class _EntityIndex:
+    """Per-aggregate container state of the ops compiled so far in an intent.
+
+    Replaces scanning every prior op: lookups and updates are O(1), so
+    inheritance over an n-op intent is linear.
+    """
+
+    __slots__ = ("_first", "_latest")
+
+    def __init__(self) -> None:
+        self._first: dict[str, dict[str, object]] = {}  # aggregate_id -> containers of its first op
+        self._latest: dict[str, dict[str, object]] = {}  # aggregate_id -> last value per container field
 
-def _resolve_inheritance(op_name: str, payload: dict, prior_ops: list[tuple[str, dict, str]]) -> None:
+    def add(self, aggregate_id: str, payload: Mapping) -> None:
+        # Only container fields are kept, so no payload outlives its op
+        if aggregate_id not in self._first:
+            self._first[aggregate_id] = {name: payload[name] for name in _CONTAINER_FIELDS if name in payload}
+        latest = self._latest.setdefault(aggregate_id, {})
+        for field_name in _CONTAINER_FIELDS:
+            if field_name in payload:
+                latest[field_name] = payload[field_name]
+
+    def parent_field(self, entity_id: str, field_name: str) -> tuple[bool, str | None]:
+        """Look up a field from the entity's first op in this intent.
+
+        Returns (found, value) — found=True means the entity was touched by an
+        earlier op, value may be None if that op doesn't set the field.
+        """
+        containers = self._first.get(entity_id) if isinstance(entity_id, str) else None
+        if containers is None:
+            return False, None
+        return True, containers.get(field_name)
+
+    def entity_field(self, entity_id: str, field_name: str) -> str | None:
+        """Most recent value of a container field for an entity across earlier ops."""
+        if not isinstance(entity_id, str):
+            return None  # unvalidated payload value; validation reports it
+        return self._latest.get(entity_id, {}).get(field_name)
+
+
+def _resolve_inheritance(op_name: str, payload: MutableMapping, entities: _EntityIndex) -> None:
     """Anchor-based container inheritance (ADR-002).
 
     Hierarchy: OpsStream -> Project -> Deliverable -> WorkItem
@@ -278,7 +698,7 @@ def _resolve_inheritance(op_name: str, payload: dict, prior_ops: list[tuple[str,
         if del_id:
             # Deliverable is the anchor — auto-fill project (overwrites any explicit value).
             # If the deliverable has no project, clear the work item's project too.
-            found, parent_project = _find_parent_field(prior_ops, del_id, "project_id")
+            found, parent_project = entities.parent_field(del_id, "project_id")
             if found:
                 if parent_project:
                     payload["project_id"] = parent_project
@@ -290,7 +710,7 @@ def _resolve_inheritance(op_name: str, payload: dict, prior_ops: list[tuple[str,
         wi_id = payload.get("work_item_id")
         if wi_id and not payload.get("deliverable_id"):
             # No deliverable in this move — check if work item has one from prior ops
-            current_del = _find_entity_field(prior_ops, wi_id, "deliverable_id")
+            current_del = entities.entity_field(wi_id, "deliverable_id")
             if current_del:
                 if payload.get("project_id"):
                     raise CompileError(
@@ -309,7 +729,7 @@ def _resolve_inheritance(op_name: str, payload: dict, prior_ops: list[tuple[str,
 
         if wi_id and not payload.get("deliverable_id") and not payload.get("project_id"):
             # No deliverable or project in this move — check if work item has a project
-            current_proj = _find_entity_field(prior_ops, wi_id, "project_id")
+            current_proj = entities.entity_field(wi_id, "project_id")
             if current_proj and payload.get("opsstream_id"):
                 raise CompileError(
                     f"Cannot reassign opsstream: work_item {wi_id} is anchored to "
@@ -322,30 +742,9 @@ def _resolve_inheritance(op_name: str, payload: dict, prior_ops: list[tuple[str,
         # project → opsstream auto-fill
         proj_id = payload.get("project_id")
         if proj_id:
-            found, parent_ops = _find_parent_field(prior_ops, proj_id, "opsstream_id")
+            found, parent_ops = entities.parent_field(proj_id, "opsstream_id")
             if found:
                 if parent_ops:
                     payload["opsstream_id"] = parent_ops
                 else:
                     payload.pop("opsstream_id", None)
-
-
-def _find_parent_field(prior_ops: list[tuple[str, dict, str]], entity_id: str, field_name: str) -> tuple[bool, str | None]:
-    """Look up a field from a prior op's payload by aggregate_id.
-
-    Returns (found, value) — found=True means the entity exists in prior_ops,
-    value may be None if the entity doesn't have that field.
-    """
-    for prev_op_name, prev_payload, prev_aggregate_id in prior_ops:
-        if prev_aggregate_id == entity_id:
-            return True, prev_payload.get(field_name)
-    return False, None
-
-
-def _find_entity_field(prior_ops: list[tuple[str, dict, str]], entity_id: str, field_name: str) -> str | None:
-    """Find the most recent value of a field for an entity across prior ops."""
-    result = None
-    for _, prev_payload, prev_aggregate_id in prior_ops:
-        if prev_aggregate_id == entity_id and field_name in prev_payload:
-            result = prev_payload[field_name]
-    return result
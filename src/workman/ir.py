@@ -0,0 +1,212 @@
+"""Compiled-op intermediate representation shared by compile(), execute() and compile_intent().
+
+analyze() does everything that depends on the op and payload — catalog lookup,
+schema validation, the artifact container check, aggregate ID resolution and
+FK extraction — exactly once. The render_* functions turn the result into
+Storacle plan ops, a plan envelope, or a lorchestra domain event item without
+re-validating.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Iterator, Mapping
+
+from workman.assertions import assert_exists, assert_not_exists
+from workman.builders import build_wal_append
+from workman.catalog import OpSpec
+from workman.errors import ValidationError
+from workman.ids import make_idempotency_key, op_id_scope
+from workman.views import PayloadView
+
+if TYPE_CHECKING:
+    from workman.compiler import Workman
+
+_CONTAINER_FKS = ("work_item_id", "deliverable_id", "project_id", "opsstream_id")
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledOp:
+    """A validated domain operation, ready to render."""
+
+    op: str
+    op_spec: OpSpec
+    aggregate_id: str
+    caller_supplied_id: bool
+    payload: Mapping
+    ctx: dict
+    idempotency_key: str
+    fk_refs: tuple[tuple[str, str], ...]
+    dynamic_fk_refs: tuple[tuple[str, str], ...] = ()
+
+
+def check_artifact_containers(op: str, payload: Mapping) -> None:
+    """Artifact container FK validation: at least one container required."""
+    if op == "pm.artifact.create" and not any(payload.get(fk) for fk in _CONTAINER_FKS):
+        raise ValidationError(
+            "pm.artifact.create requires at least one container FK "
+            "(work_item_id, deliverable_id, project_id, or opsstream_id)"
+        )
+
+
+def check_op(wm: Workman, op: str, payload: Mapping) -> OpSpec:
+    """Schema validation and the artifact container check; the per-op work that needs no other op."""
+    op_spec = wm.require_op_spec(op)
+    wm.validate(payload, op_spec)
+    check_artifact_containers(op, payload)
+    return op_spec
+
+
+def analyze(
+    wm: Workman, op: str, payload: Mapping, ctx: dict, pins: dict | None = None, *, checked: bool = False,
+) -> CompiledOp:
+    """Validate an op and resolve its aggregate ID and FK references.
+
+    Pass checked=True when check_op() has already run on this payload.
+
+    Note: like compile(), this injects a generated id_field into payload
+    unless wm.mutate_payloads is False, in which case the CompiledOp carries
+    a PayloadView layered over the untouched input.
+    """
+    op_spec = wm.require_op_spec(op) if checked else check_op(wm, op, payload)
+
+    caller_supplied_id = bool(op_spec.id_field in payload and payload[op_spec.id_field])
+    if caller_supplied_id:
+        aggregate_id = payload[op_spec.id_field]
+    else:
+        aggregate_id = pins.get("id") if pins and "id" in pins else wm.new_id(op_spec.id_prefix)
+        if wm.mutate_payloads:
+            payload[op_spec.id_field] = aggregate_id
+        else:
+            payload = PayloadView(payload, {op_spec.id_field: aggregate_id})
+    if not wm.mutate_payloads and not isinstance(payload, PayloadView):
+        payload = PayloadView(payload)
+
+    fk_refs = tuple(
+        (fk_aggregate_type, payload[fk_field])
+        for fk_field, fk_aggregate_type in op_spec.fk_asserts
+        if fk_field in payload and payload[fk_field]
+    )
+    dynamic_fk_refs = tuple(
+        (payload[type_field], payload[id_field])
+        for id_field, type_field in op_spec.dynamic_fk_asserts
+        if payload.get(id_field) and payload.get(type_field)
+    )
+
+    return CompiledOp(
+        op=op,
+        op_spec=op_spec,
+        aggregate_id=aggregate_id,
+        caller_supplied_id=caller_supplied_id,
+        payload=payload,
+        ctx=ctx,
+        idempotency_key=make_idempotency_key(ctx, op, op_spec.aggregate_type, aggregate_id),
+        fk_refs=fk_refs,
+        dynamic_fk_refs=dynamic_fk_refs,
+    )
+
+
+def _needs_id(op_spec: OpSpec, payload: Mapping, pins: dict | None) -> bool:
+    return not payload.get(op_spec.id_field) and not (pins and "id" in pins)
+
+
+class AggregateIdPool:
+    """Aggregate IDs for a batch, drawn in one bulk allocation per id_prefix.
+
+    Deterministic compilers get an empty pool: their IDs must depend only on
+    each item's own inputs, not on its position in a batch.
+    """
+
+    def __init__(self, wm: Workman, entries: Iterable[tuple[str, Mapping, dict | None]]):
+        self._pools: dict[str, Iterator[str]] = {}
+        if wm.deterministic:
+            return
+        needed: Counter[str] = Counter()
+        for op, payload, pins in entries:
+            if not isinstance(op, str) or not isinstance(payload, Mapping):
+                continue  # malformed; the caller reports it for that entry
+            op_spec = wm.get_op_spec(op)
+            if op_spec is not None and _needs_id(op_spec, payload, pins):
+                needed[op_spec.id_prefix] += 1
+        self._pools = {prefix: iter(wm.new_ids(prefix, n)) for prefix, n in needed.items()}
+
+    def pins(self, op_spec: OpSpec, payload: Mapping, pins: dict | None) -> dict | None:
+        """Return pins carrying a pre-drawn ID when the op would otherwise generate one."""
+        pool = self._pools.get(op_spec.id_prefix)
+        if pool is not None and isinstance(payload, Mapping) and _needs_id(op_spec, payload, pins):
+            return {**(pins or {}), "id": next(pool)}
+        return pins
+
+
+def render_plan_ops(cop: CompiledOp) -> list[dict]:
+    """Render assertion ops followed by the wal.append op.
+
+    Op IDs come from the current allocator, so rendering several CompiledOps
+    under one op_id_scope() numbers them across the whole plan.
+    """
+    op_spec = cop.op_spec
+    ops: list[dict] = []
+    if op_spec.is_create:
+        if cop.caller_supplied_id:
+            ops.append(assert_not_exists(op_spec.aggregate_type, cop.aggregate_id))
+    else:
+        ops.append(assert_exists(op_spec.aggregate_type, cop.aggregate_id))
+
+    for fk_aggregate_type, fk_id in cop.fk_refs:
+        ops.append(assert_exists(fk_aggregate_type, fk_id))
+    for fk_aggregate_type, fk_id in cop.dynamic_fk_refs:
+        ops.append(assert_exists(fk_aggregate_type, fk_id))
+
+    ops.append(build_wal_append(
+        idempotency_key=cop.idempotency_key,
+        event_type=op_spec.event_type,
+        aggregate_type=op_spec.aggregate_type,
+        aggregate_id=cop.aggregate_id,
+        payload=cop.payload,
+        ctx=cop.ctx,
+    ))
+    return ops
+
+
+def render_plan(
+    wm: Workman,
+    ops: list[dict],
+    *,
+    op: str,
+    correlation_id: str | None,
+    plan_id: str | None = None,
+) -> dict:
+    """Wrap rendered plan ops in a storacle.plan/1.0.0 envelope."""
+    return {
+        "plan_version": "storacle.plan/1.0.0",
+        "plan_id": plan_id or f"ulid:{wm.ulid_factory()}",
+        "jsonrpc": "2.0",
+        "meta": {"source": "workman", "op": op, "correlation_id": correlation_id},
+        "ops": ops,
+    }
+
+
+def render_op_plan(wm: Workman, cop: CompiledOp) -> dict:
+    """Render a standalone plan for one CompiledOp (what compile() returns)."""
+    with op_id_scope():
+        ops = render_plan_ops(cop)
+    return render_plan(wm, ops, op=cop.op, correlation_id=cop.ctx.get("correlation_id"))
+
+
+def render_event_item(cop: CompiledOp) -> dict:
+    """Render a lorchestra domain event item (NOT a StoraclePlan op)."""
+    op_spec = cop.op_spec
+    return {
+        "event_type": op_spec.event_type,
+        "aggregate_type": op_spec.aggregate_type,
+        "aggregate_id": cop.aggregate_id,
+        "payload": cop.payload,
+        "idempotency_key": cop.idempotency_key,
+        "is_create": op_spec.is_create,
+        "caller_supplied_id": cop.caller_supplied_id,
+        "fk_refs": [
+            {"aggregate_type": fk_aggregate_type, "aggregate_id": fk_id}
+            for fk_aggregate_type, fk_id in cop.fk_refs
+        ],
+    }
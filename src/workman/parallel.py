@@ -0,0 +1,155 @@
+"""Process-pool parallel compile engine.
+
+Compilation is pure Python and CPU-bound, so a single process caps out at one
+core. ParallelCompiler ships a picklable copy of a Workman to each worker
+once (initializer), warms its schema and validator caches for the whole
+catalog, and then feeds it chunks of work. Results come back in input order,
+or in completion order as (index, result) pairs.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Any, Iterable, Iterator
+
+from workman.compiler import Workman, default_workman
+from workman.errors import WorkmanError
+from workman.stream import compile_line
+
+_KINDS = ("compile", "execute", "compile_intent", "lines")
+
+_worker_wm: Workman | None = None
+
+
+def _init_worker(wm: Workman) -> None:
+    global _worker_wm
+    wm.warm()
+    _worker_wm = wm
+
+
+def _run_chunk(kind: str, chunk: list[tuple[int, Any]]) -> list[tuple[int, Any]]:
+    wm = _worker_wm
+    if kind == "compile":
+        results = wm.compile_many([item for _, item in chunk], return_errors=True)
+        return [(index, result) for (index, _), result in zip(chunk, results)]
+
+    if kind == "lines":
+        return [(index, (number, compile_line(wm, mode, line, canonical=canonical)))
+                for index, (mode, number, line, canonical) in chunk]
+
+    out = []
+    for index, item in chunk:
+        try:
+            result = wm.execute(item) if kind == "execute" else wm.compile_intent(**item)
+        except WorkmanError as e:
+            result = e
+        out.append((index, result))
+    return out
+
+
+class ParallelCompiler:
+    """Run compile / execute / compile_intent across a pool of warmed worker processes.
+
+    Args:
+        workman: Compiler configuration to replicate in each worker (it must be
+            picklable, so no lambda ID sources or clocks). Defaults to the
+            default instance.
+        max_workers: Worker process count. Defaults to os.cpu_count().
+        chunksize: Items per task submitted to a worker.
+        mp_context: Optional multiprocessing context (e.g. "spawn").
+    """
+
+    def __init__(
+        self,
+        workman: Workman | None = None,
+        *,
+        max_workers: int | None = None,
+        chunksize: int = 256,
+        mp_context=None,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(workman or default_workman(),),
+        )
+
+    def __enter__(self) -> ParallelCompiler:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self, cancel_pending: bool = False) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=cancel_pending)
+
+    def compile(self, items: Iterable, *, ordered: bool = True, return_errors: bool = False) -> Iterator:
+        """Compile (op, payload, ctx[, pins]) items."""
+        return self.map("compile", items, ordered=ordered, return_errors=return_errors)
+
+    def execute(self, params: Iterable[dict], *, ordered: bool = True, return_errors: bool = False) -> Iterator:
+        """Run execute() over params dicts."""
+        return self.map("execute", params, ordered=ordered, return_errors=return_errors)
+
+    def compile_intent(self, requests: Iterable[dict], *, ordered: bool = True, return_errors: bool = False) -> Iterator:
+        """Run compile_intent(**request) over keyword-argument dicts."""
+        return self.map("compile_intent", requests, ordered=ordered, return_errors=return_errors)
+
+    def compile_lines(
+        self, mode: str, numbered_lines: Iterable[tuple[int, str | bytes]], *, canonical: bool = False
+    ) -> Iterator:
+        """Compile (line_number, JSONL line) pairs in workers; yields (line_number, (ok, text)) in order.
+
+        Decoding and encoding happen in the workers too, so the parent only
+        moves strings. See workman.stream.compile_line.
+        """
+        return self.map("lines", ((mode, number, line, canonical) for number, line in numbered_lines))
+
+    def map(self, kind: str, items: Iterable, *, ordered: bool = True, return_errors: bool = False) -> Iterator:
+        """Stream results for items, keeping at most 2 * max_workers chunks in flight.
+
+        Ordered mode yields results in input order; unordered mode yields
+        (index, result) pairs as chunks complete. A failing item raises its
+        WorkmanError, or with return_errors=True is yielded in place.
+        """
+        if kind not in _KINDS:
+            raise ValueError(f"kind must be one of {_KINDS}, got {kind!r}")
+
+        numbered = enumerate(items)
+        window = 2 * self.max_workers
+
+        def _submit() -> Future | None:
+            chunk = list(islice(numbered, self.chunksize))
+            return self._executor.submit(_run_chunk, kind, chunk) if chunk else None
+
+        def _check(result: Any) -> Any:
+            if isinstance(result, WorkmanError) and not return_errors:
+                raise result
+            return result
+
+        if ordered:
+            queue: deque[Future] = deque()
+            while len(queue) < window and (future := _submit()) is not None:
+                queue.append(future)
+            while queue:
+                chunk_results = queue.popleft().result()
+                if (future := _submit()) is not None:
+                    queue.append(future)
+                for _, result in chunk_results:
+                    yield _check(result)
+        else:
+            pending: set[Future] = set()
+            while len(pending) < window and (future := _submit()) is not None:
+                pending.add(future)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for finished in done:
+                    if (future := _submit()) is not None:
+                        pending.add(future)
+                    for index, result in finished.result():
+                        yield index, _check(result)
@@ -0,0 +1,201 @@
+"""Aggregate-partitioned, order-preserving parallel JSONL compilation.
+
+Byte-range sharding (workman.ingest) is fastest but scatters the ops of one
+aggregate across shards, so a loader ingesting shards concurrently could see
+a work item's ``.complete`` before its ``.create``. partition_file() instead
+hashes each request onto one of N partitions by the aggregate it targets.
+Each partition has a single worker process fed in input order and its own
+output shard, so ops for one aggregate stay in input order while unrelated
+aggregates compile and load in parallel:
+
+    out_dir/part-00000.jsonl        compiled results for partition 0, in input order
+    out_dir/part-00000.errors.jsonl failed lines ({"offset", "error", "message"})
+    out_dir/part-00000.index        one "<input_offset> <o|e> <shard_offset>" line per request
+    out_dir/index.json              manifest: partition count and per-shard counts
+
+Requests with no explicit aggregate ID (creates that generate one, or lines
+that do not parse) have nothing to order against and are spread round-robin.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Mapping
+
+from workman.compiler import default_workman
+from workman.ingest import shard_paths
+from workman.stream import MODES, compile_line
+
+if TYPE_CHECKING:
+    from workman.compiler import Workman
+
+# Chunks queued per partition before the reader waits on that partition
+_MAX_IN_FLIGHT = 2
+
+
+@dataclass
+class PartitionResult:
+    partition: int
+    output: str
+    lines: int = 0
+    errors: int = 0
+
+
+def _op_key(wm: Workman, op: Any, payload: Any) -> str | None:
+    op_spec = wm.get_op_spec(op) if isinstance(op, str) else None
+    if op_spec is None or not isinstance(payload, Mapping):
+        return None
+    aggregate_id = payload.get(op_spec.id_field)
+    return f"{op_spec.aggregate_type}:{aggregate_id}" if aggregate_id else None
+
+
+def partition_key(wm: Workman, mode: str, request: Any) -> str | None:
+    """Return "<aggregate_type>:<aggregate_id>" for the aggregate a request targets, or None.
+
+    Batch execute requests and intents are keyed by their first op that
+    names an existing aggregate.
+    """
+    if not isinstance(request, Mapping):
+        return None
+    if mode == "plan" or (mode == "execute" and "items" not in request):
+        return _op_key(wm, request.get("op"), request.get("payload"))
+    ops = request.get("items") if mode == "execute" else request.get("ops")
+    for entry in ops if isinstance(ops, list) else ():
+        if isinstance(entry, Mapping) and (key := _op_key(wm, entry.get("op"), entry.get("payload"))):
+            return key
+    return None
+
+
+def partition_of(key: str, partitions: int) -> int:
+    """Stable partition for a key (crc32, so identical across processes and runs)."""
+    return zlib.crc32(key.encode()) % partitions
+
+
+def _open_shard(out_dir: Path, partition: int) -> None:
+    for path in shard_paths(out_dir, partition):
+        open(path, "wb").close()
+
+
+def compile_partition_chunk(
+    wm: Workman, mode: str, out_dir: str, partition: int, chunk: list[tuple[int, bytes]]
+) -> tuple[int, int]:
+    """Append the compiled (input_offset, line) chunk to a partition's shard files.
+
+    Returns (lines, errors).
+    """
+    out_path, err_path, index_path = shard_paths(Path(out_dir), partition)
+    lines = errors = 0
+    with open(out_path, "ab") as out, open(err_path, "ab") as err, open(index_path, "ab") as index:
+        for offset, line in chunk:
+            ok, text = compile_line(wm, mode, line)
+            if ok:
+                index.write(b"%d o %d\n" % (offset, out.tell()))
+                out.write(text.encode())
+                out.write(b"\n")
+                lines += 1
+            else:
+                index.write(b"%d e %d\n" % (offset, err.tell()))
+                err.write(b'{"offset":%d,%s\n' % (offset, text[1:].encode()))
+                errors += 1
+    return lines, errors
+
+
+def _compile_partition_chunk_in_worker(mode: str, out_dir: str, partition: int, chunk: list) -> tuple[int, int]:
+    from workman import parallel
+
+    return compile_partition_chunk(parallel._worker_wm, mode, out_dir, partition, chunk)
+
+
+def partition_file(
+    path: str | os.PathLike,
+    out_dir: str | os.PathLike,
+    *,
+    mode: str = "plan",
+    partitions: int | None = None,
+    chunksize: int = 256,
+    workman: Workman | None = None,
+) -> list[PartitionResult]:
+    """Compile a JSONL file into per-aggregate-partition output shards.
+
+    Args:
+        path: Input JSONL file.
+        out_dir: Directory for shard, error, index and manifest files.
+        mode: "plan", "execute" or "intent" (see workman.stream).
+        partitions: Number of partitions, and of worker processes
+            (default os.cpu_count()); 1 runs in-process.
+        chunksize: Lines per task sent to a partition's worker.
+        workman: Compiler configuration (default: the default instance).
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+    wm = workman or default_workman()
+    partitions = partitions or os.cpu_count() or 1
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    results = [PartitionResult(partition=p, output=shard_paths(out, p)[0].name) for p in range(partitions)]
+    for p in range(partitions):
+        _open_shard(out, p)
+
+    executors: list[ProcessPoolExecutor] = []
+    if partitions > 1:
+        from workman.parallel import _init_worker
+
+        # One single-process executor per partition: its FIFO task queue is
+        # what keeps each partition (and so each aggregate) in input order.
+        executors = [ProcessPoolExecutor(max_workers=1, initializer=_init_worker, initargs=(wm,))
+                     for _ in range(partitions)]
+    in_flight: list[deque[Future]] = [deque() for _ in range(partitions)]
+
+    def _collect(p: int, counts: tuple[int, int]) -> None:
+        results[p].lines += counts[0]
+        results[p].errors += counts[1]
+
+    def _flush(p: int, chunk: list[tuple[int, bytes]]) -> None:
+        if not executors:
+            _collect(p, compile_partition_chunk(wm, mode, str(out), p, chunk))
+            return
+        if len(in_flight[p]) >= _MAX_IN_FLIGHT:
+            _collect(p, in_flight[p].popleft().result())
+        in_flight[p].append(executors[p].submit(_compile_partition_chunk_in_worker, mode, str(out), p, chunk))
+
+    try:
+        chunks: list[list[tuple[int, bytes]]] = [[] for _ in range(partitions)]
+        unkeyed = 0
+        offset = 0
+        with open(path, "rb") as src:
+            for line in src:
+                line_offset, offset = offset, offset + len(line)
+                if not line.strip():
+                    continue
+                try:
+                    key = partition_key(wm, mode, json.loads(line))
+                except json.JSONDecodeError:
+                    key = None
+                if key is None:
+                    p, unkeyed = unkeyed % partitions, unkeyed + 1
+                else:
+                    p = partition_of(key, partitions)
+                chunks[p].append((line_offset, line.rstrip(b"\r\n")))
+                if len(chunks[p]) >= chunksize:
+                    _flush(p, chunks[p])
+                    chunks[p] = []
+        for p, chunk in enumerate(chunks):
+            if chunk:
+                _flush(p, chunk)
+        for p, queue in enumerate(in_flight):
+            while queue:
+                _collect(p, queue.popleft().result())
+    finally:
+        for executor in executors:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    manifest = {"input": os.fspath(path), "mode": mode, "partitioned_by": "aggregate",
+                "partitions": [asdict(r) for r in results]}
+    (out / "index.json").write_text(json.dumps(manifest, indent=2))
+    return results
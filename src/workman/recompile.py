@@ -0,0 +1,254 @@
+"""Incremental recompilation of edited PMIntents.
+
+recompile_intent() takes a compile_intent() result and one edit to its ops
+list and returns what compile_intent() would return for the edited list,
+with the same intent_id and issued_at. Only the edited op and the ops that
+depend on it are validated and compiled again. The rest keep their plan ops,
+diff lines and aggregate IDs. An op depends on an earlier one when it
+mentions that op's aggregate ID, either through an @ref:N token, a literal
+ID, or a container it inherits. Dependencies are followed transitively.
+
+Op IDs (a1.., w1..) are renumbered across the merged plan. The plan hash
+re-hashes only the leaves whose op changed or was renumbered (see
+workman.hashing). Each compiler caches the leaf digests of its recent
+results; for a result its cache does not hold, they are recomputed once.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Mapping
+
+from workman.errors import CompileError
+from workman.hashing import PLAN_HASH_VERSION, PlanHasher, op_digest
+from workman.ids import op_id_scope
+from workman.intent import _REF_PATTERN, _intent_ctx, _make_diff_line, _OpCompiler, intent_content_hash
+from workman.ir import render_plan, render_plan_ops
+
+if TYPE_CHECKING:
+    from workman.compiler import Workman
+
+_ACTIONS = ("replace", "insert", "delete")
+
+_OP = "pm.compile_intent"
+
+
+def recompile_intent(previous: dict, edit: dict, *, ctx: dict | None = None, max_ops: int | None = None) -> dict:
+    """Apply one edit to a compiled intent, recompiling only the ops it affects.
+
+    Args:
+        previous: An unmodified compile_intent() (or recompile_intent()) result.
+            Preview results carry no plan and are rejected.
+        edit: {"action": "replace" | "insert" | "delete", "index": N, "op": {"op": str, "payload": dict}}.
+            "op" is omitted for delete. @ref:N tokens in the new op use the
+            edited list's indices. In later ops, refs at or past N are shifted
+            to match. A ref to a deleted op is an error.
+        ctx: The ctx overrides the previous result was compiled with, if any.
+        max_ops: Largest edited ops list accepted, as in compile_intent().
+            Defaults to the compiler's max_intent_ops.
+
+    Returns:
+        CallableResult dict shaped like compile_intent()'s, with items[0]
+        also carrying "recompiled", the edited-list indices of the ops that
+        were compiled again.
+
+    Raises:
+        CompileError: If the edit is invalid or an affected op fails to compile.
+    """
+    from workman.compiler import default_workman
+
+    return default_workman().recompile_intent(previous, edit, ctx=ctx, max_ops=max_ops)
+
+
+def _check_edit(edit: object, n: int) -> tuple[str, int, Mapping | None]:
+    if not isinstance(edit, Mapping):
+        raise CompileError("edit must be a dict", op=_OP)
+
+    action = edit.get("action")
+    if action not in _ACTIONS:
+        raise CompileError(f"edit action must be one of {_ACTIONS}, got {action!r}", op=_OP)
+
+    index = edit.get("index")
+    upper = n if action == "insert" else n - 1
+    if not isinstance(index, int) or isinstance(index, bool) or not 0 <= index <= upper:
+        raise CompileError(f"edit index must be an integer from 0 to {upper}, got {index!r}", op=_OP)
+
+    op_entry = None
+    if action != "delete":
+        op_entry = edit.get("op")
+        if (
+            not isinstance(op_entry, Mapping)
+            or not isinstance(op_entry.get("op"), str)
+            or not isinstance(op_entry.get("payload", {}), Mapping)
+        ):
+            raise CompileError('edit op must be {"op": str, "payload": dict}', op=_OP)
+    return action, index, op_entry
+
+
+def _segments(plan_ops: list[dict], n: int) -> list[list[dict]]:
+    """Split a merged plan into each intent op's plan ops (each ends with its wal.append)."""
+    segments: list[list[dict]] = []
+    current: list[dict] = []
+    for plan_op in plan_ops:
+        current.append(plan_op)
+        if plan_op["method"] == "wal.append":
+            segments.append(current)
+            current = []
+    if current or len(segments) != n:
+        raise CompileError("previous result's plan does not match its intent ops", op=_OP)
+    return segments
+
+
+def _shift_refs(op_entry: Mapping, index: int, delta: int, op_index: int) -> Mapping:
+    """Return op_entry with @ref:K tokens for K >= index moved by delta."""
+    payload = op_entry.get("payload", {})
+    shifted = None
+    for key, value in payload.items():
+        if not isinstance(value, str):
+            continue
+        match = _REF_PATTERN.match(value)
+        if match is None or int(match.group(1)) < index:
+            continue
+        ref_index = int(match.group(1))
+        if delta < 0 and ref_index == index:
+            raise CompileError(f"Op {op_index} references deleted op @ref:{index}", op=_OP)
+        if shifted is None:
+            shifted = dict(payload)
+        shifted[key] = f"@ref:{ref_index + delta}"
+    return op_entry if shifted is None else {**op_entry, "payload": shifted}
+
+
+def _mentions(payloads: tuple[Mapping, ...], ids: set[str]) -> bool:
+    return any(isinstance(value, str) and value in ids for payload in payloads for value in payload.values())
+
+
+def _recompile_intent(wm: Workman, previous: dict, edit: dict, ctx: dict | None, max_ops: int | None) -> dict:
+    item = previous["items"][0]
+    if "plan" not in item or "plan_hash" not in item:
+        # e.g. a preview=True result, whose IDs are placeholders
+        raise CompileError("previous result has no plan to recompile; compile the intent without preview", op=_OP)
+    intent = item["intent"]
+    old_plan_ops = item["plan"]["ops"]
+    old_ops = intent["ops"]
+    action, index, op_entry = _check_edit(edit, len(old_ops))
+    segments = _segments(old_plan_ops, len(old_ops))
+
+    # Apply the edit; olds[j] is the previous index of new op j (None if new)
+    ops = list(old_ops)
+    olds: list[int | None] = list(range(len(old_ops)))
+    if action == "replace":
+        ops[index] = op_entry
+        olds[index] = None
+    elif action == "insert":
+        ops.insert(index, op_entry)
+        olds.insert(index, None)
+    else:
+        del ops[index]
+        del olds[index]
+    if not ops:
+        raise CompileError("ops must be a non-empty list", op=_OP)
+    limit = wm.max_intent_ops if max_ops is None else max_ops
+    if limit is not None and len(ops) > limit:
+        raise CompileError(f"PMIntent exceeds maximum of {limit} ops", op=_OP)
+
+    if action != "replace":
+        delta = 1 if action == "insert" else -1
+        for j in range(index + 1 if action == "insert" else index, len(ops)):
+            ops[j] = _shift_refs(ops[j], index, delta, j)
+
+    # Aggregate IDs whose state an edit may have changed: the edited op's, then every recompiled op's
+    changed: set[str] = set()
+    if action != "insert":
+        changed.add(segments[index][-1]["params"]["aggregate_id"])
+
+    leaves = wm.leaf_cache.get(item["plan_hash"])
+    if leaves is not None and len(leaves) != len(old_plan_ops):
+        leaves = None
+    starts = []
+    position = 0
+    for segment in segments:
+        starts.append(position)
+        position += len(segment)
+
+    intent_id = intent["intent_id"]
+    new_intent = {**intent, "ops": ops}
+    op_compiler = _OpCompiler(wm, _intent_ctx(new_intent, ctx))
+    plan = render_plan(wm, [], op=_OP, correlation_id=intent_id)
+    plan_ops = plan["ops"]
+    new_leaves: list[bytes] = []
+    include_diff = "diff" in item  # results compiled with include_diff=False stay without one
+    diff: list[str] = []
+    recompiled: list[int] = []
+
+    with op_id_scope() as allocator:
+        for j, entry in enumerate(ops):
+            old = olds[j]
+            if old is not None:
+                old_wal = segments[old][-1]["params"]
+                if j < index or not _mentions((entry.get("payload", {}), old_wal["payload"]), changed):
+                    # Unaffected: reuse the op's plan ops under new op IDs
+                    op_compiler.generated_ids.append(old_wal["aggregate_id"])
+                    op_compiler.entities.add(old_wal["aggregate_id"], old_wal["payload"])
+                    for offset, plan_op in enumerate(segments[old]):
+                        is_write = plan_op["method"] == "wal.append"
+                        op_id = allocator.next_write_id() if is_write else allocator.next_assertion_id()
+                        if op_id == plan_op["id"] and leaves is not None:
+                            leaf = leaves[starts[old] + offset]
+                        else:
+                            if op_id != plan_op["id"]:
+                                plan_op = {**plan_op, "id": op_id}
+                            leaf = op_digest(plan_op)
+                        plan_ops.append(plan_op)
+                        new_leaves.append(leaf)
+                    if include_diff:
+                        diff.append(item["diff"][old])
+                    continue
+
+            # Affected or new: compile again, keeping the aggregate ID it had before
+            source = index if old is None and action == "replace" else old
+            pins = None if source is None else _pins(wm, entry, old_ops[source], segments[source][-1]["params"])
+            cop = op_compiler.compile(j, entry, pins)
+            changed.add(cop.aggregate_id)
+            if old is not None:
+                changed.add(old_wal["aggregate_id"])
+            for plan_op in render_plan_ops(cop):
+                plan_ops.append(plan_op)
+                new_leaves.append(op_digest(plan_op))
+            if include_diff:
+                diff.append(_make_diff_line(cop.op, cop.op_spec, cop.aggregate_id, cop.payload))
+            recompiled.append(j)
+
+    hasher = PlanHasher(plan, new_leaves)
+    plan_hash = hasher.hexdigest()
+    wm.leaf_cache.remember(plan_hash, hasher.tree)
+
+    new_item = {"intent": new_intent, "plan": plan}
+    if include_diff:
+        new_item["diff"] = diff
+    new_item.update(
+        plan_hash=plan_hash,
+        plan_hash_version=PLAN_HASH_VERSION,
+        content_hash=intent_content_hash(ops, intent["source"], intent["actor"]),
+        recompiled=recompiled,
+    )
+
+    return {
+        "schema_version": "1.0",
+        "items": [new_item],
+        "stats": {
+            "input": len(ops),
+            "output": len(ops),
+            "skipped": 0,
+            "errors": 0,
+        },
+    }
+
+
+def _pins(wm: Workman, entry: Mapping, old_entry: Mapping, old_wal: Mapping) -> dict | None:
+    """Pin the previous op's generated aggregate ID when entry would generate one of the same kind."""
+    op_spec = wm.get_op_spec(entry["op"])
+    old_spec = wm.get_op_spec(old_entry["op"])
+    if op_spec is None or old_spec is None or op_spec.id_prefix != old_spec.id_prefix:
+        return None
+    if old_entry.get("payload", {}).get(old_spec.id_field):
+        return None
+    return {"id": old_wal["aggregate_id"]}
@@ -2,23 +2,24 @@
 
 import json
 import os
+from collections.abc import Iterable, Mapping
 from pathlib import Path
 
 import jsonschema
 
 from workman.errors import ValidationError
 
+_DEFAULT_REGISTRY_ROOT = "~/.local/schema-transform-registry"
+
 
 def _schema_registry_root() -> Path:
-    return Path(
-        os.environ.get(
-            "SCHEMA_REGISTRY_ROOT",
-            os.path.expanduser("~/.local/schema-transform-registry"),
-        )
-    )
+    root = os.environ.get("SCHEMA_REGISTRY_ROOT")
+    if root is None:
+        root = os.path.expanduser(_DEFAULT_REGISTRY_ROOT)
+    return Path(root)
 
 
-def resolve_schema(iglu_ref: str) -> dict:
+def _parse_iglu_ref(iglu_ref: str) -> tuple[str, str, str, str]:
     if not iglu_ref.startswith("iglu:"):
         raise ValidationError(f"Invalid iglu ref format: {iglu_ref}")
 
@@ -27,8 +28,10 @@ def resolve_schema(iglu_ref: str) -> dict:
         raise ValidationError(f"Invalid iglu ref format: {iglu_ref}")
 
     vendor, name, fmt, version = parts
-    schema_path = _schema_registry_root() / "schemas" / vendor / name / fmt / version / "schema.json"
+    return vendor, name, fmt, version
+
 
+def _load_schema(schema_path: Path) -> dict:
     if not schema_path.exists():
         raise ValidationError(f"Schema not found: {schema_path}")
 
@@ -39,6 +42,101 @@ def resolve_schema(iglu_ref: str) -> dict:
         raise ValidationError(f"Invalid JSON in schema {schema_path}: {e}")
 
 
+_mapping_validators: dict[type, type] = {}
+
+
+def _is_object(checker: object, instance: object) -> bool:
+    return isinstance(instance, Mapping)
+
+
+def _mapping_aware(cls: type) -> type:
+    """Extend a validator class so any Mapping (e.g. a PayloadView) is a JSON object."""
+    extended = _mapping_validators.get(cls)
+    if extended is None:
+        type_checker = cls.TYPE_CHECKER.redefine("object", _is_object)
+        extended = jsonschema.validators.extend(cls, type_checker=type_checker)
+        _mapping_validators[cls] = extended
+    return extended
+
+
+class SchemaRegistry:
+    """Iglu schema registry with per-instance schema and validator caches.
+
+    The registry location is fixed at construction. Without an explicit
+    ``root``, SCHEMA_REGISTRY_ROOT (or the default location) is read once, then.
+    """
+
+    def __init__(self, root: str | Path | None = None):
+        self._root = Path(root).expanduser() if root is not None else _schema_registry_root()
+        self._schemas: dict[Path, dict] = {}
+        self._validators: dict[str, jsonschema.protocols.Validator] = {}
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def schema_path(self, iglu_ref: str) -> Path:
+        vendor, name, fmt, version = _parse_iglu_ref(iglu_ref)
+        return self.root / "schemas" / vendor / name / fmt / version / "schema.json"
+
+    def resolve(self, iglu_ref: str) -> dict:
+        """Load the schema for an iglu ref, reading the file at most once."""
+        schema_path = self.schema_path(iglu_ref)
+        schema = self._schemas.get(schema_path)
+        if schema is None:
+            schema = _load_schema(schema_path)
+            self._schemas[schema_path] = schema
+        return schema
+
+    def is_cached(self, iglu_ref: str) -> bool:
+        """True when validator(iglu_ref) will not touch the filesystem."""
+        return iglu_ref in self._validators
+
+    def validator(self, iglu_ref: str) -> jsonschema.protocols.Validator:
+        """Return a checked, compiled validator for an iglu ref."""
+        # Keyed by ref rather than path so warm lookups build no Path objects
+        validator = self._validators.get(iglu_ref)
+        if validator is None:
+            schema = self.resolve(iglu_ref)
+            cls = jsonschema.validators.validator_for(schema)
+            cls.check_schema(schema)
+            validator = _mapping_aware(cls)(schema)
+            self._validators[iglu_ref] = validator
+        return validator
+
+    def validate(self, payload: dict, iglu_ref: str) -> None:
+        validator = self.validator(iglu_ref)
+        error = jsonschema.exceptions.best_match(validator.iter_errors(payload))
+        if error is not None:
+            raise ValidationError(f"Payload validation failed: {error.message}", errors=[error])
+
+    def __getstate__(self) -> dict:
+        # Caches stay behind when a registry is shipped to a worker process
+        return {"_root": self._root}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["_root"])
+
+    def warm(self, iglu_refs: Iterable[str]) -> None:
+        """Load and compile validators for refs up front, skipping unavailable schemas."""
+        for iglu_ref in iglu_refs:
+            try:
+                self.validator(iglu_ref)
+            except ValidationError:
+                pass
+
+    def clear(self) -> None:
+        """Drop cached schemas and validators (e.g. after the registry changed on disk)."""
+        self._schemas.clear()
+        self._validators.clear()
+
+
+def resolve_schema(iglu_ref: str) -> dict:
+    vendor, name, fmt, version = _parse_iglu_ref(iglu_ref)
+    schema_path = _schema_registry_root() / "schemas" / vendor / name / fmt / version / "schema.json"
+    return _load_schema(schema_path)
+
+
 def validate_payload(payload: dict, schema: dict) -> None:
     try:
         jsonschema.validate(instance=payload, schema=schema)
@@ -0,0 +1,131 @@
+"""Line-oriented JSONL compilation shared by the CLI and bulk ingestion.
+
+Each input line is one request; each successful line produces exactly one
+output line. Per-line cost is constant and nothing but the current line is
+held in memory.
+
+Request shapes by mode:
+    plan     {"op", "payload", "ctx"?, "pins"?}         -> compile() plan
+    execute  execute() params (single op or "items")    -> CallableResult
+    intent   compile_intent() keyword arguments          -> CallableResult
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Iterator, TextIO
+
+from workman.canonical import canonical_dumps
+from workman.errors import WorkmanError
+from workman.views import json_default
+
+if TYPE_CHECKING:
+    from workman.compiler import Workman
+    from workman.parallel import ParallelCompiler
+
+MODES = ("plan", "execute", "intent")
+
+
+def dumps(obj: object, *, canonical: bool = False) -> str:
+    """Compact single-line JSON, materializing payload views.
+
+    With canonical=True the output is canonical JSON (workman.canonical), the
+    same encoding plan_hash is computed over, reusing payload encodings that
+    hashing already cached.
+    """
+    if canonical:
+        return canonical_dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=json_default)
+
+
+def _check_request(mode: str, request: object) -> None:
+    """Reject request shapes the compile entry points assume are well-formed."""
+    if not isinstance(request, dict):
+        raise WorkmanError("request must be a JSON object")
+    if not isinstance(request.get("ctx", {}), dict):
+        raise WorkmanError("ctx must be a JSON object")
+    is_intent = mode == "intent" or (mode == "execute" and request.get("op") == "pm.compile_intent")
+    if is_intent and isinstance(request.get("ops"), list):
+        for i, entry in enumerate(request["ops"]):
+            if not isinstance(entry, dict) or not isinstance(entry.get("payload", {}), dict):
+                raise WorkmanError(f'ops[{i}] must be a JSON object with an object "payload"')
+
+
+def compile_request(wm: Workman, mode: str, request: dict) -> dict:
+    _check_request(mode, request)
+    if mode == "plan":
+        return wm.compile(request["op"], request["payload"], request.get("ctx", {}), request.get("pins"))
+    if mode == "execute":
+        return wm.execute(request)
+    if mode == "intent":
+        return wm.compile_intent(**request)
+    raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+
+
+def compile_line(wm: Workman, mode: str, line: str | bytes, *, canonical: bool = False) -> tuple[bool, str]:
+    """Compile one JSONL request line.
+
+    Returns (True, output_json) or (False, error_json) where the error object
+    is {"error": <exception type>, "message": <text>}.
+    """
+    try:
+        text = dumps(compile_request(wm, mode, json.loads(line)), canonical=canonical)
+    except json.JSONDecodeError as e:
+        return False, dumps({"error": "JSONDecodeError", "message": str(e)}, canonical=canonical)
+    except KeyError as e:
+        return False, dumps({"error": "KeyError", "message": f"missing field {e}"}, canonical=canonical)
+    except (WorkmanError, TypeError, ValueError) as e:
+        return False, dumps({"error": type(e).__name__, "message": str(e)}, canonical=canonical)
+    return True, text
+
+
+@dataclass
+class StreamStats:
+    lines: int = 0
+    output: int = 0
+    errors: int = 0
+
+
+def _numbered(lines: Iterable[str | bytes]) -> Iterator[tuple[int, str | bytes]]:
+    for number, line in enumerate(lines, 1):
+        if line.strip():
+            yield number, line
+
+
+def compile_stream(
+    wm: Workman,
+    mode: str,
+    lines: Iterable[str | bytes],
+    out: TextIO,
+    err: TextIO,
+    *,
+    pool: ParallelCompiler | None = None,
+    canonical: bool = False,
+) -> StreamStats:
+    """Compile JSONL lines to ``out``; failures go to ``err`` tagged with their line number.
+
+    With a pool, lines are compiled by its workers (in order, with a bounded
+    number of chunks in flight). Blank lines are ignored. canonical=True
+    writes canonical JSON (see dumps).
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+
+    stats = StreamStats()
+    numbered = _numbered(lines)
+    if pool is None:
+        results = ((number, compile_line(wm, mode, line, canonical=canonical)) for number, line in numbered)
+    else:
+        results = pool.compile_lines(mode, numbered, canonical=canonical)
+
+    for number, (ok, text) in results:
+        stats.lines += 1
+        if ok:
+            stats.output += 1
+            out.write(text)
+            out.write("\n")
+        else:
+            stats.errors += 1
+            err.write(f'{{"line":{number},{text[1:]}\n')
+    return stats
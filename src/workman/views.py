@@ -0,0 +1,110 @@
+"""Read-only layered payload views for non-mutating compilation.
+
+With Workman(mutate_payloads=False) the caller's payload dict is never
+written to. Injected aggregate IDs, resolved @ref tokens and inherited
+container fields are layered over it instead, and the merged payload is
+only built (once) when a plan is serialized.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterator, Mapping, MutableMapping
+
+
+class PayloadView(Mapping):
+    """A read-only mapping of ``base`` with ``overlay`` applied and ``removed`` keys hidden.
+
+    Iteration order matches ``dict(base)`` updated with ``overlay``: base keys
+    keep their position, overlay-only keys follow in insertion order.
+    """
+
+    __slots__ = ("_base", "_overlay", "_removed", "_materialized", "_canonical")
+
+    def __init__(
+        self,
+        base: Mapping[str, Any],
+        overlay: Mapping[str, Any] | None = None,
+        removed: frozenset[str] = frozenset(),
+    ):
+        if isinstance(base, PayloadView):
+            merged = dict(base._overlay)
+            merged.update(overlay or {})
+            removed = (base._removed - merged.keys()) | removed
+            overlay, base = merged, base._base
+        self._base = base
+        self._overlay = dict(overlay) if overlay else {}
+        self._removed = frozenset(removed) - self._overlay.keys()
+        self._materialized: dict | None = None
+        self._canonical: str | None = None  # cached by workman.canonical
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._overlay:
+            return self._overlay[key]
+        if key in self._removed:
+            raise KeyError(key)
+        return self._base[key]
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._overlay:
+            return True
+        return key not in self._removed and key in self._base
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._base:
+            if key not in self._removed:
+                yield key
+        for key in self._overlay:
+            if key not in self._base:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"PayloadView({self.materialize()!r})"
+
+    def layered(self, overlay: Mapping[str, Any]) -> PayloadView:
+        """Return a new view with ``overlay`` applied on top of this one."""
+        return PayloadView(self, overlay)
+
+    def materialize(self) -> dict:
+        """Build the merged dict once and reuse it. Treat the result as read-only."""
+        if self._materialized is None:
+            if not self._overlay and not self._removed and isinstance(self._base, dict):
+                self._materialized = self._base
+            else:
+                self._materialized = {key: self[key] for key in self}
+        return self._materialized
+
+
+class LayeredPayload(PayloadView, MutableMapping):
+    """A writable layer over a payload: writes and deletes never reach ``base``.
+
+    Used while resolving refs and inheritance; freeze() hands out the
+    read-only PayloadView that ends up in plans and event items.
+    """
+
+    __slots__ = ()
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._overlay[key] = value
+        self._removed = self._removed - {key}
+        self._materialized = None
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._overlay.pop(key, None)
+        if key in self._base:
+            self._removed = self._removed | {key}
+        self._materialized = None
+
+    def freeze(self) -> PayloadView:
+        return PayloadView(self._base, self._overlay, self._removed)
+
+
+def json_default(obj: Any) -> Any:
+    """``default=`` hook for json.dumps that materializes payload views."""
+    if isinstance(obj, PayloadView):
+        return obj.materialize()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
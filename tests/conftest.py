@@ -6,6 +6,8 @@ from pathlib import Path
 
 import pytest
 
+from workman.compiler import set_default_workman
+
 
 def _write_schema(registry_root: Path, vendor: str, name: str, version: str, properties: dict, **extra):
     """Write a minimal JSON schema to the test registry."""
@@ -83,7 +85,9 @@ def schema_registry(tmp_path):
 
     old_val = os.environ.get("SCHEMA_REGISTRY_ROOT")
     os.environ["SCHEMA_REGISTRY_ROOT"] = str(root)
+    set_default_workman(None)  # the default instance reads the root once, when created
     yield root
+    set_default_workman(None)
     if old_val is None:
         del os.environ["SCHEMA_REGISTRY_ROOT"]
     else:
@@ -0,0 +1,100 @@
+"""Tests for the asyncio compile / execute / compile_intent API."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from workman.aio import AsyncWorkman, acompile, acompile_intent, aexecute
+from workman.compiler import Workman
+from workman.errors import CompileError
+
+_ACTOR = {"actor_type": "human", "actor_id": "u_test"}
+CTX = {"correlation_id": "c1", "producer": "test"}
+
+
+class TestAsyncFunctions:
+    def test_acompile(self):
+        plan = asyncio.run(acompile("pm.project.create", {"name": "A"}, CTX))
+        assert plan["meta"]["op"] == "pm.project.create"
+
+    def test_aexecute(self):
+        result = asyncio.run(aexecute({"op": "pm.project.create", "payload": {}, "ctx": CTX}))
+        assert result["items"][0]["event_type"] == "project.created"
+
+    def test_acompile_intent(self):
+        result = asyncio.run(acompile_intent(op_name="pm.project.create", payload={"name": "A"},
+                                              source="test", actor=_ACTOR))
+        assert result["stats"]["output"] == 1
+
+    def test_errors_propagate(self):
+        with pytest.raises(CompileError, match="Unknown operation"):
+            asyncio.run(acompile("pm.bogus", {}, CTX))
+
+
+class TestAsyncWorkman:
+    def test_warm_loads_schemas_off_loop(self, schema_registry):
+        wm = Workman(registry_root=schema_registry)
+        ref = wm.get_op_spec("pm.project.create").request_schema
+        assert not wm.registry.is_cached(ref)
+
+        asyncio.run(AsyncWorkman(wm).warm(["pm.project.create", "pm.bogus"]))
+        assert wm.registry.is_cached(ref)
+
+    def test_batch_execute_warms_off_loop(self, schema_registry, monkeypatch):
+        import workman.schema
+
+        loaded_on = []
+        load_schema = workman.schema._load_schema
+
+        def _recording_load(path):
+            loaded_on.append(threading.current_thread())
+            return load_schema(path)
+
+        monkeypatch.setattr(workman.schema, "_load_schema", _recording_load)
+        awm = AsyncWorkman(Workman(registry_root=schema_registry))
+        result = asyncio.run(awm.execute({"ctx": CTX, "items": [
+            {"op": "pm.project.create", "payload": {}},
+            {"op": "pm.work_item.create", "payload": {"title": "T", "project_id": "proj_P"}},
+            "not an item",
+            {"op": ["x"], "payload": {}},
+        ]}))
+        assert result["stats"]["output"] == 2
+        assert len(loaded_on) == 2
+        assert threading.main_thread() not in loaded_on
+
+    def test_offloaded_with_concurrency_limit(self, schema_registry):
+        wm = Workman(registry_root=schema_registry)
+
+        async def _main():
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                awm = AsyncWorkman(wm, executor=executor, max_concurrency=2)
+                return await asyncio.gather(*[
+                    awm.compile("pm.project.create", {"project_id": f"proj_{i}"}, CTX) for i in range(10)
+                ])
+
+        plans = asyncio.run(_main())
+        assert [p["ops"][-1]["params"]["aggregate_id"] for p in plans] == [f"proj_{i}" for i in range(10)]
+        assert all([op["id"] for op in p["ops"]] == ["a1", "w1"] for p in plans)
+
+    def test_compile_many(self, schema_registry):
+        awm = AsyncWorkman(Workman(registry_root=schema_registry))
+        plans = asyncio.run(awm.compile_many([("pm.project.create", {}, CTX)] * 3))
+        assert len(plans) == 3
+
+    def test_cancellation_leaves_compiler_usable(self, schema_registry):
+        wm = Workman(registry_root=schema_registry)
+
+        async def _main():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                awm = AsyncWorkman(wm, executor=executor, max_concurrency=1)
+                tasks = [asyncio.create_task(awm.compile("pm.project.create", {}, CTX)) for _ in range(5)]
+                await asyncio.sleep(0)
+                for task in tasks[1:]:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                return await awm.compile("pm.project.close", {"project_id": "proj_X"}, CTX)
+
+        plan = asyncio.run(_main())
+        assert [op["id"] for op in plan["ops"]] == ["a1", "w1"]
@@ -112,3 +112,44 @@ class TestAssertionIdCounter:
         reset_assertion_counter()
         result = assert_exists("type3", "id3")
         assert result["id"] == "a1"
+
+
+class TestOpIdAllocation:
+    """Tests for per-context op ID allocation."""
+
+    def test_no_upper_limit(self):
+        """Allocation continues past the old 9,999 cap."""
+        from workman.ids import op_id_scope
+
+        with op_id_scope() as allocator:
+            for _ in range(10000):
+                allocator.next_assertion_id()
+            assert assert_exists("type", "id")["id"] == "a10001"
+
+    def test_scope_restores_outer_counter(self):
+        """A nested scope does not disturb the enclosing allocation."""
+        from workman.ids import op_id_scope
+
+        reset_assertion_counter()
+        assert assert_exists("type", "id")["id"] == "a1"
+        with op_id_scope():
+            assert assert_exists("type", "id")["id"] == "a1"
+        assert assert_exists("type", "id")["id"] == "a2"
+
+    def test_concurrent_compiles_do_not_interleave(self):
+        """Every plan compiled from a thread pool numbers its own ops from 1."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from workman.compile import compile
+
+        ctx = {"correlation_id": "c1", "producer": "test"}
+
+        def _compile_one(i):
+            payload = {"work_item_id": f"wi_{i}", "project_id": "proj_P", "opsstream_id": "ops_O"}
+            return compile("pm.work_item.move", payload, ctx)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            plans = list(pool.map(_compile_one, range(400)))
+
+        for plan in plans:
+            assert [op["id"] for op in plan["ops"]] == ["a1", "a2", "a3", "w1"]
@@ -0,0 +1,72 @@
+"""Tests for canonical JSON encoding."""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from workman.canonical import CanonicalEncoder, canonical_dumps, format_number
+from workman.views import LayeredPayload, PayloadView
+
+
+class TestNumbers:
+    @pytest.mark.parametrize("value, expected", [
+        (0.0, "0"),
+        (-0.0, "0"),
+        (3.0, "3"),
+        (4.5, "4.5"),
+        (0.002, "0.002"),
+        (0.000001, "0.000001"),
+        (1e-7, "1e-7"),
+        (1e21, "1e+21"),
+        (1e20, "100000000000000000000"),
+        (123456789012345680000.0, "123456789012345680000"),
+        (9007199254740992.0, "9007199254740992"),
+        (5e-324, "5e-324"),
+        (1.7976931348623157e308, "1.7976931348623157e+308"),
+        (-1.5e-9, "-1.5e-9"),
+        (333333333.3333333, "333333333.3333333"),
+        (12, "12"),
+        (2 ** 64, "18446744073709551616"),
+    ])
+    def test_ecmascript_formatting(self, value, expected):
+        assert format_number(value) == expected
+
+    @pytest.mark.parametrize("value", [float("nan"), float("inf")])
+    def test_non_finite_rejected(self, value):
+        with pytest.raises(ValueError):
+            canonical_dumps(value)
+
+
+class TestEncoding:
+    def test_rfc8785_key_order(self):
+        keys = ["€", "\r", "דּ", "1", "\U0001f600", "\u0080", "ö"]
+        encoded = canonical_dumps({key: 0 for key in keys})
+        assert list(json.loads(encoded)) == ["\r", "1", "\u0080", "ö", "€", "\U0001f600", "דּ"]
+
+    def test_compact_and_minimally_escaped(self):
+        obj = {"b": [1, True, None, "€\"\\\n\x0f"], "a": {"y": 1, "x": 2.5}}
+        assert canonical_dumps(obj) == '{"a":{"x":2.5,"y":1},"b":[1,true,null,"€\\"\\\\\\n\\u000f"]}'
+
+    def test_other_types(self):
+        at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        assert canonical_dumps({"t": (1, 2), "at": at}) == '{"at":"2024-01-01T00:00:00+00:00","t":[1,2]}'
+        with pytest.raises(TypeError):
+            canonical_dumps({"x": object()})
+        with pytest.raises(TypeError):
+            canonical_dumps({1: "x"})
+
+    def test_payload_views_cache_their_encoding(self):
+        view = PayloadView({"b": 1}, {"a": 2})
+        assert canonical_dumps({"payload": view}) == '{"payload":{"a":2,"b":1}}'
+        assert view._canonical == '{"a":2,"b":1}'
+
+        layered = LayeredPayload({"b": 1})
+        canonical_dumps(layered)
+        layered["b"] = 2
+        assert canonical_dumps(layered) == '{"b":2}'
+
+    def test_string_cache_is_bounded(self):
+        encoder = CanonicalEncoder(cache_size=2)
+        encoder.encode(["a", "b", "c", "x" * 100])
+        assert len(encoder._strings) == 2
@@ -0,0 +1,98 @@
+"""Tests for resumable, checkpointed bulk compilation."""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+import workman.checkpoint as checkpoint
+from workman.checkpoint import Checkpoint, compile_file_resumable
+from workman.compiler import Workman
+from workman.ids import FixedClock
+
+CTX = {"correlation_id": "c1", "producer": "test"}
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _write_input(path, n):
+    lines = []
+    for i in range(n):
+        if i % 7 == 3:
+            lines.append(json.dumps({"op": "pm.bogus", "payload": {}}))
+        else:
+            lines.append(json.dumps({"op": "pm.project.create", "payload": {"name": f"p{i}"}, "ctx": CTX}))
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+@pytest.fixture
+def wm(schema_registry):
+    return Workman(registry_root=schema_registry, clock=FixedClock(START))
+
+
+def _crash_after(monkeypatch, n):
+    real = checkpoint.compile_line
+    calls = []
+
+    def flaky(*args):
+        calls.append(1)
+        if len(calls) > n:
+            raise KeyboardInterrupt
+        return real(*args)
+
+    monkeypatch.setattr(checkpoint, "compile_line", flaky)
+
+
+class TestCompileFileResumable:
+    def test_uninterrupted_run(self, tmp_path, wm):
+        src = _write_input(tmp_path / "in.jsonl", 20)
+        stats = compile_file_resumable(src, tmp_path / "out.jsonl", every=4, workman=wm)
+
+        assert (stats.lines, stats.errors) == (20, 3)
+        plans = [json.loads(line) for line in (tmp_path / "out.jsonl").read_text().splitlines()]
+        assert len(plans) == 17
+        assert len({p["plan_id"] for p in plans}) == 17  # identical payloads still get distinct IDs per line
+        errors = [json.loads(line) for line in (tmp_path / "out.jsonl.errors.jsonl").read_text().splitlines()]
+        assert [e["line"] for e in errors] == [4, 11, 18]
+        assert not (tmp_path / "out.jsonl.checkpoint").exists()
+
+    def test_resume_matches_uninterrupted_run(self, tmp_path, wm, monkeypatch):
+        src = _write_input(tmp_path / "in.jsonl", 30)
+        compile_file_resumable(src, tmp_path / "ref.jsonl", every=4, workman=wm)
+
+        out = tmp_path / "out.jsonl"
+        with monkeypatch.context() as m:
+            _crash_after(m, 13)
+            with pytest.raises(KeyboardInterrupt):
+                compile_file_resumable(src, out, every=4, workman=Workman(registry_root=wm.registry.root))
+
+        state = Checkpoint.load(tmp_path / "out.jsonl.checkpoint")
+        assert state.lines == 12
+        with open(out, "ab") as f:  # output written after the last checkpoint is discarded
+            f.write(b'{"torn')
+
+        stats = compile_file_resumable(src, out, every=4, workman=wm)
+
+        assert (stats.lines, stats.errors) == (30, 4)
+        assert out.read_bytes() == (tmp_path / "ref.jsonl").read_bytes()
+        assert (tmp_path / "out.jsonl.errors.jsonl").read_bytes() == (tmp_path / "ref.jsonl.errors.jsonl").read_bytes()
+
+    def test_checkpoint_for_other_input_is_rejected(self, tmp_path, wm):
+        src = _write_input(tmp_path / "in.jsonl", 3)
+        Checkpoint(input="other.jsonl", input_size=1, mode="plan", started_at=START.isoformat()).save(
+            tmp_path / "out.jsonl.checkpoint")
+
+        with pytest.raises(ValueError, match="different run"):
+            compile_file_resumable(src, tmp_path / "out.jsonl", workman=wm)
+
+
+class TestCheckpoint:
+    def test_save_and_load_round_trip(self, tmp_path):
+        state = Checkpoint(input="in.jsonl", input_size=10, mode="plan", started_at=START.isoformat(),
+                           input_offset=5, output_offset=7, lines=1)
+        state.save(tmp_path / "ckpt")
+        assert Checkpoint.load(tmp_path / "ckpt") == state
+        assert not (tmp_path / ".ckpt.tmp").exists()
+
+    def test_load_missing(self, tmp_path):
+        assert Checkpoint.load(tmp_path / "missing") is None
@@ -0,0 +1,170 @@
+"""Tests for the workman JSONL command line and stream compiler."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from workman.cli import main
+from workman.compiler import Workman
+from workman.stream import compile_stream
+
+_ACTOR = {"actor_type": "human", "actor_id": "u_test"}
+CTX = {"correlation_id": "c1", "producer": "test"}
+
+
+def _write_jsonl(path, rows):
+    path.write_text("".join((r if isinstance(r, str) else json.dumps(r)) + "\n" for r in rows))
+    return path
+
+
+class TestCompileStream:
+    def test_plans_and_errors_are_separated(self, schema_registry):
+        lines = [
+            json.dumps({"op": "pm.project.create", "payload": {"name": "A"}, "ctx": CTX}),
+            "",
+            "{not json",
+            json.dumps({"op": "pm.bogus", "payload": {}}),
+            json.dumps({"payload": {}}),
+            json.dumps({"op": "pm.project.close", "payload": {"project_id": "proj_X"}, "ctx": CTX}),
+        ]
+        out, err = io.StringIO(), io.StringIO()
+        stats = compile_stream(Workman(registry_root=schema_registry), "plan", lines, out, err)
+
+        plans = [json.loads(line) for line in out.getvalue().splitlines()]
+        errors = [json.loads(line) for line in err.getvalue().splitlines()]
+        assert [p["meta"]["op"] for p in plans] == ["pm.project.create", "pm.project.close"]
+        assert [(e["line"], e["error"]) for e in errors] == [
+            (3, "JSONDecodeError"), (4, "CompileError"), (5, "KeyError"),
+        ]
+        assert (stats.lines, stats.output, stats.errors) == (5, 2, 3)
+
+    def test_unknown_mode(self, schema_registry):
+        with pytest.raises(ValueError):
+            compile_stream(Workman(registry_root=schema_registry), "bogus", [], io.StringIO(), io.StringIO())
+
+
+class TestCli:
+    def test_plan_mode_files(self, tmp_path, schema_registry):
+        src = _write_jsonl(tmp_path / "in.jsonl", [
+            {"op": "pm.project.create", "payload": {"name": "A"}, "ctx": CTX},
+            {"op": "pm.work_item.create", "payload": {"title": "T", "project_id": "proj_P"}, "ctx": CTX},
+        ])
+        out = tmp_path / "out.jsonl"
+        assert main([str(src), "-o", str(out), "--registry", str(schema_registry)]) == 0
+        assert len(out.read_text().splitlines()) == 2
+
+    def test_execute_and_intent_modes(self, tmp_path, schema_registry):
+        src = _write_jsonl(tmp_path / "exec.jsonl", [{"op": "pm.project.create", "payload": {}, "ctx": CTX}])
+        out = tmp_path / "exec.out"
+        assert main([str(src), "--mode", "execute", "-o", str(out)]) == 0
+        assert json.loads(out.read_text())["items"][0]["event_type"] == "project.created"
+
+        src = _write_jsonl(tmp_path / "intent.jsonl", [{
+            "ops": [{"op": "pm.project.create", "payload": {"name": "A"}}], "source": "cli", "actor": _ACTOR,
+        }])
+        out = tmp_path / "intent.out"
+        assert main([str(src), "--mode", "intent", "-o", str(out)]) == 0
+        assert len(json.loads(out.read_text())["items"][0]["plan_hash"]) == 64
+
+    @pytest.mark.parametrize("mode, request_", [
+        ("plan", {"op": "pm.project.create", "payload": {}, "ctx": "x"}),
+        ("execute", {"op": "pm.project.create", "payload": {}, "ctx": "x"}),
+        ("intent", {"ops": [{"op": "pm.project.create", "payload": "s"}], "source": "cli", "actor": _ACTOR}),
+        ("intent", {"ops": ["pm.project.create"], "source": "cli", "actor": _ACTOR}),
+        ("execute", {"op": "pm.compile_intent", "source": "cli", "actor": _ACTOR, "ops": ["x"]}),
+        ("execute", {"op": "pm.compile_intent", "source": "cli", "actor": _ACTOR,
+                     "ops": [{"op": "pm.project.create", "payload": "x"}]}),
+    ])
+    def test_malformed_request_is_a_line_error(self, tmp_path, mode, request_):
+        src = _write_jsonl(tmp_path / "in.jsonl", [request_])
+        out, errors = tmp_path / "out.jsonl", tmp_path / "err.jsonl"
+        assert main([str(src), "--mode", mode, "-o", str(out), "--errors", str(errors)]) == 1
+        assert out.read_text() == ""
+        error = json.loads(errors.read_text())
+        assert (error["line"], error["error"]) == (1, "WorkmanError")
+
+    def test_dedup_ttl(self, tmp_path, schema_registry):
+        intent = {"ops": [{"op": "pm.project.create", "payload": {"name": "A"}}], "source": "cli", "actor": _ACTOR}
+        src = _write_jsonl(tmp_path / "intent.jsonl", [intent, intent])
+        out = tmp_path / "intent.out"
+
+        assert main([str(src), "--mode", "intent", "-o", str(out)]) == 0
+        first, second = [json.loads(line)["items"][0] for line in out.read_text().splitlines()]
+        assert first["intent"]["intent_id"] != second["intent"]["intent_id"]
+        assert first["content_hash"] == second["content_hash"]
+
+        assert main([str(src), "--mode", "intent", "-o", str(out), "--dedup-ttl", "60"]) == 0
+        first, second = out.read_text().splitlines()
+        assert first == second
+
+    @pytest.mark.parametrize("ttl", ["-1", "0", "nan", "soon"])
+    def test_dedup_ttl_must_be_positive(self, tmp_path, capsys, ttl):
+        with pytest.raises(SystemExit) as exc_info:
+            main([str(tmp_path / "in.jsonl"), "--mode", "intent", "--dedup-ttl", ttl])
+        assert exc_info.value.code == 2
+        assert "--dedup-ttl" in capsys.readouterr().err
+
+    def test_errors_file_and_exit_code(self, tmp_path):
+        src = _write_jsonl(tmp_path / "in.jsonl", [{"op": "pm.bogus", "payload": {}}])
+        out, errors = tmp_path / "out.jsonl", tmp_path / "err.jsonl"
+        assert main([str(src), "-o", str(out), "--errors", str(errors)]) == 1
+        assert out.read_text() == ""
+        assert json.loads(errors.read_text())["line"] == 1
+
+    def test_workers_preserve_order(self, tmp_path, schema_registry):
+        rows = [{"op": "pm.project.create", "payload": {"project_id": f"proj_{i}"}, "ctx": CTX} for i in range(30)]
+        src = _write_jsonl(tmp_path / "in.jsonl", rows)
+        out = tmp_path / "out.jsonl"
+        assert main([str(src), "-o", str(out), "--workers", "2", "--chunksize", "4"]) == 0
+        ids = [json.loads(line)["ops"][-1]["params"]["aggregate_id"] for line in out.read_text().splitlines()]
+        assert ids == [f"proj_{i}" for i in range(30)]
+
+    def test_out_dir_ingest(self, tmp_path, schema_registry):
+        rows = [{"op": "pm.project.create", "payload": {"project_id": f"proj_{i}"}, "ctx": CTX} for i in range(10)]
+        src = _write_jsonl(tmp_path / "in.jsonl", rows)
+        out_dir = tmp_path / "shards"
+        assert main([str(src), "--out-dir", str(out_dir), "--workers", "1", "--shards", "3"]) == 0
+        manifest = json.loads((out_dir / "index.json").read_text())
+        assert sum(s["lines"] for s in manifest["shards"]) == 10
+
+    def test_checkpointed_run(self, tmp_path, schema_registry):
+        src = _write_jsonl(tmp_path / "in.jsonl", [{"op": "pm.project.create", "payload": {}, "ctx": CTX}] * 5)
+        out, ckpt = tmp_path / "out.jsonl", tmp_path / "run.ckpt"
+        assert main([str(src), "-o", str(out), "--checkpoint", str(ckpt), "--checkpoint-every", "2"]) == 0
+        assert len(out.read_text().splitlines()) == 5
+        assert not ckpt.exists()
+
+    def test_out_dir_partitions(self, tmp_path, schema_registry):
+        rows = [{"op": "pm.project.update", "payload": {"project_id": f"proj_{i % 3}"}, "ctx": CTX} for i in range(9)]
+        src = _write_jsonl(tmp_path / "in.jsonl", rows)
+        out_dir = tmp_path / "parts"
+        assert main([str(src), "--out-dir", str(out_dir), "--partitions", "2"]) == 0
+        manifest = json.loads((out_dir / "index.json").read_text())
+        assert sum(p["lines"] for p in manifest["partitions"]) == 9
+
+    def test_csv_import(self, tmp_path, schema_registry):
+        pytest.importorskip("yaml")
+        fields = Path(__file__).resolve().parent.parent / "pm.fields.yaml"
+        src = tmp_path / "items.csv"
+        src.write_text("op,ref,name,title,project_id,priority\n"
+                       "pm.project.create,p,Site,,,\n"
+                       "pm.work_item.create,,,Home,@ref:p,high\n"
+                       "pm.work_item.create,,,Bad,,someday\n")
+        out, errors = tmp_path / "out.jsonl", tmp_path / "err.jsonl"
+        assert main([str(src), "--csv", "--fields", str(fields), "--mode", "intent",
+                     "-o", str(out), "--errors", str(errors)]) == 1
+        assert len(json.loads(out.read_text())["items"][0]["intent"]["ops"]) == 2
+        assert json.loads(errors.read_text())["rows"] == [3]
+
+        assert main([str(src), "--csv", "--fields", str(fields), "-o", str(out), "--errors", str(errors)]) == 1
+        assert len(out.read_text().splitlines()) == 2
+        assert json.loads(errors.read_text())["rows"] == [3]
+
+    def test_canonical_output(self, tmp_path, schema_registry):
+        src = _write_jsonl(tmp_path / "in.jsonl", [{"op": "pm.project.create", "payload": {"name": "A"}, "ctx": CTX}])
+        out = tmp_path / "out.jsonl"
+        assert main([str(src), "-o", str(out), "--canonical"]) == 0
+        line = out.read_text().splitlines()[0]
+        assert line == json.dumps(json.loads(line), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
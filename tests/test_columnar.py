@@ -0,0 +1,139 @@
+"""Tests for columnar single-op batch compilation."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from tests.conftest import _write_schema
+from workman import compile_columns
+from workman.columnar import column_types
+from workman.compiler import Workman
+from workman.errors import CompileError, ValidationError
+from workman.ids import FixedClock
+from workman.ir import analyze, render_event_item
+
+CTX = {"correlation_id": "c1", "producer": "test", "actor": {"kind": "human", "id": "u1"}}
+
+
+def _rows(columns):
+    n = len(next(iter(columns.values())))
+    return [{k: v[i] for k, v in columns.items() if v[i] is not None} for i in range(n)]
+
+
+class TestCompileColumns:
+    def test_plans_match_compile_per_row(self, schema_registry):
+        wm = Workman(registry_root=schema_registry)
+        columns = {
+            "work_item_id": ["wi_1", None, "wi_3"],
+            "title": ["A", "B", "C"],
+            "project_id": ["proj_P", None, "proj_Q"],
+            "deliverable_id": [None, "dlv_D", None],
+        }
+        plans = wm.compile_columns("pm.work_item.create", columns, CTX)
+
+        assert len(plans) == 3
+        for plan, payload in zip(plans, _rows(columns)):
+            pins = {"id": plan["ops"][-1]["params"]["aggregate_id"]}
+            expected = wm.compile("pm.work_item.create", payload, CTX, pins)
+            assert plan["ops"] == expected["ops"]
+            assert plan["meta"] == expected["meta"]
+            assert plan["plan_id"].startswith("ulid:")
+        generated = plans[1]["ops"][-1]["params"]["aggregate_id"]
+        assert generated.startswith("wi_")
+        assert [op["method"] for op in plans[1]["ops"]] == ["assert.exists", "wal.append"]
+        assert plans[1]["ops"][-1]["params"]["payload"] == {"title": "B", "deliverable_id": "dlv_D",
+                                                            "work_item_id": generated}
+
+    def test_plans_do_not_share_meta(self, schema_registry):
+        wm = Workman(registry_root=schema_registry)
+        plans = wm.compile_columns("pm.work_item.create", {"title": ["A", "B"]}, CTX)
+        plans[0]["meta"]["note"] = "first"
+        assert "note" not in plans[1]["meta"]
+
+    def test_updates_and_dynamic_fks(self, schema_registry):
+        wm = Workman(registry_root=schema_registry)
+        columns = {
+            "link_id": ["lnk_1", "lnk_2"],
+            "source_type": ["work_item", "deliverable"],
+            "source_id": ["wi_1", "dlv_1"],
+            "target_type": ["project", "project"],
+            "target_id": ["proj_1", "proj_2"],
+            "link_type": ["relates_to", "relates_to"],
+        }
+        plans = wm.compile_columns("link.create", columns, CTX)
+        for plan, payload in zip(plans, _rows(columns)):
+            assert plan["ops"] == wm.compile("link.create", payload, CTX)["ops"]
+
+        plans = wm.compile_columns("pm.work_item.complete", {"work_item_id": ["wi_1", "wi_2"]}, CTX)
+        assert plans[1]["ops"] == wm.compile("pm.work_item.complete", {"work_item_id": "wi_2"}, CTX)["ops"]
+
+    def test_event_items_match_execute(self, schema_registry):
+        wm = Workman(registry_root=schema_registry)
+        columns = {"work_item_id": ["wi_1", "wi_2"], "title": ["A", "B"], "project_id": ["proj_P", None]}
+        items = compile_columns("pm.work_item.create", columns, CTX, output="events")
+        for item, payload in zip(items, _rows(columns)):
+            assert item == render_event_item(analyze(wm, "pm.work_item.create", payload, CTX))
+
+    def test_column_type_error_names_row(self):
+        with pytest.raises(ValidationError, match="row 2: 7 is not of type 'string'"):
+            compile_columns("pm.project.create", {"name": ["A", "B", 7]}, CTX)
+
+    def test_bool_is_not_a_number(self):
+        with pytest.raises(ValidationError, match="row 0"):
+            compile_columns("pm.work_item.update", {"work_item_id": ["wi_1"], "time_spent": [True]}, CTX)
+
+    def test_unequal_columns(self):
+        with pytest.raises(ValidationError, match="equal lengths"):
+            compile_columns("pm.project.create", {"name": ["A"], "project_id": ["proj_1", "proj_2"]}, CTX)
+
+    def test_unknown_op_and_output(self):
+        with pytest.raises(CompileError):
+            compile_columns("pm.bogus", {}, CTX)
+        with pytest.raises(ValueError):
+            compile_columns("pm.project.create", {}, CTX, output="rows")
+
+    def test_empty_batch(self):
+        assert compile_columns("pm.project.create", {"name": []}, CTX) == []
+
+    def test_complex_schema_falls_back_to_row_validation(self, schema_registry):
+        _write_schema(schema_registry, "org1.workman", "pm.project.create", "1-0-0",
+                      {"name": {"type": "string", "enum": ["A", "B"]}}, required=["name"])
+        wm = Workman(registry_root=schema_registry)
+        assert len(wm.compile_columns("pm.project.create", {"name": ["A", "B"]}, CTX)) == 2
+        with pytest.raises(ValidationError, match="is not one of"):
+            wm.compile_columns("pm.project.create", {"name": ["A", "C"]}, CTX)
+
+    def test_required_and_additional_properties(self, schema_registry):
+        _write_schema(schema_registry, "org1.workman", "pm.project.create", "1-0-0",
+                      {"name": {"type": "string"}}, required=["name"], additionalProperties=False)
+        wm = Workman(registry_root=schema_registry)
+        with pytest.raises(ValidationError, match="row 1: 'name' is a required property"):
+            wm.compile_columns("pm.project.create", {"name": ["A", None]}, CTX)
+        with pytest.raises(ValidationError, match="additional properties"):
+            wm.compile_columns("pm.project.create", {"name": ["A"], "color": ["red"]}, CTX)
+
+    def test_artifact_container_check(self):
+        with pytest.raises(ValidationError, match="container FK"):
+            compile_columns("pm.artifact.create", {"title": ["A"], "kind": ["doc"]}, CTX)
+
+    def test_deterministic(self, schema_registry):
+        clock = FixedClock(datetime(2024, 1, 1, tzinfo=timezone.utc))
+        wm = Workman(registry_root=schema_registry, deterministic=True, clock=clock)
+        columns = {"name": ["A", "B"]}
+        assert wm.compile_columns("pm.project.create", columns, CTX) == wm.compile_columns(
+            "pm.project.create", columns, CTX)
+
+
+class TestColumnTypes:
+    def test_simple_schema(self):
+        schema = {"type": "object", "properties": {"a": {"type": "string"}, "b": {"type": ["number", "null"]}}}
+        assert column_types(schema) == {"a": ["string"], "b": ["number", "null"]}
+
+    @pytest.mark.parametrize("schema", [
+        {"type": "object", "properties": {"a": {"type": "string", "format": "date"}}},
+        {"type": "object", "properties": {"a": {"$ref": "#/definitions/x"}}},
+        {"type": "object", "oneOf": []},
+        {"type": "object", "additionalProperties": {"type": "string"}},
+    ])
+    def test_constrained_schemas_fall_back(self, schema):
+        assert column_types(schema) is None
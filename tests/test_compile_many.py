@@ -0,0 +1,86 @@
+"""Tests for batch compilation (compile_many)."""
+
+import pytest
+from ulid import ULID
+
+from workman import compile_many
+from workman.compiler import Workman
+from workman.errors import CompileError, ValidationError
+from workman.ids import monotonic_ulids
+
+CTX = {"correlation_id": "c1", "producer": "test"}
+
+
+class TestCompileMany:
+    def test_matches_compile_per_item(self, schema_registry):
+        wm = Workman(registry_root=schema_registry)
+        items = [
+            ("pm.project.create", {"project_id": "proj_A", "name": "A"}, CTX),
+            ("pm.work_item.move", {"work_item_id": "wi_1", "project_id": "proj_A", "opsstream_id": "ops_O"}, CTX),
+            ("pm.project.close", {"project_id": "proj_A"}, CTX),
+        ]
+        plans = wm.compile_many(items)
+        for (op, payload, ctx), plan in zip(items, plans):
+            expected = wm.compile(op, dict(payload), ctx)
+            assert plan["ops"] == expected["ops"]
+            assert plan["meta"] == expected["meta"]
+
+    def test_each_plan_numbers_from_one(self):
+        plans = compile_many([
+            ("pm.work_item.move", {"work_item_id": f"wi_{i}", "project_id": "proj_P"}, CTX)
+            for i in range(5)
+        ])
+        for plan in plans:
+            assert [op["id"] for op in plan["ops"]] == ["a1", "a2", "w1"]
+
+    def test_generated_ids_are_unique_and_ordered(self):
+        plans = compile_many([("pm.project.create", {}, CTX) for _ in range(50)])
+        ids = [plan["ops"][-1]["params"]["aggregate_id"] for plan in plans]
+        assert len(set(ids)) == 50
+        assert ids == sorted(ids)
+        assert all(i.startswith("proj_") for i in ids)
+
+    def test_plan_ids_unique(self):
+        plans = compile_many([("pm.project.create", {}, CTX) for _ in range(20)])
+        plan_ids = {plan["plan_id"] for plan in plans}
+        assert len(plan_ids) == 20
+        assert all(plan_id.startswith("ulid:") for plan_id in plan_ids)
+
+    def test_pins_respected(self):
+        plans = compile_many([("pm.project.create", {}, CTX, {"id": "proj_PINNED"})])
+        assert plans[0]["ops"][-1]["params"]["aggregate_id"] == "proj_PINNED"
+
+    def test_raises_first_error_by_default(self):
+        with pytest.raises(CompileError, match="Unknown operation"):
+            compile_many([("pm.project.create", {}, CTX), ("pm.bogus", {}, CTX)])
+
+    def test_return_errors_per_item(self):
+        results = compile_many([
+            ("pm.project.create", {}, CTX),
+            ("pm.bogus", {}, CTX),
+            ("pm.artifact.create", {"name": "No container"}, CTX),
+            ("pm.project.close", {"project_id": "proj_X"}, CTX),
+        ], return_errors=True)
+        assert results[0]["meta"]["op"] == "pm.project.create"
+        assert isinstance(results[1], CompileError)
+        assert isinstance(results[2], ValidationError)
+        assert results[3]["ops"][0]["method"] == "assert.exists"
+
+
+class TestMonotonicUlids:
+    def test_sorted_and_unique(self):
+        ulids = monotonic_ulids(1000)
+        assert ulids == sorted(ulids)
+        assert len(set(ulids)) == 1000
+        assert all(len(u) == 26 for u in ulids)
+
+    def test_empty(self):
+        assert monotonic_ulids(0) == []
+
+    def test_bulk_encoding_matches_ulid(self):
+        ulids = monotonic_ulids(50)
+        decoded = [ULID.from_str(u) for u in ulids]
+        assert [str(u) for u in decoded] == ulids
+        randomness = [int.from_bytes(u.bytes[6:], "big") for u in decoded]
+        assert randomness == list(range(randomness[0], randomness[0] + 50))
+        assert len({u.timestamp for u in decoded}) == 1
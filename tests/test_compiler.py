@@ -0,0 +1,123 @@
+"""Tests for Workman compiler instances."""
+
+import itertools
+import json
+import threading
+from datetime import datetime, timezone
+
+import pytest
+
+from workman import compile, default_workman
+from workman.catalog import OP_CATALOG
+from workman.compiler import Workman, set_default_workman
+from workman.errors import CompileError, ValidationError
+
+from tests.conftest import _write_schema
+
+_ACTOR = {"actor_type": "human", "actor_id": "u_test"}
+CTX = {"correlation_id": "c1", "producer": "test"}
+
+
+def _counter_ulids():
+    counter = itertools.count(1)
+    return lambda: f"{next(counter):026d}"
+
+
+class TestWorkmanInstance:
+    def test_compile_uses_instance_registry(self, tmp_path):
+        root = tmp_path / "other-reg"
+        _write_schema(root, "org1.workman", "pm.project.create", "1-0-0",
+                      {"name": {"type": "string"}}, required=["name"])
+        wm = Workman(registry_root=root)
+
+        with pytest.raises(ValidationError):
+            wm.compile("pm.project.create", {}, CTX)
+        # The default instance still uses SCHEMA_REGISTRY_ROOT (no required fields)
+        assert compile("pm.project.create", {}, CTX)["ops"][0]["method"] == "wal.append"
+
+    def test_registry_reads_schema_once(self, schema_registry):
+        wm = Workman(registry_root=schema_registry)
+        wm.compile("pm.project.create", {"name": "A"}, CTX)
+
+        schema_file = schema_registry / "schemas" / "org1.workman" / "pm.project.create" / "jsonschema" / "1-0-0" / "schema.json"
+        schema_file.write_text("{not json")
+        wm.compile("pm.project.create", {"name": "B"}, CTX)
+
+        wm.registry.clear()
+        with pytest.raises(ValidationError, match="Invalid JSON"):
+            wm.compile("pm.project.create", {"name": "C"}, CTX)
+
+    def test_injected_id_source_and_clock(self, schema_registry):
+        wm = Workman(
+            registry_root=schema_registry,
+            ulid_factory=_counter_ulids(),
+            clock=lambda: datetime(2026, 1, 1, tzinfo=timezone.utc),
+        )
+        result = wm.compile_intent(op_name="pm.project.create", payload={"name": "A"},
+                                   source="test", actor=_ACTOR)
+        item = result["items"][0]
+        assert item["intent"]["intent_id"] == f"pmi_{1:026d}"
+        assert item["intent"]["issued_at"] == "2026-01-01T00:00:00+00:00"
+        wal = item["plan"]["ops"][-1]
+        assert wal["params"]["aggregate_id"] == f"proj_{2:026d}"
+
+    def test_custom_catalog(self, schema_registry):
+        catalog = {"pm.project.create": OP_CATALOG["pm.project.create"]}
+        wm = Workman(registry_root=schema_registry, catalog=catalog)
+
+        assert wm.compile("pm.project.create", {}, CTX)["meta"]["op"] == "pm.project.create"
+        with pytest.raises(CompileError, match="Unknown operation"):
+            wm.compile("pm.project.close", {"project_id": "proj_X"}, CTX)
+
+    def test_execute_method(self, schema_registry):
+        wm = Workman(registry_root=schema_registry, ulid_factory=_counter_ulids())
+        result = wm.execute({"op": "pm.project.create", "payload": {}, "ctx": CTX})
+        assert result["items"][0]["aggregate_id"] == f"proj_{1:026d}"
+
+
+class TestDefaultWorkman:
+    def test_free_functions_delegate_to_default(self, schema_registry):
+        wm = Workman(registry_root=schema_registry, ulid_factory=_counter_ulids())
+        set_default_workman(wm)
+        try:
+            assert default_workman() is wm
+            plan = compile("pm.project.create", {}, CTX)
+            assert plan["ops"][0]["params"]["aggregate_id"] == f"proj_{1:026d}"
+        finally:
+            set_default_workman(None)
+        assert default_workman() is not wm
+
+    def test_default_registry_root_is_read_once(self, schema_registry, monkeypatch):
+        wm = default_workman()
+        monkeypatch.setenv("SCHEMA_REGISTRY_ROOT", str(schema_registry / "elsewhere"))
+        assert wm.registry.root == schema_registry
+        assert compile("pm.project.create", {}, CTX)["meta"]["op"] == "pm.project.create"
+
+        set_default_workman(None)
+        assert default_workman().registry.root == schema_registry / "elsewhere"
+
+    def test_concurrent_first_use_creates_one_instance(self, monkeypatch):
+        set_default_workman(None)
+        created = []
+        barrier = threading.Barrier(8)
+
+        class SlowWorkman(Workman):
+            def __init__(self, **kwargs):
+                created.append(self)
+                threading.Event().wait(0.01)
+                super().__init__(**kwargs)
+
+        monkeypatch.setattr("workman.compiler.Workman", SlowWorkman)
+        seen = []
+
+        def first_use():
+            barrier.wait()
+            seen.append(default_workman())
+
+        threads = [threading.Thread(target=first_use) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(created) == 1
+        assert all(wm is created[0] for wm in seen)
@@ -0,0 +1,144 @@
+"""Tests for the CSV importer."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from workman.compiler import Workman
+from workman.csvimport import CsvImporter, FieldDef, FieldMap, coerce, import_csv, normalize_header
+from workman.errors import CompileError, ValidationError
+
+FIELDS = FieldMap.from_dict({
+    "enums": {"priority": {"values": ["LOW", "MEDIUM", "HIGH", "CRITICAL"]},
+              "state": {"values": ["NEW", "IN_PROGRESS", "DONE"]}},
+    "fields": [
+        {"name": "title", "type": "string", "entity": "work_item"},
+        {"name": "priority", "type": "enum", "enum_ref": "priority", "entity": "work_item"},
+        {"name": "state", "type": "enum", "enum_ref": "state", "entity": "work_item"},
+        {"name": "labels", "type": "array[string]", "entity": "work_item"},
+        {"name": "assignees", "type": "array[string]", "entity": "work_item"},
+        {"name": "time_estimate", "type": "number", "entity": "work_item"},
+        {"name": "name", "type": "string", "entity": "project"},
+    ],
+})
+CTX = {"correlation_id": "c1", "producer": "test"}
+PM_FIELDS = Path(__file__).resolve().parent.parent / "pm.fields.yaml"
+
+
+def _csv(text):
+    return io.StringIO(text.strip() + "\n")
+
+
+def _payload(plan):
+    return plan["ops"][-1]["params"]["payload"]
+
+
+class TestCoercion:
+    def test_enum_is_case_insensitive(self):
+        field = FieldDef("state", "enum", ("NEW", "IN_PROGRESS"))
+        assert coerce("in progress", field) == "IN_PROGRESS"
+        with pytest.raises(ValidationError, match="not one of"):
+            coerce("later", field)
+
+    def test_arrays_numbers_and_objects(self):
+        assert coerce("a, b;c,", FieldDef("labels", "array[string]")) == ["a", "b", "c"]
+        assert coerce("3", FieldDef("n", "number")) == 3
+        assert coerce("2.5", FieldDef("n", "number")) == 2.5
+        assert coerce('{"a": 1}', FieldDef("meta", "object")) == {"a": 1}
+        with pytest.raises(ValidationError):
+            coerce("lots", FieldDef("n", "number"))
+
+    def test_unknown_fields_pass_through(self):
+        assert coerce("proj_1", None) == "proj_1"
+
+    def test_normalize_header(self):
+        assert normalize_header(" Due At ") == "due_at"
+        assert normalize_header("time-estimate") == "time_estimate"
+
+
+class TestPlanMode:
+    def test_rows_become_plans(self, schema_registry):
+        importer = CsvImporter(FIELDS, workman=Workman(registry_root=schema_registry), op="pm.work_item.create",
+                               ctx=CTX)
+        results = list(importer.import_rows(_csv("""
+Title,Priority,Labels,Assignees,Time Estimate,Project ID
+Write docs,high,"docs, writing",ana;ben,3,proj_P
+Fix bug,,,,,
+""")))
+        assert [r.rows for r in results] == [[1], [2]]
+        assert _payload(results[0].result) == {
+            "title": "Write docs", "priority": "HIGH", "labels": ["docs", "writing"],
+            "assignees": ["ana", "ben"], "time_estimate": 3, "project_id": "proj_P",
+            "work_item_id": results[0].result["ops"][-1]["params"]["aggregate_id"],
+        }
+        assert set(_payload(results[1].result)) == {"title", "work_item_id"}
+
+    def test_ref_links_between_rows(self, schema_registry):
+        importer = CsvImporter(FIELDS, workman=Workman(registry_root=schema_registry), batch_size=2)
+        results = list(importer.import_rows(_csv("""
+op,ref,name,title,project_id
+pm.project.create,site,Website,,
+pm.work_item.create,,,Home page,@ref:site
+pm.work_item.create,,,About page,@ref:site
+""")))
+        project_id = results[0].result["ops"][-1]["params"]["aggregate_id"]
+        assert [op["method"] for op in results[0].result["ops"]] == ["wal.append"]  # still a generated ID
+        assert _payload(results[1].result)["project_id"] == project_id
+        assert _payload(results[2].result)["project_id"] == project_id
+
+    def test_row_errors_do_not_stop_the_import(self, schema_registry):
+        importer = CsvImporter(FIELDS, workman=Workman(registry_root=schema_registry), op="pm.work_item.create")
+        results = list(importer.import_rows(_csv("""
+title,state,project_id
+A,someday,
+B,,@ref:missing
+C,done,
+""")))
+        assert [type(r.error) for r in results] == [ValidationError, CompileError, type(None)]
+        assert [r.rows for r in results] == [[1], [2], [3]]
+        assert _payload(results[2].result)["state"] == "DONE"
+
+    def test_row_without_op(self):
+        results = list(CsvImporter(FIELDS).import_rows(_csv("title\nA")))
+        assert isinstance(results[0].error, CompileError)
+
+
+class TestIntentMode:
+    def test_batches_and_refs_across_intents(self, schema_registry):
+        importer = CsvImporter(FIELDS, workman=Workman(registry_root=schema_registry), mode="intent",
+                               batch_size=2, source="sheet")
+        results = list(importer.import_rows(_csv("""
+op,ref,name,title,project_id
+pm.project.create,site,Website,,
+pm.work_item.create,,,Home page,@ref:site
+pm.work_item.create,,,About page,@ref:site
+""")))
+        assert [r.rows for r in results] == [[1, 2], [3]]
+        first, second = (r.result["items"][0] for r in results)
+        project_id = first["plan"]["ops"][0]["params"]["aggregate_id"]
+        assert first["intent"]["ops"][1]["payload"]["project_id"] == "@ref:0"
+        assert first["plan"]["ops"][-1]["params"]["payload"]["project_id"] == project_id
+        assert second["intent"]["ops"][0]["payload"]["project_id"] == project_id
+        assert first["intent"]["source"] == "sheet"
+
+    def test_batch_size_is_capped_for_intents(self):
+        assert CsvImporter(FIELDS, mode="intent", batch_size=500).batch_size == 100
+        with pytest.raises(ValueError):
+            CsvImporter(FIELDS, mode="execute")
+
+
+class TestFieldsYaml:
+    def test_load_pm_fields(self, tmp_path, schema_registry):
+        pytest.importorskip("yaml")
+        fields = FieldMap.load(PM_FIELDS)
+        assert fields.fields("work_item")["priority"].enum_values == ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+        assert fields.fields("artifact")["tags"].type == "array[string]"
+
+        src = tmp_path / "items.csv"
+        src.write_text("Title,Kind,Labels\nA,issue,x;y\n")
+        [result] = import_csv(src, PM_FIELDS, workman=Workman(registry_root=schema_registry),
+                              op="pm.work_item.create")
+        assert _payload(result.result)["kind"] == "ISSUE"
+        assert json.dumps(result.result)
@@ -0,0 +1,145 @@
+"""Tests for intent content hashing and the dedup cache."""
+
+import json
+import pickle
+
+import pytest
+
+from workman.compiler import Workman
+from workman.dedup import TTLCache
+from workman.intent import intent_content_hash
+from workman.stream import dumps
+
+_ACTOR = {"actor_type": "human", "actor_id": "u_test"}
+_OPS = [
+    {"op": "pm.project.create", "payload": {"name": "Alpha"}},
+    {"op": "pm.work_item.create", "payload": {"title": "T", "project_id": "@ref:0"}},
+]
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    def test_entries_expire(self):
+        timer = FakeTimer()
+        cache = TTLCache(10, timer=timer)
+        cache.put("a", 1)
+        timer.now = 9.9
+        assert cache.get("a") == 1
+        timer.now = 10
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_bounded(self):
+        cache = TTLCache(10, maxsize=2, timer=FakeTimer())
+        for key in "abc":
+            cache.put(key, key)
+        assert (cache.get("a"), cache.get("b"), cache.get("c")) == (None, "b", "c")
+
+    def test_expired_entries_are_pruned_on_put(self):
+        timer = FakeTimer()
+        cache = TTLCache(1, timer=timer)
+        cache.put("a", 1)
+        timer.now = 5
+        cache.put("b", 2)
+        assert len(cache) == 1
+
+    def test_rejects_non_positive_ttl(self):
+        with pytest.raises(ValueError):
+            TTLCache(0)
+
+    def test_pickle_drops_entries(self):
+        cache = TTLCache(10)
+        cache.put("a", 1)
+        restored = pickle.loads(pickle.dumps(cache))
+        assert restored.ttl == 10 and len(restored) == 0
+
+
+class TestContentHash:
+    def test_stable_across_compiles(self, schema_registry):
+        wm = Workman(registry_root=schema_registry)
+        a = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR)["items"][0]
+        b = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR)["items"][0]
+        assert a["intent"]["intent_id"] != b["intent"]["intent_id"]
+        assert a["plan_hash"] != b["plan_hash"]
+        assert a["content_hash"] == b["content_hash"] == intent_content_hash(_OPS, "test", _ACTOR)
+
+    def test_normalization(self):
+        single = intent_content_hash([{"op": "pm.project.create", "payload": {"name": "A", "status": "x"}}], "s", _ACTOR)
+        reordered = intent_content_hash([{"payload": {"status": "x", "name": "A"}, "op": "pm.project.create"}], "s", _ACTOR)
+        assert single == reordered
+        assert intent_content_hash([{"op": "pm.project.create"}], "s", _ACTOR) == \
+            intent_content_hash([{"op": "pm.project.create", "payload": {}}], "s", _ACTOR)
+
+    @pytest.mark.parametrize("ops, source, actor", [
+        ([{"op": "pm.project.create", "payload": {"name": "B"}}], "s", _ACTOR),
+        ([{"op": "pm.project.create", "payload": {"name": "A"}}], "other", _ACTOR),
+        ([{"op": "pm.project.create", "payload": {"name": "A"}}], "s", {"actor_type": "human", "actor_id": "u_2"}),
+    ])
+    def test_content_changes_the_hash(self, ops, source, actor):
+        base = intent_content_hash([{"op": "pm.project.create", "payload": {"name": "A"}}], "s", _ACTOR)
+        assert intent_content_hash(ops, source, actor) != base
+
+    def test_single_op_mode_matches_ops_list(self, schema_registry):
+        wm = Workman(registry_root=schema_registry)
+        single = wm.compile_intent(op_name="pm.project.create", payload={"name": "A"}, source="s", actor=_ACTOR)
+        listed = wm.compile_intent(ops=[{"op": "pm.project.create", "payload": {"name": "A"}}], source="s", actor=_ACTOR)
+        assert single["items"][0]["content_hash"] == listed["items"][0]["content_hash"]
+
+
+class TestDedup:
+    def test_off_by_default(self, schema_registry):
+        wm = Workman(registry_root=schema_registry)
+        assert wm.dedup is None
+
+    def test_repeat_returns_cached_result(self, schema_registry):
+        wm = Workman(registry_root=schema_registry, dedup_ttl=60)
+        first = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR)
+        assert wm.compile_intent(ops=[dict(op) for op in _OPS], source="test", actor=_ACTOR) == first
+        assert wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR, ctx={"producer": "p"}) != first
+        assert wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR, include_diff=False) != first
+        assert wm.compile_intent(ops=_OPS, source="other", actor=_ACTOR) != first
+
+    @pytest.mark.parametrize("mutate_payloads", [True, False])
+    def test_results_are_not_shared(self, schema_registry, mutate_payloads):
+        wm = Workman(registry_root=schema_registry, dedup_ttl=60, mutate_payloads=mutate_payloads)
+        first = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR)
+        expected = json.loads(dumps(first))
+
+        first["items"][0]["plan"]["meta"]["note"] = "annotated"
+        second = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR)
+        assert second is not first
+        second["items"][0]["plan"]["ops"].clear()
+        third = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR)
+        assert json.loads(dumps(third)) == expected
+
+    def test_expiry(self, schema_registry):
+        wm = Workman(registry_root=schema_registry, dedup_ttl=60)
+        timer = FakeTimer()
+        wm.dedup = TTLCache(60, timer=timer)
+        first = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR)
+        timer.now = 61
+        again = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR)
+        assert again is not first
+        assert again["items"][0]["intent"]["intent_id"] != first["items"][0]["intent"]["intent_id"]
+
+    def test_failures_are_not_cached(self, schema_registry):
+        from workman.errors import ValidationError
+
+        wm = Workman(registry_root=schema_registry, dedup_ttl=60)
+        bad = [{"op": "pm.project.create", "payload": {"name": 1}}]
+        for _ in range(2):
+            with pytest.raises(ValidationError):
+                wm.compile_intent(ops=bad, source="test", actor=_ACTOR)
+        assert len(wm.dedup) == 0
+
+    def test_preview_is_not_cached(self, schema_registry):
+        wm = Workman(registry_root=schema_registry, dedup_ttl=60)
+        wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR, preview=True)
+        assert len(wm.dedup) == 0
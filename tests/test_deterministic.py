@@ -0,0 +1,78 @@
+"""Tests for deterministic compilation with injected ID and clock sources."""
+
+import json
+import re
+from datetime import datetime, timezone
+
+import pytest
+
+from workman.compiler import Workman
+from workman.ids import FixedClock, SeededUlids
+
+_ACTOR = {"actor_type": "human", "actor_id": "u_test"}
+CTX = {"correlation_id": "c1", "producer": "test"}
+CLOCK = FixedClock(datetime(2026, 1, 1, tzinfo=timezone.utc))
+
+
+def _wm(schema_registry):
+    return Workman(registry_root=schema_registry, clock=CLOCK, deterministic=True)
+
+
+class TestSeededUlids:
+    def test_same_seed_same_sequence(self):
+        a, b = SeededUlids("seed"), SeededUlids("seed")
+        assert [a() for _ in range(3)] == [b() for _ in range(3)]
+
+    def test_valid_ulid_strings(self):
+        source = SeededUlids(b"seed")
+        ids = {source() for _ in range(100)}
+        assert len(ids) == 100
+        assert all(re.match(r"^[0-9A-HJKMNP-TV-Z]{26}$", i) for i in ids)
+
+
+class TestDeterministicWorkman:
+    def test_requires_clock(self, schema_registry):
+        with pytest.raises(ValueError, match="clock"):
+            Workman(registry_root=schema_registry, deterministic=True)
+
+    def test_rejects_ulid_factory(self, schema_registry):
+        with pytest.raises(ValueError, match="ulid_factory"):
+            Workman(registry_root=schema_registry, clock=CLOCK, deterministic=True, ulid_factory=lambda: "0" * 26)
+
+    def test_compile_is_byte_identical(self, schema_registry):
+        wm = _wm(schema_registry)
+        plans = [wm.compile("pm.work_item.create", {"title": "T", "project_id": "proj_P"}, CTX) for _ in range(2)]
+        assert json.dumps(plans[0]) == json.dumps(plans[1])
+
+    def test_different_inputs_get_different_ids(self, schema_registry):
+        wm = _wm(schema_registry)
+        a = wm.compile("pm.project.create", {"name": "A"}, CTX)
+        b = wm.compile("pm.project.create", {"name": "B"}, CTX)
+        assert a["plan_id"] != b["plan_id"]
+        assert a["ops"][-1]["params"]["aggregate_id"] != b["ops"][-1]["params"]["aggregate_id"]
+
+    def test_separate_instances_agree(self, schema_registry):
+        a = _wm(schema_registry).execute({"op": "pm.project.create", "payload": {}, "ctx": CTX})
+        b = _wm(schema_registry).execute({"op": "pm.project.create", "payload": {}, "ctx": CTX})
+        assert a == b
+
+    def test_compile_intent_is_byte_identical(self, schema_registry):
+        wm = _wm(schema_registry)
+
+        def _run():
+            return wm.compile_intent(ops=[
+                {"op": "pm.project.create", "payload": {"name": "Alpha"}},
+                {"op": "pm.work_item.create", "payload": {"title": "Task", "project_id": "@ref:0"}},
+            ], source="test", actor=_ACTOR)
+
+        first, second = _run(), _run()
+        assert json.dumps(first, sort_keys=True) == json.dumps(second, sort_keys=True)
+        assert first["items"][0]["intent"]["issued_at"] == "2026-01-01T00:00:00+00:00"
+
+    def test_clock_change_changes_intent(self, schema_registry):
+        ops = [{"op": "pm.project.create", "payload": {"name": "Alpha"}}]
+        a = _wm(schema_registry).compile_intent(ops=ops, source="test", actor=_ACTOR)
+        later = Workman(registry_root=schema_registry, deterministic=True,
+                        clock=FixedClock(datetime(2026, 1, 2, tzinfo=timezone.utc)))
+        b = later.compile_intent(ops=ops, source="test", actor=_ACTOR)
+        assert a["items"][0]["intent"]["intent_id"] != b["items"][0]["intent"]["intent_id"]
@@ -419,3 +419,72 @@ class TestExecuteWorkItemMove:
         assert item["aggregate_id"] == "wi_TEST123"
         assert item["is_create"] is False
         assert item["fk_refs"] == [{"aggregate_type": "project", "aggregate_id": "proj_DEST"}]
+
+
+class TestExecuteBatch:
+    """Tests for the batch (items) form of execute()."""
+
+    CTX = {"correlation_id": "c1", "producer": "test"}
+
+    def test_processes_all_items(self):
+        result = execute({
+            "ctx": self.CTX,
+            "items": [
+                {"op": "pm.project.create", "payload": {}},
+                {"op": "pm.work_item.create", "payload": {"title": "T", "project_id": "proj_P"}},
+            ],
+        })
+        assert [i["event_type"] for i in result["items"]] == ["project.created", "work_item.created"]
+        assert result["stats"] == {"input": 2, "output": 2, "skipped": 0, "errors": 0}
+        assert result["errors"] == []
+
+    def test_continues_past_failures(self):
+        result = execute({
+            "ctx": self.CTX,
+            "items": [
+                {"op": "pm.bogus.op", "payload": {}},
+                {"op": "pm.project.create", "payload": {}},
+                {"op": "pm.artifact.create", "payload": {"name": "orphan"}},
+                {"op": "pm.project.close"},
+            ],
+        })
+        assert result["stats"] == {"input": 4, "output": 1, "skipped": 0, "errors": 3}
+        assert [(e["index"], e["error"]) for e in result["errors"]] == [
+            (0, "CompileError"), (2, "ValidationError"), (3, "CompileError"),
+        ]
+        assert "Unknown operation" in result["errors"][0]["message"]
+
+    def test_duplicate_idempotency_keys_are_skipped(self):
+        item = {"op": "pm.project.close", "payload": {"project_id": "proj_X"}}
+        result = execute({"ctx": self.CTX, "items": [item, dict(item), dict(item)]})
+        assert result["stats"] == {"input": 3, "output": 1, "skipped": 2, "errors": 0}
+
+    def test_item_ctx_overrides_default(self):
+        result = execute({
+            "ctx": self.CTX,
+            "items": [
+                {"op": "pm.project.close", "payload": {"project_id": "proj_X"}},
+                {"op": "pm.project.close", "payload": {"project_id": "proj_X"},
+                 "ctx": {"correlation_id": "c2", "producer": "test"}},
+            ],
+        })
+        keys = [i["idempotency_key"] for i in result["items"]]
+        assert keys == ["test:pm.project.close:project:proj_X:c1", "test:pm.project.close:project:proj_X:c2"]
+
+    def test_generated_ids_unique(self):
+        result = execute({"ctx": self.CTX, "items": [{"op": "pm.project.create", "payload": {}} for _ in range(20)]})
+        assert len({i["aggregate_id"] for i in result["items"]}) == 20
+
+    def test_malformed_items_fail_alone(self):
+        result = execute({
+            "ctx": self.CTX,
+            "items": [
+                {"op": "pm.project.create", "payload": "oops"},
+                {"op": ["x"], "payload": {}},
+                {"op": "pm.project.create", "payload": {}, "ctx": "x"},
+                {"op": "pm.project.create", "payload": {}},
+            ],
+        })
+        assert result["stats"] == {"input": 4, "output": 1, "skipped": 0, "errors": 3}
+        assert [e["index"] for e in result["errors"]] == [0, 1, 2]
+        assert result["items"][0]["aggregate_id"].startswith("proj_")
@@ -0,0 +1,145 @@
+"""Tests for plan hashing."""
+
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from workman.compiler import Workman
+from workman.hashing import (
+    PLAN_HASH_VERSION,
+    LeafCache,
+    MerkleTree,
+    PlanHasher,
+    _compute_plan_hash,
+    compute_plan_hash,
+    flat_plan_hash,
+    merkle_proof,
+    op_digest,
+    verify_op,
+)
+from workman.views import PayloadView
+
+_ACTOR = {"actor_type": "human", "actor_id": "u_test"}
+
+
+def _hash_incrementally(plan):
+    envelope = {key: value for key, value in plan.items() if key != "ops"}
+    envelope["ops"] = []
+    hasher = PlanHasher(envelope)
+    for op in plan["ops"]:
+        envelope["ops"].append(op)
+        hasher.update(op)
+    return hasher.hexdigest()
+
+
+class TestPlanHasher:
+    @pytest.mark.parametrize("ops", [
+        [],
+        [{"id": "w1", "params": {"payload": {"title": "Ünïcode ✓", "n": 1.5, "none": None}}}],
+        [{"id": "a1", "params": {"b": 1, "a": [1, 2]}}, {"id": "w1", "params": {"payload": PayloadView({"x": 1})}}],
+    ])
+    def test_matches_one_shot_hash(self, ops):
+        plan = {"plan_version": "storacle.plan/1.0.0", "plan_id": "ulid:X", "jsonrpc": "2.0",
+                "meta": {"source": "workman", "op": "pm.compile_intent", "correlation_id": "pmi_1"}, "ops": ops}
+        assert _hash_incrementally(plan) == compute_plan_hash(plan)
+        assert compute_plan_hash(plan) != _compute_plan_hash([plan])
+        assert compute_plan_hash(plan) != flat_plan_hash(plan)
+
+    def test_fields_set_after_the_ops(self):
+        plan = {"jsonrpc": "2.0", "ops": []}
+        hasher = PlanHasher(plan)
+        plan["ops"].append({"id": "w1"})
+        hasher.update({"id": "w1"})
+        plan["plan_id"] = "ulid:late"
+        assert hasher.hexdigest() == compute_plan_hash(plan)
+
+    @pytest.mark.parametrize("mutate_payloads", [True, False])
+    def test_compile_intent_hash(self, schema_registry, mutate_payloads):
+        wm = Workman(registry_root=schema_registry, mutate_payloads=mutate_payloads)
+        ops = [{"op": "pm.project.create", "payload": {"name": "P"}},
+               {"op": "pm.work_item.create", "payload": {"title": "T", "project_id": "@ref:0"}}]
+        item = wm.compile_intent(ops=ops, source="test", actor=_ACTOR)["items"][0]
+        assert item["plan_hash"] == compute_plan_hash(item["plan"])
+        assert item["plan_hash_version"] == PLAN_HASH_VERSION
+
+
+def _plan(n):
+    return {"plan_version": "storacle.plan/1.0.0", "plan_id": "ulid:X", "jsonrpc": "2.0",
+            "meta": {"source": "workman"}, "ops": [{"id": f"w{i}", "params": {"i": i}} for i in range(n)]}
+
+
+class TestMerkleTree:
+    @pytest.mark.parametrize("n", [1, 2, 3, 5, 8, 13])
+    def test_matches_rfc6962_shape(self, n):
+        import hashlib
+
+        def mth(leaves):
+            if len(leaves) == 1:
+                return leaves[0]
+            k = 1
+            while k * 2 < len(leaves):
+                k *= 2
+            return hashlib.sha256(b"\x01" + mth(leaves[:k]) + mth(leaves[k:])).digest()
+
+        leaves = [bytes([i]) * 32 for i in range(n)]
+        assert MerkleTree(leaves).root() == mth(leaves)
+
+    def test_edits_match_a_rebuild(self):
+        leaves = [bytes([i]) * 32 for i in range(7)]
+        tree = MerkleTree()
+        for leaf in leaves:
+            tree.append(leaf)
+        assert tree.root() == MerkleTree(leaves).root()
+
+        tree.set(3, b"x" * 32)
+        tree.insert(0, b"y" * 32)
+        tree.delete(5)
+        expected = [b"y" * 32] + leaves[:3] + [b"x" * 32] + leaves[5:]
+        assert tree.leaves == expected
+        assert tree.root() == MerkleTree(expected).root()
+
+
+class TestProofs:
+    @pytest.mark.parametrize("n", [1, 2, 6, 9])
+    def test_every_op_verifies(self, n):
+        plan = _plan(n)
+        plan_hash = compute_plan_hash(plan)
+        for index, op in enumerate(plan["ops"]):
+            assert verify_op(plan_hash, op, merkle_proof(plan, index))
+
+    def test_tampering_is_detected(self):
+        plan = _plan(5)
+        plan_hash = compute_plan_hash(plan)
+        proof = merkle_proof(plan, 2)
+        assert not verify_op(plan_hash, {"id": "w2", "params": {"i": 99}}, proof)
+        assert not verify_op(plan_hash, plan["ops"][3], proof)
+        assert not verify_op(plan_hash, plan["ops"][2], {**proof, "envelope": "00" * 32})
+        assert not verify_op(plan_hash, plan["ops"][2], {**proof, "version": "flat"})
+
+    def test_changing_one_op_changes_only_its_leaf(self):
+        plan = _plan(4)
+        hasher = PlanHasher(plan)
+        for op in plan["ops"]:
+            hasher.update(op)
+        before = hasher.op_hashes()
+        hasher.tree.set(1, op_digest({"id": "w1", "params": {"i": -1}}))
+        after = hasher.op_hashes()
+        assert [a == b for a, b in zip(before, after)] == [True, False, True, True]
+        assert len(hasher.hexdigest()) == 64
+
+
+class TestLeafCache:
+    def test_bounded_under_concurrent_use(self):
+        cache = LeafCache(maxsize=4)
+        tree = MerkleTree([op_digest({"i": 0})])
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda i: cache.remember(f"h{i}", tree), range(500)))
+        assert len(cache) == 4
+        assert sum(cache.get(f"h{i}") == tree.leaves for i in range(500)) == 4
+
+    def test_pickle_drops_entries(self):
+        cache = LeafCache(maxsize=8)
+        cache.remember("h", MerkleTree([op_digest({"i": 0})]))
+        restored = pickle.loads(pickle.dumps(cache))
+        assert restored.maxsize == 8 and len(restored) == 0
@@ -0,0 +1,73 @@
+"""Tests for memory-mapped, byte-range-sharded JSONL ingestion."""
+
+import json
+
+import pytest
+
+from workman.compiler import Workman
+from workman.ingest import ingest_file, split_ranges
+
+CTX = {"correlation_id": "c1", "producer": "test"}
+
+
+def _write_input(path, n, bad_every=0):
+    lines = []
+    for i in range(n):
+        if bad_every and i % bad_every == 0:
+            lines.append(json.dumps({"op": "pm.bogus", "payload": {}}))
+        else:
+            lines.append(json.dumps({"op": "pm.project.create", "payload": {"project_id": f"proj_{i}"}, "ctx": CTX}))
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+class TestSplitRanges:
+    def test_ranges_are_newline_aligned_and_cover_input(self):
+        buf = b"".join(b"line %d\n" % i for i in range(100))
+        ranges = split_ranges(buf, 7)
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(buf)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start and buf[end - 1:end] == b"\n"
+
+    def test_more_shards_than_lines(self):
+        assert split_ranges(b"a\nb\n", 10) == [(0, 2), (2, 4)]
+
+    def test_missing_trailing_newline(self):
+        assert split_ranges(b"aa\nb\ncc", 2) == [(0, 5), (5, 7)]
+
+
+class TestIngestFile:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_shards_index_and_manifest(self, tmp_path, schema_registry, workers):
+        src = _write_input(tmp_path / "in.jsonl", 50, bad_every=10)
+        data = src.read_bytes()
+        out_dir = tmp_path / "out"
+
+        results = ingest_file(src, out_dir, workers=workers, shards=4, workman=Workman(registry_root=schema_registry))
+
+        assert sum(r.lines for r in results) == 45
+        assert sum(r.errors for r in results) == 5
+        manifest = json.loads((out_dir / "index.json").read_text())
+        assert [s["shard"] for s in manifest["shards"]] == list(range(len(results)))
+
+        seen = []
+        for r in results:
+            shard = (out_dir / r.output).read_bytes()
+            errors = (out_dir / r.output.replace(".jsonl", ".errors.jsonl")).read_bytes()
+            for entry in (out_dir / r.output.replace(".jsonl", ".index")).read_text().splitlines():
+                offset, kind, out_offset = entry.split()
+                offset, out_offset = int(offset), int(out_offset)
+                request = json.loads(data[offset:data.index(b"\n", offset)])
+                target = shard if kind == "o" else errors
+                result = json.loads(target[out_offset:target.index(b"\n", out_offset)])
+                if kind == "o":
+                    assert result["ops"][-1]["params"]["aggregate_id"] == request["payload"]["project_id"]
+                else:
+                    assert result["offset"] == offset and request["op"] == "pm.bogus"
+                seen.append(offset)
+        assert len(seen) == 50
+
+    def test_empty_input(self, tmp_path):
+        src = tmp_path / "empty.jsonl"
+        src.write_bytes(b"")
+        assert ingest_file(src, tmp_path / "out", workers=1) == []
@@ -1,11 +1,17 @@
 """Tests for PMIntent compilation (compile_intent)."""
 
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
 
 import pytest
 
-from workman.errors import CompileError
-from workman.intent import compile_intent
+from workman.compiler import Workman
+from workman.errors import CompileError, ValidationError
+from workman.execute import execute
+from workman.ids import FixedClock
+from workman.hashing import compute_plan_hash
+from workman.intent import _EntityIndex, chain_plan_hash, compile_intent, compile_intent_stream, intent_diff
 
 
 _ACTOR = {"actor_type": "human", "actor_id": "u_test"}
@@ -107,6 +113,35 @@ class TestCompileIntentDiff:
         assert "CREATE" in diff[0]
         assert "CREATE" in diff[1]
 
+    def test_large_values_are_bounded(self):
+        labels = [f"label-{i}" for i in range(5000)]
+        meta = {f"k{i}": list(range(100)) for i in range(500)}
+        result = _compile(op_name="pm.work_item.create",
+                          payload={"title": "x" * 500, "labels": labels, "meta": meta, "project_id": "proj_X"})
+        line = result["items"][0]["diff"][0]
+        assert len(line) < 400
+        assert "title='" + "x" * 47 + "...'" in line
+        assert "labels=['label-0', 'label-1', 'label-2', 'label-3', ...]" in line
+        assert "project_id='proj_X'" in line
+
+    def test_field_cap(self):
+        payload = {"title": "T", **{f"f{i}": i for i in range(10)}}
+        result = _compile(op_name="pm.work_item.create", payload=payload)
+        assert result["items"][0]["diff"][0].count("=") == 6
+
+    def test_include_diff_false(self, schema_registry):
+        ops = [
+            {"op": "pm.project.create", "payload": {"name": "Alpha"}},
+            {"op": "pm.work_item.create", "payload": {"title": "T", "project_id": "@ref:0", "labels": ["a"] * 50}},
+        ]
+        clock = FixedClock(datetime(2024, 1, 1, tzinfo=timezone.utc))
+        wm = Workman(registry_root=schema_registry, deterministic=True, clock=clock)
+        full = wm.compile_intent(ops=ops, source="test", actor=_ACTOR)["items"][0]
+        bare = wm.compile_intent(ops=ops, source="test", actor=_ACTOR, include_diff=False)["items"][0]
+        assert "diff" not in bare
+        assert bare["plan_hash"] == full["plan_hash"]
+        assert intent_diff(bare, workman=wm) == full["diff"]
+
 
 class TestCompileIntentEnvelopeGeneration:
     def test_intent_returned_in_result(self):
@@ -355,6 +390,23 @@ class TestCompileIntentValidation:
         with pytest.raises(CompileError, match="Unknown operation"):
             _compile(op_name="pm.bogus.create", payload={"name": "A"})
 
+    @pytest.mark.parametrize("mutate_payloads", [True, False])
+    def test_op_payload_not_dict_raises(self, schema_registry, mutate_payloads):
+        wm = Workman(registry_root=schema_registry, mutate_payloads=mutate_payloads)
+        ops = [{"op": "pm.project.create", "payload": {"name": "A"}}, {"op": "pm.project.create", "payload": "x"}]
+        with pytest.raises(CompileError, match=r"ops\[1\] payload must be an object"):
+            wm.compile_intent(ops=ops, source="test", actor=_ACTOR)
+        with pytest.raises(CompileError, match="Op 1 payload must be a dict"):
+            list(wm.compile_intent_stream(ops=ops, source="test", actor=_ACTOR))
+
+    @pytest.mark.parametrize("entry", ["pm.project.create", ["x"], None])
+    def test_op_entry_not_dict_raises(self, entry):
+        ops = [{"op": "pm.project.create", "payload": {"name": "A"}}, entry]
+        with pytest.raises(CompileError, match=r"ops\[1\] must be an object"):
+            _compile(ops=ops)
+        with pytest.raises(CompileError, match=r"ops\[1\] must be an object"):
+            _compile(ops=ops, preview=True)
+
     def test_both_op_name_and_ops_raises(self):
         with pytest.raises(CompileError, match="not both"):
             _compile(
@@ -375,3 +427,228 @@ class TestCompileIntentValidation:
         ops = [{"op": "pm.project.create", "payload": {"name": f"P{i}"}} for i in range(101)]
         with pytest.raises(CompileError, match="100"):
             _compile(ops=ops)
+
+    def test_max_ops_per_call(self):
+        ops = [{"op": "pm.project.create", "payload": {"name": f"P{i}"}} for i in range(101)]
+        assert len(_compile(ops=ops, max_ops=200)["items"][0]["diff"]) == 101
+        with pytest.raises(CompileError, match="maximum of 2 ops"):
+            _compile(ops=ops[:3], max_ops=2)
+
+
+class TestCompileIntentLarge:
+    def test_unlimited_compiler_compiles_large_intents(self, schema_registry):
+        wm = Workman(registry_root=schema_registry, max_intent_ops=None)
+        ops = [{"op": "pm.project.create", "payload": {"name": "P"}}]
+        for i in range(5000):
+            ops.append({"op": "pm.deliverable.create", "payload": {"name": f"D{i}", "project_id": "@ref:0"}})
+            ops.append({"op": "pm.work_item.create",
+                        "payload": {"title": f"T{i}", "deliverable_id": f"@ref:{len(ops) - 1}"}})
+        result = wm.compile_intent(ops=ops, source="import", actor=_ACTOR)["items"][0]
+        project_id = result["plan"]["ops"][0]["params"]["aggregate_id"]
+        writes = [op["params"] for op in result["plan"]["ops"] if op["method"] == "wal.append"]
+        assert len(writes) == 10001
+        assert writes[-1]["payload"]["project_id"] == project_id
+
+    def test_execute_passes_max_ops(self):
+        ops = [{"op": "pm.project.create", "payload": {"name": f"P{i}"}} for i in range(3)]
+        with pytest.raises(CompileError, match="maximum of 2 ops"):
+            execute({"op": "pm.compile_intent", "ops": ops, "source": "test", "actor": _ACTOR, "max_ops": 2})
+
+
+class TestEntityIndex:
+    def test_first_payload_and_latest_containers(self):
+        index = _EntityIndex()
+        index.add("wi_1", {"title": "T", "project_id": "proj_A"})
+        index.add("wi_1", {"deliverable_id": "del_D", "project_id": "proj_B"})
+        assert index.parent_field("wi_1", "project_id") == (True, "proj_A")
+        assert index.parent_field("wi_1", "opsstream_id") == (True, None)
+        assert index.parent_field("wi_2", "project_id") == (False, None)
+        assert index.entity_field("wi_1", "project_id") == "proj_B"
+        assert index.entity_field("wi_1", "deliverable_id") == "del_D"
+        assert index.entity_field("wi_2", "deliverable_id") is None
+
+
+class TestCompileIntentStream:
+    def _ops(self, n_items):
+        ops = [{"op": "pm.project.create", "payload": {"name": "P"}},
+               {"op": "pm.deliverable.create", "payload": {"name": "D", "project_id": "@ref:0"}}]
+        ops += [{"op": "pm.work_item.create", "payload": {"title": f"T{i}", "deliverable_id": "@ref:1"}}
+                for i in range(n_items)]
+        return ops
+
+    def test_chunks_carry_refs_and_inheritance(self):
+        results = list(compile_intent_stream(ops=self._ops(8), source="test", actor=_ACTOR, chunk_size=4))
+        items = [r["items"][0] for r in results]
+
+        assert [(i["chunk"]["start"], i["chunk"]["end"], i["chunk"]["last"]) for i in items] == [
+            (0, 4, False), (4, 8, False), (8, 10, True)]
+        assert len({i["intent"]["intent_id"] for i in items}) == 1
+        project_id = items[0]["plan"]["ops"][0]["params"]["aggregate_id"]
+        last_write = items[-1]["plan"]["ops"][-1]
+        assert last_write["params"]["payload"]["project_id"] == project_id
+        assert items[-1]["plan"]["ops"][0]["id"] == "a1"  # each chunk numbers its own plan
+        assert sum(len(i["diff"]) for i in items) == 10
+
+    def test_hash_chain(self):
+        results = list(compile_intent_stream(ops=self._ops(5), source="test", actor=_ACTOR, chunk_size=3))
+        prev = None
+        for result in results:
+            item = result["items"][0]
+            assert item["chunk"]["prev_hash"] == prev
+            assert item["plan_hash"] == chain_plan_hash(prev, item["plan"])
+            assert len(item["plan_hash"]) == 64
+            prev = item["plan_hash"]
+
+    def test_single_chunk_hash_matches_compile_intent_scheme(self):
+        [result] = compile_intent_stream(ops=self._ops(1), source="test", actor=_ACTOR)
+        item = result["items"][0]
+        assert item["chunk"] == {"index": 0, "start": 0, "end": 3, "last": True, "prev_hash": None}
+        assert item["plan_hash"] == compute_plan_hash(item["plan"])
+
+    def test_ops_are_consumed_lazily(self):
+        consumed = []
+
+        def ops():
+            for op in self._ops(98):
+                consumed.append(op)
+                yield op
+
+        stream = compile_intent_stream(ops=ops(), source="test", actor=_ACTOR, chunk_size=10)
+        next(stream)
+        assert len(consumed) == 20  # the first chunk plus one chunk of lookahead
+
+    def test_errors(self):
+        with pytest.raises(CompileError, match="non-empty"):
+            list(compile_intent_stream(ops=iter([]), source="test", actor=_ACTOR))
+        with pytest.raises(CompileError, match="actor"):
+            list(compile_intent_stream(ops=self._ops(1), source="test", actor={}))
+        with pytest.raises(CompileError, match="Forward reference"):
+            list(compile_intent_stream(ops=[{"op": "pm.project.update", "payload": {"project_id": "@ref:3"}}],
+                                       source="test", actor=_ACTOR))
+
+    def test_deterministic(self, schema_registry):
+        clock = FixedClock(datetime(2024, 1, 1, tzinfo=timezone.utc))
+        wm = Workman(registry_root=schema_registry, deterministic=True, clock=clock)
+
+        def run():
+            return list(wm.compile_intent_stream(ops=self._ops(6), source="test", actor=_ACTOR, chunk_size=3))
+
+        assert run() == run()
+
+
+class TestCompileIntentExecutor:
+    _OPS = [
+        {"op": "pm.project.create", "payload": {"name": "Alpha"}},
+        {"op": "pm.deliverable.create", "payload": {"name": "Del", "project_id": "@ref:0"}},
+        {"op": "pm.work_item.create", "payload": {"title": "Task", "deliverable_id": "@ref:1"}},
+        {"op": "pm.work_item.create", "payload": {"title": "Other", "project_id": "@ref:0"}},
+        {"op": "pm.opsstream.create", "payload": {"name": "Ops"}},
+    ]
+
+    @pytest.fixture(autouse=True)
+    def four_chunks(self, monkeypatch):
+        monkeypatch.setattr("workman.intent.os.cpu_count", lambda: 4)
+
+    def _wm(self, schema_registry, **kwargs):
+        clock = FixedClock(datetime(2024, 1, 1, tzinfo=timezone.utc))
+        return Workman(registry_root=schema_registry, deterministic=True, clock=clock, **kwargs)
+
+    @pytest.mark.parametrize("mutate_payloads", [True, False])
+    def test_thread_pool_matches_sequential(self, schema_registry, mutate_payloads):
+        wm = self._wm(schema_registry, mutate_payloads=mutate_payloads)
+        expected = wm.compile_intent(ops=self._OPS, source="test", actor=_ACTOR)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            result = wm.compile_intent(ops=self._OPS, source="test", actor=_ACTOR, executor=executor)
+        assert result["items"][0]["plan_hash"] == expected["items"][0]["plan_hash"]
+        assert result["items"][0]["diff"] == expected["items"][0]["diff"]
+
+    @pytest.mark.parametrize("mutate_payloads", [True, False])
+    def test_process_pool_matches_sequential(self, schema_registry, mutate_payloads):
+        wm = self._wm(schema_registry, mutate_payloads=mutate_payloads)
+        expected = wm.compile_intent(ops=self._OPS, source="test", actor=_ACTOR)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            result = wm.compile_intent(ops=self._OPS, source="test", actor=_ACTOR, executor=executor)
+            assert result["items"][0]["plan_hash"] == expected["items"][0]["plan_hash"]
+
+            ops = [*self._OPS[:3], {"op": "pm.work_item.create", "payload": {"title": 3}}]
+            with pytest.raises(ValidationError, match="3 is not of type 'string'"):
+                wm.compile_intent(ops=ops, source="test", actor=_ACTOR, executor=executor)
+
+    def test_malformed_aggregate_id_is_a_validation_error(self, schema_registry):
+        wm = self._wm(schema_registry)
+        ops = [{"op": "pm.project.create", "payload": {"name": "a", "project_id": ["x"]}}, *self._OPS[1:]]
+        with pytest.raises(ValidationError, match=r"\['x'\] is not of type 'string'"):
+            wm.compile_intent(ops=ops, source="test", actor=_ACTOR)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with pytest.raises(ValidationError, match=r"\['x'\] is not of type 'string'"):
+                wm.compile_intent(ops=ops, source="test", actor=_ACTOR, executor=executor)
+
+    def test_lowest_index_error_wins(self, schema_registry):
+        wm = self._wm(schema_registry)
+        ops = list(self._OPS)
+        ops[1] = {"op": "pm.deliverable.create", "payload": {"name": 1, "project_id": "@ref:0"}}
+        ops[4] = {"op": "pm.opsstream.create", "payload": {"name": 4}}
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            with pytest.raises(ValidationError, match="^Payload validation failed: 1 is not"):
+                wm.compile_intent(ops=ops, source="test", actor=_ACTOR, executor=executor)
+
+            # A validation error before a resolution error is raised first
+            ops[2] = {"op": "pm.work_item.create", "payload": {"title": "T", "project_id": "@ref:9"}}
+            with pytest.raises(ValidationError, match="1 is not"):
+                wm.compile_intent(ops=ops, source="test", actor=_ACTOR, executor=executor)
+            ops[1] = self._OPS[1]
+            with pytest.raises(CompileError, match="Forward reference"):
+                wm.compile_intent(ops=ops, source="test", actor=_ACTOR, executor=executor)
+
+
+class TestCompileIntentPreview:
+    _OPS = [
+        {"op": "pm.project.create", "payload": {"name": "Alpha"}},
+        {"op": "pm.deliverable.create", "payload": {"name": "Del", "project_id": "@ref:0"}},
+        {"op": "pm.work_item.create", "payload": {"title": "Task", "deliverable_id": "@ref:1"}},
+        {"op": "pm.project.update", "payload": {"project_id": "proj_EXISTING", "name": "Renamed"}},
+    ]
+
+    def _wm(self, schema_registry):
+        def no_ulids():
+            raise AssertionError("preview drew a ULID")
+
+        return Workman(registry_root=schema_registry, ulid_factory=no_ulids)
+
+    def test_preview(self, schema_registry):
+        item = self._wm(schema_registry).compile_intent(ops=self._OPS, source="test", actor=_ACTOR, preview=True)["items"][0]
+        assert item["preview"] is True
+        assert "plan" not in item and "plan_hash" not in item
+        assert item["ids"] == [
+            "proj_00000000000000000000000000",
+            "del_00000000000000000000000001",
+            "wi_00000000000000000000000002",
+            "proj_EXISTING",
+        ]
+        assert item["intent"]["intent_id"] == "pmi_00000000000000000000000000"
+        assert "project_id='proj_00000000000000000000000000'" in item["diff"][2]  # inherited via the deliverable
+
+    def test_diff_matches_full_compile(self, schema_registry):
+        full = _compile(ops=self._OPS)["items"][0]
+        preview = self._wm(schema_registry).compile_intent(ops=self._OPS, source="test", actor=_ACTOR, preview=True)["items"][0]
+        wal_ids = [op["params"]["aggregate_id"] for op in full["plan"]["ops"] if op["method"] == "wal.append"]
+        expected = full["diff"]
+        for real, provisional in zip(wal_ids, preview["ids"]):
+            expected = [line.replace(real, provisional) for line in expected]
+        assert preview["diff"] == expected
+
+    def test_preview_validates(self, schema_registry):
+        wm = self._wm(schema_registry)
+        with pytest.raises(ValidationError):
+            wm.compile_intent(ops=[{"op": "pm.project.create", "payload": {"name": 1}}],
+                              source="test", actor=_ACTOR, preview=True)
+        with pytest.raises(CompileError, match="Forward reference"):
+            wm.compile_intent(ops=[{"op": "pm.project.update", "payload": {"project_id": "@ref:0"}}],
+                              source="test", actor=_ACTOR, preview=True)
+
+    def test_preview_on_deterministic_compiler(self, schema_registry):
+        clock = FixedClock(datetime(2024, 1, 1, tzinfo=timezone.utc))
+        wm = Workman(registry_root=schema_registry, deterministic=True, clock=clock)
+        item = wm.compile_intent(ops=self._OPS, source="test", actor=_ACTOR, preview=True)["items"][0]
+        assert item["intent"]["issued_at"] == "2024-01-01T00:00:00+00:00"
+        assert item["ids"][0] == "proj_00000000000000000000000000"
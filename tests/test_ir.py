@@ -0,0 +1,40 @@
+"""Tests for the compiled-op IR and its renderers."""
+
+from workman.compiler import Workman
+from workman.ir import render_event_item, render_op_plan
+
+CTX = {"correlation_id": "c1", "producer": "test"}
+
+
+class TestAnalyze:
+    def test_one_analysis_renders_plan_and_event_item(self, schema_registry):
+        wm = Workman(registry_root=schema_registry)
+        cop = wm.analyze("pm.work_item.create", {"title": "T", "project_id": "proj_P"}, CTX)
+
+        plan = render_op_plan(wm, cop)
+        item = render_event_item(cop)
+
+        wal = plan["ops"][-1]
+        assert wal["params"]["aggregate_id"] == item["aggregate_id"] == cop.aggregate_id
+        assert wal["params"]["idempotency_key"] == item["idempotency_key"]
+        assert [op["method"] for op in plan["ops"]] == ["assert.exists", "wal.append"]
+        assert item["fk_refs"] == [{"aggregate_type": "project", "aggregate_id": "proj_P"}]
+
+    def test_matches_compile_and_execute(self, schema_registry):
+        wm = Workman(registry_root=schema_registry)
+        payload = {"link_id": "lnk_1", "source_id": "proj_A", "source_type": "project",
+                   "target_id": "wi_B", "target_type": "work_item"}
+
+        cop = wm.analyze("link.create", dict(payload), CTX)
+        plan = wm.compile("link.create", dict(payload), CTX)
+        result = wm.execute({"op": "link.create", "payload": dict(payload), "ctx": CTX})
+
+        assert render_op_plan(wm, cop)["ops"] == plan["ops"]
+        assert render_event_item(cop) == result["items"][0]
+
+    def test_dynamic_fks_assert_only_in_plan(self, schema_registry):
+        wm = Workman(registry_root=schema_registry)
+        cop = wm.analyze("link.create", {"source_id": "proj_A", "source_type": "project",
+                                         "target_id": "wi_B", "target_type": "work_item"}, CTX)
+        assert cop.dynamic_fk_refs == (("project", "proj_A"), ("work_item", "wi_B"))
+        assert render_event_item(cop)["fk_refs"] == []
@@ -0,0 +1,63 @@
+"""Tests for the process-pool parallel compile engine."""
+
+import pytest
+
+from workman.compiler import Workman
+from workman.errors import CompileError, ValidationError
+from workman.parallel import ParallelCompiler
+
+_ACTOR = {"actor_type": "human", "actor_id": "u_test"}
+CTX = {"correlation_id": "c1", "producer": "test"}
+
+
+@pytest.fixture
+def pool(schema_registry):
+    with ParallelCompiler(Workman(registry_root=schema_registry), max_workers=2, chunksize=3) as pool:
+        yield pool
+
+
+def _items(n):
+    return [("pm.project.create", {"project_id": f"proj_{i}", "name": f"P{i}"}, CTX) for i in range(n)]
+
+
+class TestParallelCompiler:
+    def test_ordered_compile(self, pool):
+        plans = list(pool.compile(_items(20)))
+        assert [p["ops"][-1]["params"]["aggregate_id"] for p in plans] == [f"proj_{i}" for i in range(20)]
+
+    def test_unordered_compile_covers_every_index(self, pool):
+        results = dict(pool.compile(_items(20), ordered=False))
+        assert sorted(results) == list(range(20))
+        assert results[7]["ops"][-1]["params"]["aggregate_id"] == "proj_7"
+
+    def test_errors_raise_or_return(self, pool):
+        items = _items(2) + [("pm.bogus", {}, CTX)]
+        with pytest.raises(CompileError, match="Unknown operation") as exc_info:
+            list(pool.compile(items))
+        assert exc_info.value.op == "pm.bogus"
+
+        results = list(pool.compile(items, return_errors=True))
+        assert isinstance(results[2], CompileError)
+
+    def test_validation_errors_cross_processes(self, pool):
+        items = _items(2) + [("pm.project.create", {"name": 5}, CTX)]
+        with pytest.raises(ValidationError, match="is not of type 'string'") as exc_info:
+            list(pool.compile(items))
+        assert exc_info.value.errors and all(isinstance(e, str) for e in exc_info.value.errors)
+
+        results = list(pool.compile(items, return_errors=True))
+        assert [type(r) for r in results[2:]] == [ValidationError]
+        assert results[1]["ops"][-1]["params"]["aggregate_id"] == "proj_1"
+
+    def test_execute_and_compile_intent(self, pool):
+        items = list(pool.execute([{"op": "pm.project.create", "payload": {}, "ctx": CTX}] * 4))
+        assert all(r["items"][0]["event_type"] == "project.created" for r in items)
+
+        intents = list(pool.compile_intent([
+            {"ops": [{"op": "pm.project.create", "payload": {"name": "A"}}], "source": "test", "actor": _ACTOR},
+        ] * 3))
+        assert len({r["items"][0]["intent"]["intent_id"] for r in intents}) == 3
+
+    def test_unknown_kind(self, pool):
+        with pytest.raises(ValueError):
+            list(pool.map("bogus", []))
@@ -0,0 +1,90 @@
+"""Tests for aggregate-partitioned, order-preserving compilation."""
+
+import json
+
+import pytest
+
+from workman.compiler import Workman
+from workman.partition import partition_file, partition_key, partition_of
+
+CTX = {"correlation_id": "c1", "producer": "test"}
+
+
+def _write_input(path, rows):
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    return path
+
+
+def _work_item_rows(n):
+    rows = []
+    for i in range(n):
+        rows.append({"op": "pm.work_item.create",
+                     "payload": {"work_item_id": f"wi_{i}", "title": "T", "project_id": "proj_P"}, "ctx": CTX})
+    for i in range(n):
+        rows.append({"op": "pm.work_item.update", "payload": {"work_item_id": f"wi_{i}", "title": "U"}, "ctx": CTX})
+    return rows
+
+
+class TestPartitionKey:
+    def test_plan_mode_uses_id_field(self):
+        wm = Workman()
+        request = {"op": "pm.work_item.update", "payload": {"work_item_id": "wi_1"}}
+        assert partition_key(wm, "plan", request) == "work_item:wi_1"
+        assert partition_key(wm, "execute", request) == "work_item:wi_1"
+
+    def test_generated_ids_and_junk_have_no_key(self):
+        wm = Workman()
+        assert partition_key(wm, "plan", {"op": "pm.project.create", "payload": {"name": "A"}}) is None
+        assert partition_key(wm, "plan", {"op": "pm.bogus", "payload": {"x_id": "1"}}) is None
+        assert partition_key(wm, "plan", [1, 2]) is None
+
+    def test_batches_and_intents_use_first_keyed_op(self):
+        wm = Workman()
+        ops = [{"op": "pm.project.create", "payload": {}},
+               {"op": "pm.project.update", "payload": {"project_id": "proj_A"}}]
+        assert partition_key(wm, "execute", {"items": ops}) == "project:proj_A"
+        assert partition_key(wm, "intent", {"ops": ops}) == "project:proj_A"
+
+    def test_partition_of_is_stable(self):
+        assert partition_of("work_item:wi_1", 8) == partition_of("work_item:wi_1", 8)
+        assert {partition_of(f"k{i}", 4) for i in range(100)} == {0, 1, 2, 3}
+
+
+class TestPartitionFile:
+    @pytest.mark.parametrize("partitions", [1, 3])
+    def test_aggregate_order_is_preserved(self, tmp_path, schema_registry, partitions):
+        src = _write_input(tmp_path / "in.jsonl", _work_item_rows(20))
+        out_dir = tmp_path / "out"
+
+        results = partition_file(src, out_dir, partitions=partitions, chunksize=4,
+                                 workman=Workman(registry_root=schema_registry))
+
+        assert sum(r.lines for r in results) == 40
+        seen = {}
+        for r in results:
+            for line in (out_dir / r.output).read_text().splitlines():
+                write = json.loads(line)["ops"][-1]["params"]
+                seen.setdefault(write["aggregate_id"], []).append((write["event_type"], r.partition))
+        assert len(seen) == 20
+        for events in seen.values():
+            assert [event for event, _ in events] == ["work_item.created", "work_item.updated"]
+            assert len({partition for _, partition in events}) == 1
+
+        manifest = json.loads((out_dir / "index.json").read_text())
+        assert len(manifest["partitions"]) == partitions
+
+    def test_errors_and_index(self, tmp_path, schema_registry):
+        rows = [{"op": "pm.project.create", "payload": {}, "ctx": CTX}, {"op": "pm.bogus", "payload": {}}]
+        src = _write_input(tmp_path / "in.jsonl", rows)
+        with open(src, "ab") as f:
+            f.write(b"not json\n")
+        out_dir = tmp_path / "out"
+
+        results = partition_file(src, out_dir, partitions=1, workman=Workman(registry_root=schema_registry))
+
+        assert (results[0].lines, results[0].errors) == (1, 2)
+        data = src.read_bytes()
+        entries = [entry.split() for entry in (out_dir / "part-00000.index").read_text().splitlines()]
+        assert [kind for _, kind, _ in entries] == ["o", "e", "e"]
+        errors = [json.loads(line) for line in (out_dir / "part-00000.errors.jsonl").read_text().splitlines()]
+        assert data[errors[1]["offset"]:].startswith(b"not json")
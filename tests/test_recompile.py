@@ -0,0 +1,186 @@
+"""Tests for incremental recompilation of edited intents (recompile_intent)."""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from workman import compile_intent, recompile_intent
+from workman.compiler import Workman
+from workman.errors import CompileError
+from workman.hashing import compute_plan_hash
+from workman.ids import FixedClock
+
+_ACTOR = {"actor_type": "human", "actor_id": "u_test"}
+
+_OPS = [
+    {"op": "pm.project.create", "payload": {"name": "Alpha"}},
+    {"op": "pm.deliverable.create", "payload": {"name": "Del", "project_id": "@ref:0"}},
+    {"op": "pm.work_item.create", "payload": {"title": "Task", "deliverable_id": "@ref:1"}},
+    {"op": "pm.opsstream.create", "payload": {"name": "Ops"}},
+]
+
+
+@pytest.fixture
+def wm(schema_registry):
+    return Workman(registry_root=schema_registry, clock=FixedClock(datetime(2026, 1, 1, tzinfo=timezone.utc)))
+
+
+def _normalized(item):
+    """Plan ops and diff with aggregate IDs and the intent ID replaced by placeholders."""
+    plan_ops = item["plan"]["ops"]
+    ids = [op["params"]["aggregate_id"] for op in plan_ops if op["method"] == "wal.append"]
+    text = json.dumps({"ops": plan_ops, "diff": item["diff"]}, sort_keys=True)
+    for k, aggregate_id in enumerate([item["intent"]["intent_id"], *ids]):
+        text = text.replace(aggregate_id, f"<{k}>")
+    return text
+
+
+def _check(wm, result):
+    item = result["items"][0]
+    assert item["plan_hash"] == compute_plan_hash(item["plan"])
+    fresh = wm.compile_intent(ops=item["intent"]["ops"], source="test", actor=_ACTOR)["items"][0]
+    assert _normalized(item) == _normalized(fresh)
+    return item
+
+
+def _wal_ids(item):
+    return [op["params"]["aggregate_id"] for op in item["plan"]["ops"] if op["method"] == "wal.append"]
+
+
+class TestRecompileIntent:
+    def test_replace_independent_op(self, wm):
+        previous = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR)
+        edit = {"action": "replace", "index": 3, "op": {"op": "pm.opsstream.create", "payload": {"name": "Ops 2"}}}
+        item = _check(wm, wm.recompile_intent(previous, edit))
+        old = previous["items"][0]
+        assert item["recompiled"] == [3]
+        assert _wal_ids(item) == _wal_ids(old)
+        assert item["plan"]["ops"][:-1] == old["plan"]["ops"][:-1]
+        assert item["diff"][:3] == old["diff"][:3]
+        assert "Ops 2" in item["diff"][3]
+        assert item["intent"]["intent_id"] == old["intent"]["intent_id"]
+        assert item["plan_hash"] != old["plan_hash"]
+
+    def test_replace_follows_refs_and_inheritance(self, wm):
+        previous = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR)
+        edit = {"action": "replace", "index": 0, "op": {"op": "pm.project.create", "payload": {"name": "Beta"}}}
+        item = _check(wm, wm.recompile_intent(previous, edit))
+        assert item["recompiled"] == [0, 1, 2]
+        assert _wal_ids(item) == _wal_ids(previous["items"][0])
+
+    def test_replace_with_other_kind_gets_new_id(self, wm):
+        previous = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR)
+        edit = {"action": "replace", "index": 3, "op": {"op": "pm.project.create", "payload": {"name": "P2"}}}
+        item = _check(wm, wm.recompile_intent(previous, edit))
+        assert _wal_ids(item)[3] != _wal_ids(previous["items"][0])[3]
+
+    def test_insert_shifts_refs(self, wm):
+        previous = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR)
+        edit = {"action": "insert", "index": 0, "op": {"op": "pm.opsstream.create", "payload": {"name": "First"}}}
+        item = _check(wm, wm.recompile_intent(previous, edit))
+        assert item["recompiled"] == [0]
+        assert item["intent"]["ops"][2]["payload"]["project_id"] == "@ref:1"
+        assert item["intent"]["ops"][3]["payload"]["deliverable_id"] == "@ref:2"
+        assert _OPS[1]["payload"]["project_id"] == "@ref:0"  # caller's ops untouched
+
+    def test_insert_at_end(self, wm):
+        previous = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR)
+        new_op = {"op": "pm.work_item.create", "payload": {"title": "More", "deliverable_id": "@ref:1"}}
+        item = _check(wm, wm.recompile_intent(previous, {"action": "insert", "index": 4, "op": new_op}))
+        assert item["recompiled"] == [4]
+
+    def test_delete(self, wm):
+        previous = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR)
+        item = _check(wm, wm.recompile_intent(previous, {"action": "delete", "index": 3}))
+        assert item["recompiled"] == []
+        assert len(item["intent"]["ops"]) == 3
+
+    def test_delete_referenced_op_raises(self, wm):
+        previous = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR)
+        with pytest.raises(CompileError, match="references deleted op @ref:1"):
+            wm.recompile_intent(previous, {"action": "delete", "index": 1})
+
+    def test_literal_id_dependency(self, wm):
+        ops = [
+            {"op": "pm.opsstream.create", "payload": {"name": "Ops"}},
+            {"op": "pm.project.create", "payload": {"name": "Alpha", "project_id": "proj_FIXED"}},
+            {"op": "pm.opsstream.create", "payload": {"name": "Other"}},
+            {"op": "pm.deliverable.create", "payload": {"name": "Del", "project_id": "proj_FIXED"}},
+        ]
+        previous = wm.compile_intent(ops=ops, source="test", actor=_ACTOR)
+        edit = {"action": "replace", "index": 1,
+                "op": {"op": "pm.project.create", "payload": {"name": "Alpha", "project_id": "proj_FIXED", "opsstream_id": "@ref:0"}}}
+        item = _check(wm, wm.recompile_intent(previous, edit))
+        assert item["recompiled"] == [1, 3]
+        opsstream_id = _wal_ids(item)[0]
+        assert item["plan"]["ops"][-1]["params"]["payload"]["opsstream_id"] == opsstream_id
+
+    def test_chained_edits(self, wm):
+        result = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR)
+        for edit in [
+            {"action": "insert", "index": 1, "op": {"op": "pm.opsstream.create", "payload": {"name": "S"}}},
+            {"action": "replace", "index": 0, "op": {"op": "pm.project.create", "payload": {"name": "P", "opsstream_id": "ops_X"}}},
+            {"action": "delete", "index": 1},
+        ]:
+            result = wm.recompile_intent(result, edit)
+            _check(wm, result)
+
+    @pytest.mark.parametrize("edit, message", [
+        ({"action": "move", "index": 0}, "edit action"),
+        ({"action": "delete", "index": 4}, "edit index"),
+        ({"action": "insert", "index": -1, "op": _OPS[0]}, "edit index"),
+        ({"action": "replace", "index": 0, "op": {"payload": {}}}, "edit op"),
+    ])
+    def test_invalid_edit(self, wm, edit, message):
+        previous = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR)
+        with pytest.raises(CompileError, match=message):
+            wm.recompile_intent(previous, edit)
+
+    def test_delete_only_op_raises(self, wm):
+        previous = wm.compile_intent(ops=_OPS[:1], source="test", actor=_ACTOR)
+        with pytest.raises(CompileError, match="non-empty"):
+            wm.recompile_intent(previous, {"action": "delete", "index": 0})
+
+    def test_preview_result_is_rejected(self, wm):
+        previous = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR, preview=True)
+        edit = {"action": "replace", "index": 3, "op": {"op": "pm.opsstream.create", "payload": {"name": "X"}}}
+        with pytest.raises(CompileError, match="without preview"):
+            wm.recompile_intent(previous, edit)
+
+    def test_leaf_cache_is_per_compiler(self, wm, schema_registry):
+        previous = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR)
+        plan_hash = previous["items"][0]["plan_hash"]
+        other = Workman(registry_root=schema_registry, clock=wm.clock)
+        assert wm.leaf_cache.get(plan_hash) is not None
+        assert other.leaf_cache.get(plan_hash) is None
+
+        # A compiler without the leaves recomputes them and gets the same result
+        edit = {"action": "replace", "index": 3, "op": {"op": "pm.opsstream.create", "payload": {"name": "X"}}}
+        cold = _check(other, other.recompile_intent(previous, edit))
+        warm = _check(wm, wm.recompile_intent(previous, edit))
+        assert cold["plan"]["ops"] == warm["plan"]["ops"]
+
+    def test_max_ops(self, wm):
+        previous = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR)
+        edit = {"action": "insert", "index": 4, "op": {"op": "pm.opsstream.create", "payload": {"name": "More"}}}
+        with pytest.raises(CompileError, match="maximum of 4 ops"):
+            wm.recompile_intent(previous, edit, max_ops=4)
+        assert len(wm.recompile_intent(previous, edit, max_ops=5)["items"][0]["intent"]["ops"]) == 5
+
+        capped = Workman(registry_root=wm.registry.root, max_intent_ops=4, clock=wm.clock)
+        with pytest.raises(CompileError, match="maximum of 4 ops"):
+            capped.recompile_intent(previous, edit)
+        assert len(capped.recompile_intent(previous, edit, max_ops=10)["items"][0]["intent"]["ops"]) == 5
+
+    def test_without_diff(self, wm):
+        previous = wm.compile_intent(ops=_OPS, source="test", actor=_ACTOR, include_diff=False)
+        edit = {"action": "replace", "index": 0, "op": {"op": "pm.project.create", "payload": {"name": "Beta"}}}
+        item = wm.recompile_intent(previous, edit)["items"][0]
+        assert "diff" not in item
+        assert item["plan_hash"] == compute_plan_hash(item["plan"])
+
+    def test_module_function(self):
+        previous = compile_intent(ops=_OPS, source="test", actor=_ACTOR)
+        edit = {"action": "replace", "index": 3, "op": {"op": "pm.opsstream.create", "payload": {"name": "X"}}}
+        assert recompile_intent(previous, edit)["items"][0]["recompiled"] == [3]
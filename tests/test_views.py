@@ -0,0 +1,96 @@
+"""Tests for non-mutating compilation with layered payload views."""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from workman.compiler import Workman
+from workman.errors import ValidationError
+from workman.views import LayeredPayload, PayloadView, json_default
+
+_ACTOR = {"actor_type": "human", "actor_id": "u_test"}
+CTX = {"correlation_id": "c1", "producer": "test"}
+
+
+class TestPayloadView:
+    def test_overlay_and_order(self):
+        base = {"a": 1, "b": 2}
+        view = PayloadView(base, {"b": 20, "c": 3})
+        assert list(view.items()) == [("a", 1), ("b", 20), ("c", 3)]
+        assert base == {"a": 1, "b": 2}
+
+    def test_read_only(self):
+        view = PayloadView({"a": 1})
+        with pytest.raises(TypeError):
+            view["a"] = 2
+
+    def test_layered_payload_never_touches_base(self):
+        base = {"a": 1, "b": 2}
+        layer = LayeredPayload(base)
+        layer["a"] = 10
+        layer.pop("b")
+        frozen = layer.freeze()
+        assert dict(frozen) == {"a": 10}
+        assert "b" not in frozen
+        assert base == {"a": 1, "b": 2}
+
+    def test_materialize_once(self):
+        view = PayloadView({"a": 1}, {"b": 2})
+        assert view.materialize() is view.materialize()
+        assert json.dumps({"p": view}, default=json_default) == '{"p": {"a": 1, "b": 2}}'
+
+
+class TestNonMutatingCompile:
+    def test_compile_does_not_mutate_payload(self, schema_registry):
+        wm = Workman(registry_root=schema_registry, mutate_payloads=False)
+        payload = {"name": "Alpha"}
+        plan = wm.compile("pm.project.create", payload, CTX)
+
+        wal_payload = plan["ops"][-1]["params"]["payload"]
+        assert payload == {"name": "Alpha"}
+        assert isinstance(wal_payload, PayloadView)
+        assert wal_payload["project_id"] == plan["ops"][-1]["params"]["aggregate_id"]
+
+    def test_validation_runs_on_views(self, schema_registry):
+        wm = Workman(registry_root=schema_registry, mutate_payloads=False)
+        with pytest.raises(ValidationError):
+            wm.compile("pm.project.create", {"name": 5}, CTX)
+
+    def test_execute_does_not_mutate_payload(self, schema_registry):
+        wm = Workman(registry_root=schema_registry, mutate_payloads=False)
+        payload = {}
+        result = wm.execute({"op": "pm.project.create", "payload": payload, "ctx": CTX})
+        assert payload == {}
+        assert "project_id" in result["items"][0]["payload"]
+
+    def test_compile_intent_layers_refs_and_inheritance(self, schema_registry):
+        wm = Workman(registry_root=schema_registry, mutate_payloads=False)
+        ops = [
+            {"op": "pm.project.create", "payload": {"name": "Alpha"}},
+            {"op": "pm.deliverable.create", "payload": {"name": "Del", "project_id": "@ref:0"}},
+            {"op": "pm.work_item.create", "payload": {"title": "Task", "deliverable_id": "@ref:1"}},
+        ]
+        snapshot = json.loads(json.dumps(ops))
+
+        result = wm.compile_intent(ops=ops, source="test", actor=_ACTOR)
+        assert ops == snapshot
+
+        wal_ops = [op for op in result["items"][0]["plan"]["ops"] if op["method"] == "wal.append"]
+        project_id = wal_ops[0]["params"]["aggregate_id"]
+        assert wal_ops[2]["params"]["payload"]["project_id"] == project_id
+        json.dumps(result, default=json_default)
+
+    def test_plan_hash_matches_mutating_mode(self, schema_registry):
+        pinned = lambda: "01ARZ3NDEKTSV4RRFFQ69G5FAV"  # noqa: E731
+        ops = [
+            {"op": "pm.project.create", "payload": {"name": "Alpha"}},
+            {"op": "pm.work_item.create", "payload": {"title": "Task", "project_id": "@ref:0"}},
+        ]
+        hashes = []
+        for mutate in (True, False):
+            wm = Workman(registry_root=schema_registry, ulid_factory=pinned,
+                         clock=lambda: datetime(2026, 1, 1, tzinfo=timezone.utc),
+                         mutate_payloads=mutate)
+            hashes.append(wm.compile_intent(ops=ops, source="test", actor=_ACTOR)["items"][0]["plan_hash"])
+        assert hashes[0] == hashes[1]